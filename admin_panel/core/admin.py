@@ -4,6 +4,8 @@ Configuración del Django Admin para los modelos DxV
 from django import forms
 from django.contrib import admin
 from django.contrib import messages
+from django.contrib.admin.views.main import ChangeList
+from django.db import DatabaseError
 from django.db.models import Sum, Count
 from django.utils.html import format_html
 from .utils import copiar_instancia
@@ -120,6 +122,37 @@ class GlobalFilterMixin:
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
+# =============================================================================
+# MIXIN PARA LISTADOS SIN COLUMNAS PESADAS
+# =============================================================================
+
+class ListadoLigeroChangeList(ChangeList):
+    """ChangeList que difiere las columnas `list_defer` del ModelAdmin"""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.defer(*self.model_admin.list_defer)
+
+
+class ListadoLigeroMixin:
+    """
+    Mixin que excluye del listado las columnas de texto largo (notas,
+    descripción) que list_display no muestra. Solo aplica al listado: el
+    formulario de edición y las acciones (duplicar, eliminar) reciben la
+    fila completa.
+    """
+    list_defer = ()
+
+    def get_changelist(self, request, **kwargs):
+        return ListadoLigeroChangeList
+
+    def response_action(self, request, queryset):
+        # El changelist pasa a las acciones su propio queryset, con list_defer
+        # aplicado; sin deshacerlo, copiar una fila leería cada columna
+        # diferida con una consulta aparte
+        return super().response_action(request, queryset.defer(None))
+
+
 # =============================================================================
 # INLINES PARA ASIGNACIÓN MULTI-MARCA
 # =============================================================================
@@ -414,12 +447,13 @@ class MarcaForm(forms.ModelForm):
 
 
 @admin.register(Marca, site=dxv_admin_site)
-class MarcaAdmin(admin.ModelAdmin):
+class MarcaAdmin(ListadoLigeroMixin, admin.ModelAdmin):
     form = MarcaForm
     list_display = ('nombre', 'marca_id', 'color_preview', 'activa', 'total_empleados', 'total_vehiculos', 'fecha_modificacion')
     list_filter = ('activa',)
     search_fields = ('nombre', 'marca_id', 'descripcion')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
+    list_defer = ('descripcion',)
 
     fieldsets = (
         ('Información Básica', {
@@ -441,15 +475,18 @@ class MarcaAdmin(admin.ModelAdmin):
         return '-'
     color_preview.short_description = 'Color'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).anotar_totales()
+
     def total_empleados(self, obj):
-        comercial = obj.personal_comercial.aggregate(total=Sum('cantidad'))['total'] or 0
-        logistico = obj.personal_logistico.aggregate(total=Sum('cantidad'))['total'] or 0
-        return comercial + logistico
+        return obj.total_empleados_sql
     total_empleados.short_description = 'Total Empleados'
+    total_empleados.admin_order_field = 'total_empleados_sql'
 
     def total_vehiculos(self, obj):
-        return obj.vehiculos.aggregate(total=Sum('cantidad'))['total'] or 0
+        return obj.total_vehiculos_sql
     total_vehiculos.short_description = 'Total Vehículos'
+    total_vehiculos.admin_order_field = 'total_vehiculos_sql'
 
 
 class AuxiliosNoPrestacionalesWidget(forms.Widget):
@@ -567,6 +604,11 @@ class PersonalComercialAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'escenario', 'marca', 'operacion'
+        ).prefetch_related('asignaciones_marca__marca', 'zonas_asignadas')
+
     def zonas_asignadas_display(self, obj):
         """Muestra las zonas donde trabaja este vendedor"""
         zonas = obj.zonas_asignadas.all()
@@ -596,13 +638,13 @@ class PersonalComercialAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
         if not obj.salario_base:
             return "-"
         try:
-            factor = FactorPrestacional.objects.get(perfil=obj.perfil_prestacional)
+            factor = FactorPrestacional.obtener_por_perfil(obj.perfil_prestacional)
             total = obj.salario_base * (1 + factor.factor_total)
 
             # Sumar auxilio de transporte si aplica (<= 2 SMLV)
             if obj.escenario:
                 try:
-                    macro = ParametrosMacro.objects.get(anio=obj.escenario.anio, activo=True)
+                    macro = ParametrosMacro.obtener_activo(obj.escenario.anio)
                     if obj.salario_base <= (macro.salario_minimo_legal * 2):
                         total += macro.subsidio_transporte
                 except ParametrosMacro.DoesNotExist:
@@ -619,19 +661,14 @@ class PersonalComercialAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
         response = super().changelist_view(request, extra_context)
         try:
             qs = response.context_data['cl'].queryset
-            total_general = 0
-            for obj in qs:
-                try:
-                    total_general += obj.calcular_costo_mensual() or 0
-                except Exception:
-                    pass  # Ignorar errores individuales
+            total_general = qs.total_costo_mensual()
             total_registros = qs.count()
             promedio = total_general / total_registros if total_registros > 0 else 0
 
             response.context_data['total_valor_mensual'] = total_general
             response.context_data['total_registros'] = total_registros
             response.context_data['promedio_registro'] = promedio
-        except (AttributeError, KeyError):
+        except (AttributeError, KeyError, DatabaseError):
             pass
         return response
 
@@ -697,6 +734,11 @@ class PersonalLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'escenario', 'marca'
+        ).prefetch_related('asignaciones_marca__marca')
+
     def marcas_display_admin(self, obj):
         """Muestra las marcas asignadas en el list_display"""
         return obj.marcas_display
@@ -711,13 +753,13 @@ class PersonalLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
         if not obj.salario_base:
             return "-"
         try:
-            factor = FactorPrestacional.objects.get(perfil=obj.perfil_prestacional)
+            factor = FactorPrestacional.obtener_por_perfil(obj.perfil_prestacional)
             total = obj.salario_base * (1 + factor.factor_total)
 
             # Sumar auxilio de transporte si aplica (<= 2 SMLV)
             if obj.escenario:
                 try:
-                    macro = ParametrosMacro.objects.get(anio=obj.escenario.anio, activo=True)
+                    macro = ParametrosMacro.obtener_activo(obj.escenario.anio)
                     if obj.salario_base <= (macro.salario_minimo_legal * 2):
                         total += macro.subsidio_transporte
                 except ParametrosMacro.DoesNotExist:
@@ -738,19 +780,14 @@ class PersonalLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
         response = super().changelist_view(request, extra_context)
         try:
             qs = response.context_data['cl'].queryset
-            total_general = 0
-            for obj in qs:
-                try:
-                    total_general += obj.calcular_costo_mensual() or 0
-                except Exception:
-                    pass  # Ignorar errores individuales
+            total_general = qs.total_costo_mensual()
             total_registros = qs.count()
             promedio = total_general / total_registros if total_registros > 0 else 0
 
             response.context_data['total_valor_mensual'] = total_general
             response.context_data['total_registros'] = total_registros
             response.context_data['promedio_registro'] = promedio
-        except (AttributeError, KeyError):
+        except (AttributeError, KeyError, DatabaseError):
             pass
         return response
 
@@ -759,6 +796,7 @@ class PersonalLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin)
 class VehiculoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
     change_list_template = 'admin/core/change_list_with_total.html'
     list_display = ('nombre_display', 'marca', 'escenario', 'tipo_vehiculo', 'esquema', 'cantidad', 'costo_mensual_estimado_formateado', 'asignacion', 'tipo_asignacion_operacion', 'indice_incremento')
+    list_select_related = ('marca', 'escenario')
     list_filter = ('escenario', 'marca', 'tipo_vehiculo', 'esquema', 'asignacion', 'tipo_asignacion_operacion', 'indice_incremento')
     search_fields = ['nombre', 'marca__nombre', 'tipo_vehiculo', 'esquema']
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
@@ -1018,6 +1056,7 @@ class FactorPrestacionalAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin
     def factor_total_percent(self, obj):
         return f"{obj.factor_total_porcentaje:.2f}%"
     factor_total_percent.short_description = 'Factor Total'
+    factor_total_percent.admin_order_field = 'factor_total_porcentaje'
 
     def arl_percent(self, obj):
         return f"{obj.arl:.3f}%"
@@ -1105,34 +1144,39 @@ class PersonalAdministrativoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelA
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'escenario', 'marca'
+        ).prefetch_related('asignaciones_marca__marca')
+
     def marcas_display_admin(self, obj):
         """Muestra las marcas asignadas en el list_display"""
         return obj.marcas_display
     marcas_display_admin.short_description = 'Marcas'
 
     def valor_mensual(self, obj):
-        if obj.tipo_contrato == 'nomina' and obj.salario_base:
+        if obj.tipo_contrato == PersonalAdministrativo.TipoContrato.NOMINA and obj.salario_base:
             return f"${obj.salario_base:,.0f}"
-        elif obj.tipo_contrato == 'honorarios' and obj.honorarios_mensuales:
+        elif obj.tipo_contrato == PersonalAdministrativo.TipoContrato.HONORARIOS and obj.honorarios_mensuales:
             return f"${obj.honorarios_mensuales:,.0f}"
         return "-"
     valor_mensual.short_description = 'Valor Mensual'
 
     def costo_total_estimado(self, obj):
         try:
-            if obj.tipo_contrato == 'honorarios':
+            if obj.tipo_contrato == PersonalAdministrativo.TipoContrato.HONORARIOS:
                 return f"${obj.honorarios_mensuales:,.0f}" if obj.honorarios_mensuales else "-"
 
             if not obj.salario_base:
                 return "-"
 
-            factor = FactorPrestacional.objects.get(perfil=obj.perfil_prestacional)
+            factor = FactorPrestacional.obtener_por_perfil(obj.perfil_prestacional)
             total = obj.salario_base * (1 + factor.factor_total)
 
             # Sumar auxilio de transporte si aplica (<= 2 SMLV)
             if obj.escenario:
                 try:
-                    macro = ParametrosMacro.objects.get(anio=obj.escenario.anio, activo=True)
+                    macro = ParametrosMacro.obtener_activo(obj.escenario.anio)
                     if obj.salario_base <= (macro.salario_minimo_legal * 2):
                         total += macro.subsidio_transporte
                 except ParametrosMacro.DoesNotExist:
@@ -1153,19 +1197,15 @@ class PersonalAdministrativoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelA
         response = super().changelist_view(request, extra_context)
         try:
             qs = response.context_data['cl'].queryset
-            total_general = 0
-            for obj in qs:
-                try:
-                    total_general += obj.calcular_costo_mensual() or 0
-                except Exception:
-                    pass  # Ignorar errores individuales
+            # Suma la columna desnormalizada (ver PersonalAdministrativo.save)
+            total_general = qs.aggregate(total=Sum('costo_mensual_cached'))['total'] or 0
             total_registros = qs.count()
             promedio = total_general / total_registros if total_registros > 0 else 0
 
             response.context_data['total_valor_mensual'] = total_general
             response.context_data['total_registros'] = total_registros
             response.context_data['promedio_registro'] = promedio
-        except (AttributeError, KeyError):
+        except (AttributeError, KeyError, DatabaseError):
             pass
         return response
 
@@ -1183,13 +1223,15 @@ class GastoAdministrativoForm(forms.ModelForm):
 
 
 @admin.register(GastoAdministrativo, site=dxv_admin_site)
-class GastoAdministrativoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
+class GastoAdministrativoAdmin(GlobalFilterMixin, DuplicarMixin, ListadoLigeroMixin, admin.ModelAdmin):
     form = GastoAdministrativoForm
     change_list_template = 'admin/core/change_list_with_total.html'
     list_display = ('marcas_display_admin', 'nombre', 'escenario', 'tipo', 'valor_mensual_formateado', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     list_filter = ('escenario', 'tipo', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     search_fields = ('nombre', 'notas', 'asignaciones_marca__marca__nombre')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
+    list_select_related = ('escenario', 'marca')
+    list_defer = ('notas',)
     actions = ['duplicar_registros']
     inlines = [GastoAdministrativoMarcaInline]
 
@@ -1226,6 +1268,9 @@ class GastoAdministrativoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmi
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('asignaciones_marca__marca')
+
     def marcas_display_admin(self, obj):
         """Muestra las marcas asignadas en el list_display"""
         return obj.marcas_display
@@ -1265,13 +1310,15 @@ class GastoComercialForm(forms.ModelForm):
 
 
 @admin.register(GastoComercial, site=dxv_admin_site)
-class GastoComercialAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
+class GastoComercialAdmin(GlobalFilterMixin, DuplicarMixin, ListadoLigeroMixin, admin.ModelAdmin):
     form = GastoComercialForm
     change_list_template = 'admin/core/change_list_with_total.html'
     list_display = ('marcas_display_admin', 'escenario', 'nombre', 'tipo', 'valor_mensual_formateado', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     list_filter = ('escenario', 'tipo', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     search_fields = ('nombre', 'notas', 'asignaciones_marca__marca__nombre')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
+    list_select_related = ('escenario', 'marca')
+    list_defer = ('notas',)
     actions = ['duplicar_registros']
     inlines = [GastoComercialMarcaInline]
 
@@ -1309,6 +1356,9 @@ class GastoComercialAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('asignaciones_marca__marca')
+
     def marcas_display_admin(self, obj):
         """Muestra las marcas asignadas en el list_display"""
         return obj.marcas_display
@@ -1348,13 +1398,15 @@ class GastoLogisticoForm(forms.ModelForm):
 
 
 @admin.register(GastoLogistico, site=dxv_admin_site)
-class GastoLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
+class GastoLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, ListadoLigeroMixin, admin.ModelAdmin):
     form = GastoLogisticoForm
     change_list_template = 'admin/core/change_list_with_total.html'
     list_display = ('marcas_display_admin', 'escenario', 'nombre', 'tipo', 'valor_mensual_formateado', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     list_filter = ('escenario', 'tipo', 'tipo_asignacion_operacion', 'tipo_asignacion_geo', 'indice_incremento')
     search_fields = ('nombre', 'notas', 'asignaciones_marca__marca__nombre')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
+    list_select_related = ('escenario', 'marca')
+    list_defer = ('notas',)
     actions = ['duplicar_registros']
     inlines = [GastoLogisticoMarcaInline]
 
@@ -1393,6 +1445,9 @@ class GastoLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
     class Media:
         js = ('admin/js/personal_condicional.js', 'admin/js/distribuir_equitativo.js')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('asignaciones_marca__marca')
+
     def marcas_display_admin(self, obj):
         """Muestra las marcas asignadas en el list_display"""
         return obj.marcas_display
@@ -1420,11 +1475,12 @@ class GastoLogisticoAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
 
 
 @admin.register(Impuesto, site=dxv_admin_site)
-class ImpuestoAdmin(admin.ModelAdmin):
+class ImpuestoAdmin(ListadoLigeroMixin, admin.ModelAdmin):
     list_display = ('nombre', 'tipo', 'aplicacion', 'valor_display', 'periodicidad', 'activo')
     list_filter = ('tipo', 'aplicacion', 'periodicidad', 'activo')
     search_fields = ('nombre', 'notas')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
+    list_defer = ('notas',)
 
     fieldsets = (
         ('Información Básica', {
@@ -1536,6 +1592,9 @@ class ConfiguracionDescuentosAdmin(admin.ModelAdmin):
         return format_html('<span style="color: {}; font-weight: bold;">{} {}%</span>', color, status, f'{total:.2f}')
     total_tramos_display.short_description = 'Total Tramos'
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('marca').anotar_total_tramos()
+
     def save_model(self, request, obj, form, change):
         """Valida antes de guardar"""
         from django.contrib import messages
@@ -1691,6 +1750,7 @@ class MunicipioAdmin(admin.ModelAdmin):
 @admin.register(MatrizDesplazamiento, site=dxv_admin_site)
 class MatrizDesplazamientoAdmin(admin.ModelAdmin):
     list_display = ('origen', 'destino', 'distancia_km', 'tiempo_minutos', 'tiempo_horas', 'peaje_formateado')
+    ordering = ('origen__nombre', 'destino__nombre')
     list_filter = ('origen__departamento',)
     search_fields = ('origen__nombre', 'destino__nombre')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
@@ -1814,6 +1874,7 @@ class ZonaMunicipioInline(admin.TabularInline):
     model = ZonaMunicipio
     extra = 0
     autocomplete_fields = ['municipio']
+    ordering = ('municipio__nombre',)
     fields = ('municipio', 'visitas_por_periodo', 'participacion_ventas', 'venta_proyectada')
     readonly_fields = ('participacion_ventas', 'venta_proyectada')
 
@@ -1911,6 +1972,9 @@ class ZonaAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelAdmin):
 class ZonaMunicipioAdmin(admin.ModelAdmin):
     """Admin para relación Zona-Municipio (comercial)"""
     list_display = ('zona', 'municipio', 'venta_proyectada_fmt', 'participacion_ventas_fmt', 'visitas_por_periodo', 'visitas_mensuales_calc')
+    # Las columnas zona/municipio se muestran con su __str__: traerlas en el mismo JOIN
+    list_select_related = ('zona', 'zona__vendedor', 'municipio')
+    ordering = ('zona__nombre', 'municipio__nombre')
     list_filter = ('zona__marca', 'zona__frecuencia')
     search_fields = ('zona__nombre', 'municipio__nombre')
     readonly_fields = ('fecha_creacion', 'fecha_modificacion')
@@ -1941,11 +2005,12 @@ class ZonaMunicipioAdmin(admin.ModelAdmin):
     participacion_ventas_fmt.admin_order_field = 'participacion_ventas'
 
     def visitas_mensuales_calc(self, obj):
-        return obj.visitas_mensuales()
+        return obj.visitas_mensuales_db
     visitas_mensuales_calc.short_description = 'Visitas/Mes'
+    visitas_mensuales_calc.admin_order_field = 'visitas_mensuales_db'
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('zona', 'municipio')
+        return super().get_queryset(request).select_related('zona', 'municipio').con_visitas_mensuales()
 
 
 # ============================================================================
@@ -2187,6 +2252,11 @@ class ProyeccionVentasConfigAdmin(GlobalFilterMixin, DuplicarMixin, admin.ModelA
         ProyeccionManualInline,
     ]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'marca', 'escenario', 'proyeccion_manual'
+        ).prefetch_related('tipologias')
+
     def venta_anual_fmt(self, obj):
         try:
             venta = obj.get_venta_anual()
@@ -33,9 +33,9 @@ def global_filters(request):
     try:
         from .models import Escenario, Marca
 
-        # Obtener escenarios y marcas disponibles
-        escenarios = list(Escenario.objects.filter(activo=True).order_by('-anio', 'nombre'))
-        marcas = list(Marca.objects.filter(activa=True).order_by('nombre'))
+        # Obtener escenarios y marcas disponibles (el selector solo usa id y nombre)
+        escenarios = list(Escenario.objects.filter(activo=True).order_by('-anio', 'nombre').only('id', 'nombre'))
+        marcas = list(Marca.objects.filter(activa=True).order_by('nombre').only('id', 'nombre'))
 
         logger.info(f"global_filters: encontrados {len(escenarios)} escenarios activos, {len(marcas)} marcas activas")
 
@@ -5,6 +5,7 @@ NO necesita archivo Excel - los datos ya están incluidos
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from core.models import Municipio, MatrizDesplazamiento
+from core.signals import recalcular_lejanias_escenarios_activos
 from .datos_matriz_suroeste import MUNICIPIOS, RUTAS
 
 
@@ -46,31 +47,22 @@ class Command(BaseCommand):
             self.stdout.write(f'\n   Total creados: {municipios_creados}')
             self.stdout.write(f'   Total existentes: {municipios_existentes}\n')
 
-            # 2. Crear rutas
+            # 2. Crear rutas (upsert por lotes; no dispara un recálculo por ruta)
             self.stdout.write('🛣️  Creando rutas...')
-            for idx, ruta_data in enumerate(RUTAS, 1):
-                origen = municipios_dict[ruta_data['origen']]
-                destino = municipios_dict[ruta_data['destino']]
-
-                ruta, created = MatrizDesplazamiento.objects.update_or_create(
-                    origen=origen,
-                    destino=destino,
-                    defaults={
-                        'distancia_km': ruta_data['distancia_km'],
-                        'tiempo_minutos': ruta_data['tiempo_minutos'],
-                    }
+            rutas_creadas, rutas_actualizadas = MatrizDesplazamiento.bulk_load_matrix(
+                (
+                    municipios_dict[ruta_data['origen']].id,
+                    municipios_dict[ruta_data['destino']].id,
+                    ruta_data['distancia_km'],
+                    ruta_data['tiempo_minutos'],
                 )
+                for ruta_data in RUTAS
+            )
+            self.stdout.write(f"   ... {len(RUTAS)} rutas procesadas")
 
-                if created:
-                    rutas_creadas += 1
-                    if rutas_creadas <= 5:
-                        self.stdout.write(f"   ✅ {ruta}")
-                else:
-                    rutas_actualizadas += 1
-
-                # Mostrar progreso cada 100 rutas
-                if idx % 100 == 0:
-                    self.stdout.write(f"   ... {idx}/{len(RUTAS)} rutas procesadas")
+            # 3. Recalcular lejanías una sola vez
+            self.stdout.write('🔄 Recalculando lejanías de escenarios activos...')
+            recalcular_lejanias_escenarios_activos()
 
             # Resumen
             self.stdout.write('\n' + '='*70)
@@ -12,6 +12,9 @@ from core.models import (
     ParametrosMacro, FactorPrestacional
 )
 
+# Tamaño de lote para bulk_create (en PostgreSQL lotes mayores no aportan)
+BATCH_SIZE = 1000
+
 
 class Command(BaseCommand):
     help = 'Importa datos desde archivos YAML a PostgreSQL'
@@ -125,7 +128,6 @@ class Command(BaseCommand):
                     'intereses_cesantias': perfil_data.get('intereses_cesantias', 0),
                     'prima': perfil_data.get('prima', 0),
                     'vacaciones': perfil_data.get('vacaciones', 0),
-                    'factor_total': perfil_data.get('factor_total', 0),
                 }
             )
 
@@ -206,7 +208,8 @@ class Command(BaseCommand):
         # Limpiar personal comercial existente
         PersonalComercial.objects.filter(marca=marca).delete()
 
-        count = 0
+        # Se insertan en lote: sin escenario los signals de personal no hacen nada
+        nuevos = []
         for tipo_personal, empleados_list in recursos.items():
             if not isinstance(empleados_list, list):
                 empleados_list = [empleados_list]
@@ -219,7 +222,7 @@ class Command(BaseCommand):
                 if cantidad == 0 or salario_base == 0:
                     continue
 
-                PersonalComercial.objects.create(
+                nuevos.append(PersonalComercial(
                     marca=marca,
                     tipo=tipo,
                     cantidad=cantidad,
@@ -229,10 +232,10 @@ class Command(BaseCommand):
                     auxilio_adicional=empleado_data.get('auxilio_adicional', 0),
                     porcentaje_dedicacion=empleado_data.get('porcentaje_dedicacion'),
                     criterio_prorrateo=empleado_data.get('criterio_prorrateo'),
-                )
-                count += 1
+                ))
 
-        self.stdout.write(f'    ✓ {count} registros de personal comercial importados')
+        PersonalComercial.objects.bulk_create(nuevos, batch_size=BATCH_SIZE)
+        self.stdout.write(f'    ✓ {len(nuevos)} registros de personal comercial importados')
 
     def import_logistica(self, marca, marca_dir):
         """Importa datos logísticos de una marca"""
@@ -247,9 +250,9 @@ class Command(BaseCommand):
         PersonalLogistico.objects.filter(marca=marca).delete()
         Vehiculo.objects.filter(marca=marca).delete()
 
-        # Importar vehículos
+        # Importar vehículos (en lote: sin escenario los signals no hacen nada)
         vehiculos_config = data.get('vehiculos', {})
-        count_vehiculos = 0
+        vehiculos = []
 
         for esquema in ['renting', 'tradicional']:
             for vehiculo_data in vehiculos_config.get(esquema, []):
@@ -259,7 +262,7 @@ class Command(BaseCommand):
                 if cantidad == 0:
                     continue
 
-                Vehiculo.objects.create(
+                vehiculos.append(Vehiculo(
                     marca=marca,
                     tipo_vehiculo=tipo_vehiculo,
                     esquema=esquema,
@@ -268,14 +271,14 @@ class Command(BaseCommand):
                     kilometraje_promedio_mensual=vehiculo_data.get('kilometraje_promedio_mensual', 3000),
                     porcentaje_uso=vehiculo_data.get('porcentaje_uso'),
                     criterio_prorrateo=vehiculo_data.get('criterio_prorrateo'),
-                )
-                count_vehiculos += 1
+                ))
 
-        self.stdout.write(f'    ✓ {count_vehiculos} vehículos importados')
+        Vehiculo.objects.bulk_create(vehiculos, batch_size=BATCH_SIZE)
+        self.stdout.write(f'    ✓ {len(vehiculos)} vehículos importados')
 
         # Importar personal logístico
         personal_config = data.get('personal', {})
-        count_personal = 0
+        personal = []
 
         for tipo_personal, empleados_list in personal_config.items():
             if not isinstance(empleados_list, list):
@@ -299,7 +302,7 @@ class Command(BaseCommand):
 
                 tipo = tipo_map.get(tipo_personal, tipo_personal)
 
-                PersonalLogistico.objects.create(
+                personal.append(PersonalLogistico(
                     marca=marca,
                     tipo=tipo,
                     cantidad=cantidad,
@@ -308,10 +311,10 @@ class Command(BaseCommand):
                     asignacion=empleado_data.get('asignacion', 'individual'),
                     porcentaje_dedicacion=empleado_data.get('porcentaje_dedicacion'),
                     criterio_prorrateo=empleado_data.get('criterio_prorrateo'),
-                )
-                count_personal += 1
+                ))
 
-        self.stdout.write(f'    ✓ {count_personal} registros de personal logístico importados')
+        PersonalLogistico.objects.bulk_create(personal, batch_size=BATCH_SIZE)
+        self.stdout.write(f'    ✓ {len(personal)} registros de personal logístico importados')
 
     def import_ventas(self, marca, marca_dir):
         """Importa proyecciones de ventas de una marca usando el nuevo modelo"""
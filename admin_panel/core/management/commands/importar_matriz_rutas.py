@@ -4,6 +4,7 @@ Management command para importar matriz de desplazamientos desde Excel
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from core.models import Municipio, MatrizDesplazamiento
+from core.signals import recalcular_lejanias_escenarios_activos
 import pandas as pd
 import os
 
@@ -119,8 +120,10 @@ class Command(BaseCommand):
                 self.stdout.write(f'\n   Municipios creados: {municipios_creados}')
                 self.stdout.write(f'   Municipios existentes: {municipios_existentes}\n')
 
-                # 2. Crear/actualizar rutas
+                # 2. Crear/actualizar rutas (upsert por lotes; no dispara un
+                # recálculo de lejanías por ruta)
                 self.stdout.write('🛣️  Procesando rutas...')
+                filas = []
 
                 for idx, row in df.iterrows():
                     try:
@@ -137,28 +140,19 @@ class Command(BaseCommand):
                             errores.append(error_msg)
                             continue
 
-                        # Crear o actualizar ruta
-                        ruta, created = MatrizDesplazamiento.objects.update_or_create(
-                            origen=origen,
-                            destino=destino,
-                            defaults={
-                                'distancia_km': distancia,
-                                'tiempo_minutos': tiempo,
-                            }
-                        )
-
-                        if created:
-                            rutas_creadas += 1
-                            if rutas_creadas <= 5:  # Mostrar solo las primeras 5
-                                self.stdout.write(f'   ✅ {ruta}')
-                        else:
-                            rutas_actualizadas += 1
+                        filas.append((origen.id, destino.id, distancia, tiempo))
 
                     except Exception as e:
                         error_msg = f'Error en fila {idx+1}: {str(e)}'
                         errores.append(error_msg)
                         self.stdout.write(self.style.ERROR(f'   ❌ {error_msg}'))
 
+                rutas_creadas, rutas_actualizadas = MatrizDesplazamiento.bulk_load_matrix(filas)
+
+                # 3. Recalcular lejanías una sola vez
+                if not dry_run:
+                    recalcular_lejanias_escenarios_activos()
+
                 # Mostrar resumen
                 self.stdout.write('\n' + '='*70)
                 self.stdout.write(self.style.SUCCESS('📊 RESUMEN DE IMPORTACIÓN'))
@@ -0,0 +1,53 @@
+# Índices en columnas usadas por list_filter del admin
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0080_force_remove_geo_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='escenario',
+            name='anio',
+            field=models.IntegerField(db_index=True, verbose_name='Año'),
+        ),
+        migrations.AlterField(
+            model_name='escenario',
+            name='tipo',
+            field=models.CharField(choices=[('planeado', 'Planeado'), ('sugerido_marca', 'Sugerido por Marca'), ('real', 'Real Ejecutado')], db_index=True, max_length=20, verbose_name='Tipo de Escenario'),
+        ),
+        migrations.AlterField(
+            model_name='personalcomercial',
+            name='perfil_prestacional',
+            field=models.CharField(choices=[('comercial', 'Comercial (Riesgo II - Vendedores)'), ('administrativo', 'Administrativo (Riesgo I - Coordinadores)')], db_index=True, default='comercial', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='personalcomercial',
+            name='tipo',
+            field=models.CharField(choices=[('vendedor_geografico', 'Vendedor Geográfico'), ('vendedor_senior', 'Vendedor Senior'), ('vendedor_minimercado', 'Vendedor Minimercado'), ('vendedor_supernumerario', 'Vendedor Supernumerario'), ('coordinador_comercial', 'Coordinador Comercial'), ('auxiliar_informacion', 'Auxiliar de Información')], db_index=True, max_length=50, verbose_name='Tipo de Personal'),
+        ),
+        migrations.AlterField(
+            model_name='personallogistico',
+            name='perfil_prestacional',
+            field=models.CharField(choices=[('logistico_bodega', 'Logístico Bodega (Riesgo III - Operarios)'), ('logistico_calle', 'Logístico Calle (Riesgo IV - Conductores)'), ('administrativo', 'Administrativo (Riesgo I - Coordinadores)')], db_index=True, default='logistico_calle', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='personallogistico',
+            name='tipo',
+            field=models.CharField(choices=[('conductor', 'Conductor'), ('auxiliar_entrega', 'Auxiliar de Entrega'), ('coordinador_logistica', 'Coordinador Logística'), ('supervisor_bodega', 'Supervisor de Bodega'), ('operario_bodega', 'Operario de Bodega')], db_index=True, max_length=50, verbose_name='Tipo de Personal'),
+        ),
+        migrations.AlterField(
+            model_name='vehiculo',
+            name='esquema',
+            field=models.CharField(choices=[('renting', 'Renting'), ('tradicional', 'Tradicional (Propio)'), ('tercero', 'Tercero (Flete)')], db_index=True, max_length=20, verbose_name='Esquema'),
+        ),
+        migrations.AlterField(
+            model_name='vehiculo',
+            name='tipo_vehiculo',
+            field=models.CharField(choices=[('bicicleta_electrica', 'Bicicleta Eléctrica'), ('motocarro', 'Motocarro'), ('minitruck', 'Minitruck'), ('pickup', 'Pickup'), ('nhr', 'NHR'), ('nkr', 'NKR'), ('npr', 'NPR')], db_index=True, max_length=50, verbose_name='Tipo de Vehículo'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Índices compuestos (escenario, marca) y (escenario, tipo) en gastos
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('core', '0081_add_db_index_filtros_admin'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='gastoadministrativo',
+            index=models.Index(fields=['escenario', 'marca'], name='gasto_adm_esc_marca_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='gastoadministrativo',
+            index=models.Index(fields=['escenario', 'tipo'], name='gasto_adm_esc_tipo_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='gastocomercial',
+            index=models.Index(fields=['escenario', 'marca'], name='gasto_com_esc_marca_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='gastocomercial',
+            index=models.Index(fields=['escenario', 'tipo'], name='gasto_com_esc_tipo_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='gastologistico',
+            index=models.Index(fields=['escenario', 'marca'], name='gasto_log_esc_marca_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='gastologistico',
+            index=models.Index(fields=['escenario', 'tipo'], name='gasto_log_esc_tipo_idx'),
+        ),
+    ]
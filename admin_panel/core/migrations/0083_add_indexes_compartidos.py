@@ -0,0 +1,21 @@
+# Índices parciales para registros administrativos compartidos
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0082_add_indexes_gastos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gastoadministrativo',
+            index=models.Index(condition=models.Q(('asignacion', 'compartido')), fields=['escenario'], name='gasto_adm_compartido_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personaladministrativo',
+            index=models.Index(condition=models.Q(('asignacion', 'compartido')), fields=['escenario'], name='personal_adm_compartido_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Índices parciales para lecturas de registros activos
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0083_add_indexes_compartidos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='impuesto',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['tipo', 'nombre'], name='impuesto_activo_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parametrosmacro',
+            index=models.Index(condition=models.Q(('activo', True)), fields=['anio'], name='param_macro_activo_anio_idx'),
+        ),
+    ]
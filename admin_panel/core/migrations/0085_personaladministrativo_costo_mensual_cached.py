@@ -0,0 +1,64 @@
+# Costo mensual desnormalizado de personal administrativo
+
+from django.db import migrations, models
+
+# Mismo cálculo que PersonalQuerySet.anotar_costo_mensual, escrito en SQL
+# contra el esquema de esta migración (el queryset del modelo vivo puede
+# cambiar después). Solo PostgreSQL: usa jsonb_each_text.
+POBLAR_COSTO_MENSUAL_CACHED = """
+UPDATE dxv_personal_administrativo p
+SET costo_mensual_cached = calculo.costo
+FROM (
+    SELECT
+        pa.id,
+        CASE
+            WHEN pa.cantidad IS NULL OR pa.cantidad = 0 THEN 0
+            WHEN pa.tipo_contrato = 'honorarios'
+                THEN COALESCE(pa.honorarios_mensuales, 0) * pa.cantidad
+            WHEN pa.salario_base IS NULL OR pa.salario_base = 0 THEN 0
+            -- Si no existe factor, solo salario base * cantidad
+            WHEN f.id IS NULL THEN pa.salario_base * pa.cantidad
+            ELSE pa.cantidad * (
+                pa.salario_base * (1 + (f.salud + f.pension + f.arl + f.caja_compensacion
+                                        + f.icbf + f.sena + f.vacaciones) / 100)
+                + (pa.salario_base + sub.transporte)
+                    * (f.cesantias + f.intereses_cesantias + f.prima) / 100
+                + sub.transporte
+                + CASE
+                    WHEN pa.auxilios_no_prestacionales = '{}'::jsonb
+                        THEN COALESCE(pa.auxilio_adicional, 0)
+                    ELSE (SELECT COALESCE(SUM(value::numeric), 0)
+                          FROM jsonb_each_text(pa.auxilios_no_prestacionales))
+                  END
+            )
+        END AS costo
+    FROM dxv_personal_administrativo pa
+    LEFT JOIN dxv_escenario e ON e.id = pa.escenario_id
+    LEFT JOIN dxv_factor_prestacional f ON f.perfil = pa.perfil_prestacional
+    LEFT JOIN dxv_parametros_macro m ON m.anio = e.anio AND m.activo
+    -- Subsidio de transporte si aplica (<= 2 SMLV del año del escenario)
+    CROSS JOIN LATERAL (
+        SELECT CASE
+            WHEN pa.salario_base <= m.salario_minimo_legal * 2 THEN m.subsidio_transporte
+            ELSE 0
+        END AS transporte
+    ) sub
+) calculo
+WHERE calculo.id = p.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0084_add_indexes_activos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personaladministrativo',
+            name='costo_mensual_cached',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True, verbose_name='Costo Mensual (calculado)'),
+        ),
+        migrations.RunSQL(POBLAR_COSTO_MENSUAL_CACHED, migrations.RunSQL.noop),
+    ]
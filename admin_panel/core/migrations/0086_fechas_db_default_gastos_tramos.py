@@ -0,0 +1,83 @@
+# Marcas de tiempo resueltas por PostgreSQL (DEFAULT now()) en gastos y tramos
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+TABLAS = [
+    'dxv_gasto_administrativo',
+    'dxv_gasto_comercial',
+    'dxv_gasto_logistico',
+    'dxv_tramo_descuento_factura',
+]
+
+# fecha_modificacion también se actualiza en UPDATE masivos (queryset.update,
+# bulk_update, SQL directo), que no pasan por auto_now
+CREAR_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION dxv_set_fecha_modificacion() RETURNS trigger AS $$
+    BEGIN
+        NEW.fecha_modificacion = now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+] + [
+    f'CREATE TRIGGER {tabla}_fecha_mod BEFORE UPDATE ON {tabla} '
+    f'FOR EACH ROW EXECUTE FUNCTION dxv_set_fecha_modificacion();'
+    for tabla in TABLAS
+]
+
+BORRAR_TRIGGERS = [
+    f'DROP TRIGGER IF EXISTS {tabla}_fecha_mod ON {tabla};' for tabla in TABLAS
+] + ['DROP FUNCTION IF EXISTS dxv_set_fecha_modificacion();']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0085_personaladministrativo_costo_mensual_cached'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gastoadministrativo',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='gastoadministrativo',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='gastocomercial',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='gastocomercial',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='gastologistico',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='gastologistico',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='tramodescuentofactura',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='tramodescuentofactura',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.RunSQL(CREAR_TRIGGERS, BORRAR_TRIGGERS),
+    ]
@@ -0,0 +1,65 @@
+# Restricción única por rubro (escenario, marca, tipo, nombre) en gastos
+
+from django.db import migrations, models
+from django.db.models import Count
+
+MODELOS = ['GastoAdministrativo', 'GastoComercial', 'GastoLogistico']
+
+
+def renombrar_duplicados(apps, schema_editor):
+    """
+    Deja nombres únicos por rubro antes de crear la restricción, sin borrar
+    filas (los totales del P&G no cambian). La fila modificada más
+    recientemente conserva el nombre; las demás reciben un sufijo " (2)",
+    " (3)"... Las filas con marca NULL no entran en la restricción y no se tocan.
+    """
+    for nombre_modelo in MODELOS:
+        Gasto = apps.get_model('core', nombre_modelo)
+        largo = Gasto._meta.get_field('nombre').max_length
+        rubros = (
+            Gasto.objects.filter(marca__isnull=False)
+            .values('escenario_id', 'marca_id', 'tipo', 'nombre')
+            .annotate(filas=Count('id'))
+            .filter(filas__gt=1)
+        )
+        for rubro in rubros:
+            filas = Gasto.objects.filter(
+                escenario_id=rubro['escenario_id'], marca_id=rubro['marca_id'],
+                tipo=rubro['tipo'], nombre=rubro['nombre'],
+            ).order_by('-fecha_modificacion', '-id')
+            hermanos = Gasto.objects.filter(
+                escenario_id=rubro['escenario_id'], marca_id=rubro['marca_id'], tipo=rubro['tipo'],
+            )
+            n = 1
+            for gasto in list(filas)[1:]:
+                while True:
+                    n += 1
+                    sufijo = f" ({n})"
+                    nuevo = rubro['nombre'][:largo - len(sufijo)] + sufijo
+                    if not hermanos.filter(nombre=nuevo).exists():
+                        break
+                Gasto.objects.filter(pk=gasto.pk).update(nombre=nuevo)
+                print(f"  {nombre_modelo} id={gasto.pk}: '{rubro['nombre']}' duplicado, renombrado a '{nuevo}'")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0086_fechas_db_default_gastos_tramos'),
+    ]
+
+    operations = [
+        migrations.RunPython(renombrar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='gastoadministrativo',
+            constraint=models.UniqueConstraint(fields=('escenario', 'marca', 'tipo', 'nombre'), name='gasto_adm_fila_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='gastocomercial',
+            constraint=models.UniqueConstraint(fields=('escenario', 'marca', 'tipo', 'nombre'), name='gasto_com_fila_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='gastologistico',
+            constraint=models.UniqueConstraint(fields=('escenario', 'marca', 'tipo', 'nombre'), name='gasto_log_fila_uniq'),
+        ),
+    ]
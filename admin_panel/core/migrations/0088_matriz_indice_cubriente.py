@@ -0,0 +1,21 @@
+# Índice único cubriente (origen, destino) INCLUDE distancia/tiempo/peaje en la matriz
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0087_gastos_fila_uniq'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='matrizdesplazamiento',
+            constraint=models.UniqueConstraint(fields=('origen', 'destino'), include=('distancia_km', 'tiempo_minutos', 'peaje_ida'), name='matriz_origen_destino_uniq'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='matrizdesplazamiento',
+            unique_together=set(),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Coordenadas de municipio como double precision; el cast numeric -> float8 conserva los valores.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0088_matriz_indice_cubriente'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='municipio',
+            name='latitud',
+            field=models.FloatField(blank=True, null=True, verbose_name='Latitud'),
+        ),
+        migrations.AlterField(
+            model_name='municipio',
+            name='longitud',
+            field=models.FloatField(blank=True, null=True, verbose_name='Longitud'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Sin ordering por defecto: el orden se pide explícitamente donde se muestra.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0089_municipio_coordenadas_float'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='matrizdesplazamiento',
+            options={'verbose_name': 'Matriz de Desplazamiento', 'verbose_name_plural': 'Matrices de Desplazamiento'},
+        ),
+        migrations.AlterModelOptions(
+            name='zonamunicipio',
+            options={'verbose_name': 'Municipio de Zona Comercial', 'verbose_name_plural': 'Municipios de Zonas Comerciales'},
+        ),
+    ]
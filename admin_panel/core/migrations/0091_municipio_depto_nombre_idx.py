@@ -0,0 +1,17 @@
+# Índice (departamento, nombre) para el ordering y las búsquedas de municipios.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0090_quitar_ordering_matriz_zonamunicipio'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='municipio',
+            index=models.Index(fields=['departamento', 'nombre'], name='municipio_depto_nombre_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Rangos básicos de ConfiguracionLejania validados en la base de datos.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0091_municipio_depto_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='configuracionlejania',
+            constraint=models.CheckConstraint(check=models.Q(('umbral_lejania_logistica_km__gte', 0), ('umbral_lejania_comercial_km__gte', 0)), name='config_lejania_umbrales_no_negativos'),
+        ),
+        migrations.AddConstraint(
+            model_name='configuracionlejania',
+            constraint=models.CheckConstraint(check=models.Q(('consumo_galon_km_moto__gte', 0), ('consumo_galon_km_automovil__gte', 0)), name='config_lejania_consumos_no_negativos'),
+        ),
+        migrations.AddConstraint(
+            model_name='configuracionlejania',
+            constraint=models.CheckConstraint(check=models.Q(('precio_galon_gasolina__gte', 0), ('precio_galon_acpm__gte', 0)), name='config_lejania_precios_no_negativos'),
+        ),
+    ]
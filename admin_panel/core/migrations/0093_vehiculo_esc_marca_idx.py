@@ -0,0 +1,17 @@
+# Índice (escenario, marca) de vehículos.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0092_configuracion_lejania_checks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['escenario', 'marca'], name='vehiculo_esc_marca_idx'),
+        ),
+    ]
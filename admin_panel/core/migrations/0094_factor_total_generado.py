@@ -0,0 +1,19 @@
+# factor_total_porcentaje pasa a columna generada (suma de componentes).
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0093_vehiculo_esc_marca_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='factorprestacional',
+            name='factor_total_porcentaje',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('salud'), '+', models.F('pension')), '+', models.F('arl')), '+', models.F('caja_compensacion')), '+', models.F('icbf')), '+', models.F('sena')), '+', models.F('cesantias')), '+', models.F('intereses_cesantias')), '+', models.F('prima')), '+', models.F('vacaciones')), output_field=models.DecimalField(decimal_places=2, max_digits=6), verbose_name='Factor Total (%)'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Índices parciales para filtros de marcas y configuraciones de descuentos activas
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0094_factor_total_generado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='configuraciondescuentos',
+            index=models.Index(condition=models.Q(('activa', True)), fields=['marca'], name='config_desc_activa_marca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marca',
+            index=models.Index(condition=models.Q(('activa', True)), fields=['nombre'], name='marca_activa_nombre_idx'),
+        ),
+    ]
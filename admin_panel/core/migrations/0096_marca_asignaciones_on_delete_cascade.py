@@ -0,0 +1,87 @@
+# FK a Marca de las tablas de asignación multi-marca con ON DELETE CASCADE en la base
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TABLAS = [
+    'dxv_personal_comercial_marca',
+    'dxv_personal_logistico_marca',
+    'dxv_personal_administrativo_marca',
+    'dxv_gasto_comercial_marca',
+    'dxv_gasto_logistico_marca',
+    'dxv_gasto_administrativo_marca',
+    'dxv_zona_marca',
+]
+
+# Recrea la FK marca_id -> dxv_marca con la acción indicada. El nombre de la
+# constraint lo generó Django con un hash, por eso se busca en pg_constraint.
+RECREAR_FK = """
+DO $$
+DECLARE
+    nombre text;
+BEGIN
+    SELECT con.conname INTO nombre
+    FROM pg_constraint con
+    JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = ANY (con.conkey)
+    WHERE con.contype = 'f'
+      AND con.conrelid = '{tabla}'::regclass
+      AND con.confrelid = 'dxv_marca'::regclass
+      AND att.attname = 'marca_id';
+
+    EXECUTE format('ALTER TABLE {tabla} DROP CONSTRAINT %I', nombre);
+    EXECUTE format(
+        'ALTER TABLE {tabla} ADD CONSTRAINT %I FOREIGN KEY (marca_id) '
+        'REFERENCES dxv_marca (id){accion} DEFERRABLE INITIALLY DEFERRED',
+        nombre
+    );
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0095_marca_configdesc_activa_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gastoadministrativomarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='gasto_administrativo_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='gastocomercialmarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='gasto_comercial_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='gastologisticomarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='gasto_logistico_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='personaladministrativomarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='personal_administrativo_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='personalcomercialmarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='personal_comercial_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='personallogisticomarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='personal_logistico_asignaciones', to='core.marca'),
+        ),
+        migrations.AlterField(
+            model_name='zonamarca',
+            name='marca',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='zona_asignaciones', to='core.marca'),
+        ),
+        migrations.RunSQL(
+            sql=[RECREAR_FK.format(tabla=tabla, accion=' ON DELETE CASCADE') for tabla in TABLAS],
+            reverse_sql=[RECREAR_FK.format(tabla=tabla, accion='') for tabla in TABLAS],
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Marcas de tiempo resueltas por PostgreSQL (DEFAULT now()) en las tablas de carga masiva
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+TABLAS = [
+    'dxv_personal_comercial',
+    'dxv_personal_logistico',
+    'dxv_vehiculo',
+    'dxv_matriz_desplazamiento',
+]
+
+# Reutiliza dxv_set_fecha_modificacion() (creada en 0086) para que los UPDATE
+# masivos también actualicen fecha_modificacion
+CREAR_TRIGGERS = [
+    f'CREATE TRIGGER {tabla}_fecha_mod BEFORE UPDATE ON {tabla} '
+    f'FOR EACH ROW EXECUTE FUNCTION dxv_set_fecha_modificacion();'
+    for tabla in TABLAS
+]
+
+BORRAR_TRIGGERS = [
+    f'DROP TRIGGER IF EXISTS {tabla}_fecha_mod ON {tabla};' for tabla in TABLAS
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0096_marca_asignaciones_on_delete_cascade'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='matrizdesplazamiento',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='matrizdesplazamiento',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='personalcomercial',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='personalcomercial',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='personallogistico',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='personallogistico',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='vehiculo',
+            name='fecha_creacion',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='vehiculo',
+            name='fecha_modificacion',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.RunSQL(CREAR_TRIGGERS, BORRAR_TRIGGERS),
+    ]
@@ -0,0 +1,21 @@
+# Unicidad (configuracion, orden) de los tramos como índice cubriente con INCLUDE
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0097_fechas_db_default_personal_vehiculo_matriz'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='tramodescuentofactura',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='tramodescuentofactura',
+            constraint=models.UniqueConstraint(fields=('configuracion', 'orden'), include=('id', 'porcentaje_ventas', 'porcentaje_descuento'), name='tramo_config_orden_uniq'),
+        ),
+    ]
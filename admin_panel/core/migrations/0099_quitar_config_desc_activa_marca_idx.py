@@ -0,0 +1,17 @@
+# ConfiguracionDescuentos.marca es OneToOne (ya tiene índice único): se quita el índice parcial redundante
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0098_tramo_unique_covering'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='configuraciondescuentos',
+            name='config_desc_activa_marca_idx',
+        ),
+    ]
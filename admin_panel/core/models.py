@@ -1,8 +1,19 @@
 """
 Modelos Django para el Sistema DxV
 """
+import threading
+from collections import namedtuple
 from decimal import Decimal
-from django.db import models
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import (
+    Case, Exists, ExpressionWrapper, F, OuterRef, Prefetch, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Now
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 # Import de la calculadora de prestaciones compartida
@@ -23,6 +34,95 @@ def _calcular_costo_nomina_compartido(salario_base, factores, subsidio_transport
     )
 
 
+def _calcular_costo_nomina_float_compartido(salario_base, factor_solo_salario, factor_con_subsidio,
+                                           subsidio_transporte=0.0, auxilio_adicional=0.0, cantidad=1):
+    """Wrapper de `calcular_costo_nomina_float` con el mismo import diferido."""
+    from core.calculadora_prestaciones import calcular_costo_nomina_float
+    return calcular_costo_nomina_float(
+        salario_base=salario_base,
+        factor_solo_salario=factor_solo_salario,
+        factor_con_subsidio=factor_con_subsidio,
+        subsidio_transporte=subsidio_transporte,
+        auxilio_adicional=auxilio_adicional,
+        cantidad=cantidad,
+    )
+
+
+# Memo por request de las tablas de referencia (FactorPrestacional, ParametrosMacro).
+# Evita ir al cache de Django (y deserializar el dict) en cada fila de un mismo
+# request. signals.py lo activa en request_started y lo descarta en request_finished;
+# fuera de un request (API, comandos) solo se usa el cache de Django.
+_memo_request = threading.local()
+
+# Claves invalidadas en la transacción abierta de este hilo, aún sin confirmar.
+# Mientras tanto la tabla se lee de la base sin pasar por el cache de Django,
+# para no publicar datos que pueden terminar en rollback.
+_invalidadas = threading.local()
+
+
+def _invalidada_sin_confirmar(cache_key):
+    claves = getattr(_invalidadas, 'claves', None)
+    if not claves:
+        return False
+    if not transaction.get_connection().in_atomic_block:
+        # La transacción terminó en rollback (on_commit no llegó a correr)
+        claves.clear()
+        return False
+    return cache_key in claves
+
+
+def _obtener_tabla_referencia(cache_key, cargar):
+    """Retorna el dict cacheado de una tabla de referencia, cargándolo con `cargar()` si falta."""
+    memo = getattr(_memo_request, 'tablas', None)
+    if memo is not None and cache_key in memo:
+        return memo[cache_key]
+
+    if _invalidada_sin_confirmar(cache_key):
+        tabla = cargar()
+    else:
+        tabla = cache.get(cache_key)
+        if tabla is None:
+            tabla = cargar()
+            cache.set(cache_key, tabla, settings.DXV_CACHE_TABLAS_TIMEOUT)
+
+    if memo is not None:
+        memo[cache_key] = tabla
+    return tabla
+
+
+def iniciar_memo_tablas_referencia():
+    _memo_request.tablas = {}
+
+
+def limpiar_memo_tablas_referencia():
+    _memo_request.tablas = None
+
+
+def invalidar_tabla_referencia(cache_key):
+    """
+    Descarta una tabla de referencia del cache de Django y del memo del request actual.
+
+    El borrado del cache de Django se hace al confirmar la transacción
+    (`transaction.on_commit`): antes de eso otro worker todavía lee los datos
+    viejos y podría volver a cachearlos. Hasta la confirmación, este hilo lee
+    la tabla directo de la base (ver `_invalidada_sin_confirmar`).
+    """
+    memo = getattr(_memo_request, 'tablas', None)
+    if memo is not None:
+        memo.pop(cache_key, None)
+
+    claves = getattr(_invalidadas, 'claves', None)
+    if claves is None:
+        claves = _invalidadas.claves = set()
+    claves.add(cache_key)
+
+    def confirmar():
+        cache.delete(cache_key)
+        claves.discard(cache_key)
+
+    transaction.on_commit(confirmar)
+
+
 # Choices globales para índices de incremento
 INDICE_INCREMENTO_CHOICES = [
     ('salarios', 'Incremento Salarios General'),
@@ -49,12 +149,452 @@ TIPO_ASIGNACION_OPERACION_CHOICES = [
     ('compartido', 'Compartido entre Operaciones'),
 ]
 
-CRITERIO_PRORRATEO_OPERACION_CHOICES = [
-    ('ventas', 'Por Ventas'),
-    ('zonas', 'Por Cantidad de Zonas'),
-    ('equitativo', 'Equitativo'),
+# Choices globales para asignación de recursos entre marcas
+ASIGNACION_CHOICES = [
+    ('individual', 'Individual'),
+    ('compartido', 'Compartido'),
+]
+
+ASIGNACION_MARCA_CHOICES = [
+    ('individual', 'Individual (asignado a una marca)'),
+    ('compartido', 'Compartido entre marcas'),
+]
+
+# Criterios de prorrateo entre marcas (compartidos). Cada área admite un
+# subconjunto distinto; los valores y etiquetas salen de un único enum.
+class CriterioProrrateo(models.TextChoices):
+    VENTAS = 'ventas', 'Por Ventas'
+    VOLUMEN = 'volumen', 'Por Volumen'
+    HEADCOUNT = 'headcount', 'Por Headcount'
+    EQUITATIVO = 'equitativo', 'Equitativo'
+    USO_REAL = 'uso_real', 'Por Uso Real'
+    ZONAS = 'zonas', 'Por Cantidad de Zonas'
+
+
+def _choices_de(*miembros):
+    """Lista de choices (valor, etiqueta) para un subconjunto de un enum TextChoices"""
+    return [(miembro.value, miembro.label) for miembro in miembros]
+
+
+CRITERIO_PRORRATEO_PERSONAL_CHOICES = _choices_de(
+    CriterioProrrateo.VENTAS,
+    CriterioProrrateo.VOLUMEN,
+    CriterioProrrateo.HEADCOUNT,
+    CriterioProrrateo.EQUITATIVO,
+)
+
+CRITERIO_PRORRATEO_ADMINISTRATIVO_CHOICES = _choices_de(
+    CriterioProrrateo.VENTAS,
+    CriterioProrrateo.HEADCOUNT,
+    CriterioProrrateo.EQUITATIVO,
+)
+
+CRITERIO_PRORRATEO_TRANSPORTE_CHOICES = _choices_de(
+    CriterioProrrateo.VOLUMEN,
+    CriterioProrrateo.VENTAS,
+    CriterioProrrateo.USO_REAL,
+)
+
+CRITERIO_PRORRATEO_OPERACION_CHOICES = _choices_de(
+    CriterioProrrateo.VENTAS,
+    CriterioProrrateo.ZONAS,
+    CriterioProrrateo.EQUITATIVO,
+)
+
+# Periodos por mes según frecuencia de visita/recorrido (Zona, RutaLogistica):
+# SEMANAL = 52 semanas / 12 meses, QUINCENAL = 24 / 12, MENSUAL = 12 / 12
+PERIODOS_POR_MES = {
+    'SEMANAL': Decimal('4.33'),
+    'QUINCENAL': Decimal('2.00'),
+    'MENSUAL': Decimal('1.00'),
+}
+
+# Tipos de gasto por área
+GASTO_ADMINISTRATIVO_TIPO_CHOICES = [
+    ('arriendo_oficina', 'Arriendo de Oficina'),
+    ('servicios_publicos', 'Servicios Públicos'),
+    ('internet_telefonia', 'Internet y Telefonía'),
+    ('vigilancia', 'Vigilancia y Seguridad'),
+    ('aseo_cafeteria', 'Aseo y Cafetería'),
+    ('papeleria', 'Papelería y Útiles'),
+    ('software_licencias', 'Software y Licencias'),
+    ('facturacion_electronica', 'Facturación Electrónica'),
+    ('seguros', 'Seguros'),
+    ('servicios_legales', 'Servicios Jurídicos y Legales'),
+    ('mantenimiento_locativo', 'Mantenimiento Locativo'),
+    ('gastos_financieros', 'Gastos Bancarios y Financieros'),
+    ('bienestar', 'Bienestar y Clima Laboral'),
+    ('dotacion', 'Dotación'),
+    ('examenes', 'Exámenes Médicos'),
+    ('telefonia_celular', 'Telefonía Celular y Datos'),
+    ('otros', 'Otros Gastos Administrativos'),
+]
+
+GASTO_COMERCIAL_TIPO_CHOICES = [
+    ('comisiones', 'Comisiones de Ventas'),
+    ('merchandising', 'Materiales de Merchandising'),
+    ('capacitacion', 'Capacitación y Entrenamiento'),
+    ('eventos', 'Eventos Comerciales'),
+    ('herramientas_digitales', 'Herramientas Digitales (CRM, Apps)'),
+    ('transporte_vendedores', 'Transporte de Vendedores'),
+    ('viaticos', 'Viáticos'),
+    ('publicidad', 'Publicidad y Marketing'),
+    ('muestras', 'Muestras y Degustaciones'),
+    ('dotacion', 'Dotación'),
+    ('epp', 'EPP (Solo Comercial)'),
+    ('examenes', 'Exámenes Médicos'),
+    ('telefonia_celular', 'Telefonía Celular y Datos'),
+    ('otros', 'Otros Gastos Comerciales'),
+]
+
+GASTO_LOGISTICO_TIPO_CHOICES = [
+    ('mantenimiento_vehiculos', 'Mantenimiento de Vehículos'),
+    ('seguros_carga', 'Seguros de Carga'),
+    ('peajes', 'Peajes y Parqueaderos'),
+    ('equipos_carga', 'Equipos de Carga (Estibas, Carretas)'),
+    ('combustible', 'Combustible'),
+    ('neumaticos', 'Neumáticos y Repuestos'),
+    # ('flete_tercero', 'Flete Transporte (Tercero)'),  # DEPRECADO: Usar tabla Vehículos con esquema='tercero'
+    ('canon_renting', 'Canon Renting'),
+    ('depreciacion_vehiculo', 'Depreciación Vehículos'),
+    ('lavado_vehiculos', 'Aseo y Limpieza Vehículos'),
+    ('parqueadero_vehiculos', 'Parqueaderos'),
+    ('monitoreo_satelital', 'Monitoreo Satelital (GPS)'),
+    ('bodegaje', 'Bodegaje Externo'),
+    ('equipos_bodega', 'Equipos de Bodega'),
+    ('embalaje', 'Material de Embalaje'),
+    ('arriendo_bodega', 'Arriendo Bodega y CEDI'),
+    ('servicios_publicos_bodega', 'Servicios Públicos Bodega'),
+    ('internet_bodega', 'Internet y Conectividad Bodega'),
+    ('seguro_bodega', 'Seguro Todo Riesgo Bodega'),
+    ('control_plagas', 'Control de Plagas y Fumigación'),
+    ('dotacion', 'Dotación y EPP'),
+    ('examenes', 'Exámenes Médicos'),
+    ('telefonia_celular', 'Telefonía Celular y Datos'),
+    ('otros', 'Otros Gastos Logísticos'),
 ]
 
+IMPUESTO_TIPO_CHOICES = [
+    ('iva', 'IVA'),
+    ('renta', 'Impuesto de Renta'),
+    ('ica', 'ICA (Industria y Comercio)'),
+    ('retefuente', 'Retención en la Fuente'),
+    ('reteica', 'Retención ICA'),
+    ('predial', 'Predial'),
+    ('vehiculos', 'Impuesto Vehículos'),
+    ('estampillas', 'Estampillas'),
+    ('otros', 'Otros Impuestos'),
+]
+
+
+class PersonalQuerySet(models.QuerySet):
+    """QuerySet compartido por los modelos de personal (comercial, logístico, administrativo)"""
+
+    def con_parametros_costo(self):
+        """
+        Itera (instancia, factor, macro) resolviendo FactorPrestacional y
+        ParametrosMacro una sola vez para todo el lote, para usar con
+        `calcular_costo_con_parametros` sin consultas por fila.
+        """
+        factores = {f.perfil: f for f in FactorPrestacional.objects.all()}
+        macros = {p.anio: p for p in ParametrosMacro.objects.filter(activo=True)}
+        for obj in self.select_related('escenario'):
+            macro = macros.get(obj.escenario.anio) if obj.escenario_id else None
+            yield obj, factores.get(obj.perfil_prestacional), macro
+
+    def costos_mensuales(self):
+        """Retorna {pk: costo_mensual} para todo el queryset"""
+        return {
+            obj.pk: obj.calcular_costo_con_parametros(factor, macro)
+            for obj, factor, macro in self.con_parametros_costo()
+        }
+
+    def anotar_costo_mensual(self):
+        """
+        Anota `costo_mensual_sql` con el mismo cálculo de `calcular_costo_mensual`,
+        resuelto en PostgreSQL mediante subconsultas a FactorPrestacional y
+        ParametrosMacro (sin iterar filas en Python).
+
+        Solo PostgreSQL: los auxilios del JSON se suman con `jsonb_each_text` y
+        `::numeric` (RawSQL), igual que los métodos que se apoyan en este
+        (`total_costo_mensual`, `actualizar_costo_mensual_cached`).
+        """
+        decimal = models.DecimalField(max_digits=20, decimal_places=6)
+        cero = Value(Decimal('0'), output_field=decimal)
+
+        factor_qs = FactorPrestacional.objects.filter(perfil=OuterRef('perfil_prestacional'))
+        factor_solo_salario = Subquery(factor_qs.annotate(v=ExpressionWrapper(
+            (F('salud') + F('pension') + F('arl') + F('caja_compensacion') +
+             F('icbf') + F('sena') + F('vacaciones')) / Value(Decimal('100')),
+            output_field=decimal,
+        )).values('v')[:1], output_field=decimal)
+        factor_con_subsidio = Subquery(factor_qs.annotate(v=ExpressionWrapper(
+            (F('cesantias') + F('intereses_cesantias') + F('prima')) / Value(Decimal('100')),
+            output_field=decimal,
+        )).values('v')[:1], output_field=decimal)
+
+        # Subsidio de transporte si aplica (<= 2 SMLV del año del escenario)
+        macro_qs = ParametrosMacro.objects.filter(anio=OuterRef('escenario__anio'), activo=True)
+        smlv = Subquery(macro_qs.values('salario_minimo_legal')[:1], output_field=decimal)
+        subsidio_transporte = Case(
+            When(salario_base__lte=smlv * 2,
+                 then=Subquery(macro_qs.values('subsidio_transporte')[:1], output_field=decimal)),
+            default=cero,
+            output_field=decimal,
+        )
+
+        # Auxilios no prestacionales: suma del JSON o, si está vacío, el campo legacy
+        auxilios = Case(
+            When(auxilios_no_prestacionales={}, then=Coalesce(F('auxilio_adicional'), cero)),
+            default=RawSQL(
+                'SELECT COALESCE(SUM(value::numeric), 0) FROM jsonb_each_text("%s"."auxilios_no_prestacionales")'
+                % self.model._meta.db_table,
+                (),
+                output_field=decimal,
+            ),
+            output_field=decimal,
+        )
+
+        salario = F('salario_base')
+        costo_nomina = F('cantidad') * (
+            salario * (1 + factor_solo_salario) +
+            (salario + subsidio_transporte) * factor_con_subsidio +
+            subsidio_transporte +
+            auxilios
+        )
+
+        casos = [When(Q(cantidad__isnull=True) | Q(cantidad=0), then=cero)]
+        if hasattr(self.model, 'TipoContrato'):
+            casos.append(When(
+                tipo_contrato=self.model.TipoContrato.HONORARIOS,
+                then=Coalesce(F('honorarios_mensuales'), cero) * F('cantidad'),
+            ))
+        casos += [
+            When(Q(salario_base__isnull=True) | Q(salario_base=0), then=cero),
+            # Si no existe factor, solo salario base * cantidad
+            When(~Exists(factor_qs), then=salario * F('cantidad')),
+        ]
+        return self.annotate(costo_mensual_sql=Case(*casos, default=costo_nomina, output_field=decimal))
+
+    def total_costo_mensual(self):
+        """Suma `calcular_costo_mensual` de todo el queryset en una sola consulta"""
+        return self.anotar_costo_mensual().aggregate(
+            total=Sum('costo_mensual_sql')
+        )['total'] or Decimal('0')
+
+    def actualizar_costo_mensual_cached(self):
+        """
+        Recalcula `costo_mensual_cached` (modelos que lo tienen) con un solo
+        UPDATE usando la misma expresión de `anotar_costo_mensual` (solo
+        PostgreSQL).
+        """
+        costo = self.model.objects.filter(pk=OuterRef('pk')).anotar_costo_mensual()
+        return self.update(costo_mensual_cached=Subquery(costo.values('costo_mensual_sql')[:1]))
+
+
+class GastoQuerySet(models.QuerySet):
+    """QuerySet compartido por los modelos de gasto (comercial, logístico, administrativo)"""
+
+    def para_reporte(self):
+        """
+        Carga solo las columnas que consumen los loaders del simulador (ver
+        CAMPOS_REPORTE de cada modelo) y la operación en el mismo JOIN, sin
+        traer `notas` ni marcas de tiempo.
+        """
+        return self.select_related('operacion').only(*self.model.CAMPOS_REPORTE)
+
+
+CAMPOS_REPORTE_GASTO = (
+    'id', 'escenario', 'marca', 'tipo', 'nombre', 'valor_mensual', 'asignacion',
+    'operacion', 'operacion__nombre', 'tipo_asignacion_operacion', 'criterio_prorrateo_operacion',
+)
+
+
+class ConRelacionesManager(models.Manager):
+    """
+    Manager que hace select_related de las FKs en `relaciones` por defecto, para
+    que __str__ y los listados no disparen una consulta por fila (N+1).
+
+    Las relaciones van como atributo de clase (no en __init__) porque Django
+    instancia los related managers sin argumentos a partir de esta clase.
+    """
+    relaciones = ()
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # select_related() sin argumentos seguiría todas las FKs
+        return qs.select_related(*self.relaciones) if self.relaciones else qs
+
+
+class MatrizDesplazamientoManager(ConRelacionesManager):
+    relaciones = ('origen', 'destino')
+
+
+class ZonaManager(ConRelacionesManager):
+    relaciones = ('marca', 'escenario', 'vendedor', 'municipio_base_vendedor')
+
+
+class ZonaMunicipioQuerySet(models.QuerySet):
+    """QuerySet de ZonaMunicipio con cálculos resueltos en SQL"""
+
+    def con_visitas_mensuales(self):
+        """
+        Anota `visitas_mensuales_db`: visitas_por_periodo × periodos por mes
+        de la frecuencia de la zona (PERIODOS_POR_MES). Mismo resultado que
+        ZonaMunicipio.visitas_mensuales() sin leer la zona en Python.
+        """
+        periodos = Case(
+            *[When(zona__frecuencia=frecuencia, then=Value(valor))
+              for frecuencia, valor in PERIODOS_POR_MES.items()],
+            default=Value(PERIODOS_POR_MES['MENSUAL']),
+            output_field=models.DecimalField(max_digits=4, decimal_places=2),
+        )
+        return self.annotate(visitas_mensuales_db=ExpressionWrapper(
+            F('visitas_por_periodo') * periodos,
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ))
+
+
+class ZonaMunicipioManager(ConRelacionesManager.from_queryset(ZonaMunicipioQuerySet)):
+    relaciones = ('zona', 'municipio')
+
+
+class ConfiguracionLejaniaManager(ConRelacionesManager):
+    relaciones = ('escenario', 'municipio_bodega', 'municipio_comite')
+
+
+def _asignaciones_con_marca(obj):
+    """
+    Asignaciones de marca de `obj` con su marca cargada: usa el prefetch de
+    'asignaciones_marca' si lo hay (listados del admin), si no un solo JOIN.
+    """
+    if 'asignaciones_marca' in getattr(obj, '_prefetched_objects_cache', {}):
+        return list(obj.asignaciones_marca.all())
+    return list(obj.asignaciones_marca.select_related('marca'))
+
+
+class CostoNominaMixin:
+    """
+    Cálculo del costo mensual de nómina compartido por los modelos de personal.
+
+    Usa la función compartida `calculadora_prestaciones.calcular_costo_nomina`
+    para garantizar consistencia con el simulador.
+
+    Según normativa laboral colombiana:
+    - Seguridad social y parafiscales: base = solo salario
+    - Cesantías, intereses cesantías y prima: base = salario + subsidio transporte
+    - Vacaciones: base = solo salario
+    """
+
+    @property
+    def total_auxilios_no_prestacionales(self) -> Decimal:
+        """Suma todos los auxilios no prestacionales del JSON."""
+        if not self.auxilios_no_prestacionales:
+            # Retrocompatibilidad: usar campo antiguo si existe
+            return self.auxilio_adicional or Decimal('0')
+        return sum(Decimal(str(v)) for v in self.auxilios_no_prestacionales.values())
+
+    def calcular_costo_mensual(self):
+        """Calcula el costo mensual total para este registro de personal."""
+        if not self.salario_base or not self.cantidad:
+            return self.calcular_costo_con_parametros(None, None)
+
+        try:
+            factor = FactorPrestacional.obtener_por_perfil(self.perfil_prestacional)
+        except FactorPrestacional.DoesNotExist:
+            factor = None
+
+        macro = None
+        if self.escenario_id:
+            try:
+                macro = ParametrosMacro.obtener_activo(self.escenario.anio)
+            except ParametrosMacro.DoesNotExist:
+                pass
+
+        return self.calcular_costo_con_parametros(factor, macro)
+
+    def calcular_costo_con_parametros(self, factor, macro):
+        """
+        Igual que `calcular_costo_mensual` pero con el factor prestacional y los
+        parámetros macro ya resueltos (None si no existen).
+        """
+        if not self.salario_base or not self.cantidad:
+            return 0
+
+        if factor is None:
+            # Si no existe factor, retornar solo salario base * cantidad
+            return self.salario_base * self.cantidad
+
+        # Determinar subsidio de transporte si aplica (<= 2 SMLV)
+        subsidio_transporte = Decimal('0')
+        if macro is not None and self.salario_base <= (macro.salario_minimo_legal * 2):
+            subsidio_transporte = macro.subsidio_transporte
+
+        # Usar función compartida
+        resultado = _calcular_costo_nomina_compartido(
+            salario_base=self.salario_base,
+            factores=factor,
+            subsidio_transporte=subsidio_transporte,
+            auxilio_adicional=self.total_auxilios_no_prestacionales,
+            cantidad=self.cantidad,
+        )
+        return resultado.costo_total
+
+    def calcular_costo_float(self, factor, macro):
+        """
+        Variante en float de `calcular_costo_con_parametros` para totales de
+        listados y reportes. No usar para valores que se persisten.
+        """
+        if not self.salario_base or not self.cantidad:
+            return 0.0
+
+        salario = float(self.salario_base)
+        if factor is None:
+            return salario * self.cantidad
+
+        subsidio_transporte = 0.0
+        if macro is not None and self.salario_base <= (macro.salario_minimo_legal * 2):
+            subsidio_transporte = float(macro.subsidio_transporte)
+
+        factor_solo_salario, factor_con_subsidio = factor.factores_float
+        return _calcular_costo_nomina_float_compartido(
+            salario_base=salario,
+            factor_solo_salario=factor_solo_salario,
+            factor_con_subsidio=factor_con_subsidio,
+            subsidio_transporte=subsidio_transporte,
+            auxilio_adicional=float(self.total_auxilios_no_prestacionales),
+            cantidad=self.cantidad,
+        )
+
+
+def _suma_cantidad_por_marca(modelo):
+    """Subconsulta con la suma de `cantidad` de `modelo` para la marca de la fila externa"""
+    suma = (
+        modelo.objects.filter(marca=OuterRef('pk'))
+        .order_by()
+        .values('marca')
+        .annotate(total=Sum('cantidad'))
+        .values('total')
+    )
+    return Coalesce(Subquery(suma), 0)
+
+
+class MarcaQuerySet(models.QuerySet):
+
+    def anotar_totales(self):
+        """
+        Anota `total_empleados_sql` (comercial + logístico) y `total_vehiculos_sql`
+        con subconsultas agregadas, en la misma consulta del listado en vez de
+        tres aggregate() por marca.
+        """
+        return self.annotate(
+            total_empleados_sql=(
+                _suma_cantidad_por_marca(PersonalComercial)
+                + _suma_cantidad_por_marca(PersonalLogistico)
+            ),
+            total_vehiculos_sql=_suma_cantidad_por_marca(Vehiculo),
+        )
+
 
 class Marca(models.Model):
     """Modelo para las marcas del sistema"""
@@ -67,11 +607,17 @@ class Marca(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
+    objects = MarcaQuerySet.as_manager()
+
     class Meta:
         db_table = 'dxv_marca'
         verbose_name = "Marca"
         verbose_name_plural = "Marcas"
         ordering = ['nombre']
+        indexes = [
+            # Selector de marcas y loaders: solo marcas activas, ordenadas por nombre
+            models.Index(fields=['nombre'], condition=Q(activa=True), name='marca_activa_nombre_idx'),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -87,8 +633,8 @@ class Escenario(models.Model):
     ]
 
     nombre = models.CharField(max_length=200, verbose_name="Nombre", help_text="Ej: 'Plan 2025', 'Real Q1 2025'")
-    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name="Tipo de Escenario")
-    anio = models.IntegerField(verbose_name="Año")
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, db_index=True, verbose_name="Tipo de Escenario")
+    anio = models.IntegerField(db_index=True, verbose_name="Año")
     activo = models.BooleanField(default=False, verbose_name="Activo", help_text="Escenario activo para simulación")
 
     notas = models.TextField(blank=True, verbose_name="Notas")
@@ -291,7 +837,7 @@ class MarcaOperacion(models.Model):
             zona.save()  # Esto dispara el recálculo de venta_proyectada en Zona
 
 
-class PersonalComercial(models.Model):
+class PersonalComercial(CostoNominaMixin, models.Model):
     """Personal del área comercial"""
 
     TIPO_CHOICES = [
@@ -309,11 +855,6 @@ class PersonalComercial(models.Model):
         ('administrativo', 'Administrativo (Riesgo I - Coordinadores)'),
     ]
 
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual'),
-        ('compartido', 'Compartido'),
-    ]
-
     escenario = models.ForeignKey(
         'Escenario',
         on_delete=models.CASCADE,
@@ -333,10 +874,10 @@ class PersonalComercial(models.Model):
         help_text="DEPRECADO: Usar asignaciones multi-marca en su lugar"
     )
     nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción", help_text="Ej: 'Vendedor Zona Norte', 'Supervisor Equipo A'", default='', blank=True)
-    tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Personal")
+    tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, db_index=True, verbose_name="Tipo de Personal")
     cantidad = models.IntegerField(validators=[MinValueValidator(1)], verbose_name="Cantidad")
     salario_base = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Salario Base")
-    perfil_prestacional = models.CharField(max_length=20, choices=PERFIL_CHOICES, default='comercial')
+    perfil_prestacional = models.CharField(max_length=20, choices=PERFIL_CHOICES, default='comercial', db_index=True)
     asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='individual', verbose_name="Asignación Marca")
 
     # Auxilios no prestacionales (JSON flexible)
@@ -370,12 +911,7 @@ class PersonalComercial(models.Model):
     )
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('ventas', 'Por Ventas'),
-            ('volumen', 'Por Volumen'),
-            ('headcount', 'Por Headcount'),
-            ('equitativo', 'Equitativo'),
-        ],
+        choices=CRITERIO_PRORRATEO_PERSONAL_CHOICES,
         null=True,
         blank=True
     )
@@ -410,8 +946,10 @@ class PersonalComercial(models.Model):
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
+
+    objects = PersonalQuerySet.as_manager()
 
     class Meta:
         db_table = 'dxv_personal_comercial'
@@ -419,57 +957,6 @@ class PersonalComercial(models.Model):
         verbose_name_plural = "Personal Comercial"
         ordering = ['marca', 'tipo']
 
-    def calcular_costo_mensual(self):
-        """
-        Calcula el costo mensual total para este registro de personal.
-
-        Usa la función compartida `calculadora_prestaciones.calcular_costo_nomina`
-        para garantizar consistencia con el simulador.
-
-        Según normativa laboral colombiana:
-        - Seguridad social y parafiscales: base = solo salario
-        - Cesantías, intereses cesantías y prima: base = salario + subsidio transporte
-        - Vacaciones: base = solo salario
-        """
-        if not self.salario_base or not self.cantidad:
-            return 0
-
-        try:
-            # Obtener factor prestacional
-            factor = FactorPrestacional.objects.get(perfil=self.perfil_prestacional)
-
-            # Determinar subsidio de transporte si aplica (<= 2 SMLV)
-            subsidio_transporte = Decimal('0')
-            if self.escenario:
-                try:
-                    macro = ParametrosMacro.objects.get(anio=self.escenario.anio, activo=True)
-                    if self.salario_base <= (macro.salario_minimo_legal * 2):
-                        subsidio_transporte = macro.subsidio_transporte
-                except ParametrosMacro.DoesNotExist:
-                    pass
-
-            # Usar función compartida
-            resultado = _calcular_costo_nomina_compartido(
-                salario_base=self.salario_base,
-                factores=factor,
-                subsidio_transporte=subsidio_transporte,
-                auxilio_adicional=self.total_auxilios_no_prestacionales,
-                cantidad=self.cantidad,
-            )
-            return resultado.costo_total
-
-        except FactorPrestacional.DoesNotExist:
-            # Si no existe factor, retornar solo salario base * cantidad
-            return self.salario_base * self.cantidad
-
-    @property
-    def total_auxilios_no_prestacionales(self) -> Decimal:
-        """Suma todos los auxilios no prestacionales del JSON."""
-        if not self.auxilios_no_prestacionales:
-            # Retrocompatibilidad: usar campo antiguo si existe
-            return self.auxilio_adicional or Decimal('0')
-        return sum(Decimal(str(v)) for v in self.auxilios_no_prestacionales.values())
-
     # =========================================================================
     # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
     # =========================================================================
@@ -503,8 +990,8 @@ class PersonalComercial(models.Model):
     @property
     def marcas_display(self):
         """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
+        asignaciones = _asignaciones_con_marca(self)
+        if asignaciones:
             return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
         # Fallback: usar campo antiguo
         if self.marca:
@@ -528,7 +1015,7 @@ class PersonalComercial(models.Model):
         return f"{marcas} - {self.nombre} ({self.cantidad})"
 
 
-class PersonalLogistico(models.Model):
+class PersonalLogistico(CostoNominaMixin, models.Model):
     """Personal del área logística"""
 
     TIPO_CHOICES = [
@@ -547,11 +1034,6 @@ class PersonalLogistico(models.Model):
         ('administrativo', 'Administrativo (Riesgo I - Coordinadores)'),
     ]
 
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual'),
-        ('compartido', 'Compartido'),
-    ]
-
     escenario = models.ForeignKey(
         'Escenario',
         on_delete=models.CASCADE,
@@ -563,10 +1045,10 @@ class PersonalLogistico(models.Model):
     )
     marca = models.ForeignKey(Marca, on_delete=models.CASCADE, related_name='personal_logistico')
     nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción", help_text="Ej: 'Conductor Ruta Principal', 'Auxiliar Bodega CEDI'", default='', blank=True)
-    tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Personal")
+    tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, db_index=True, verbose_name="Tipo de Personal")
     cantidad = models.IntegerField(validators=[MinValueValidator(1)], verbose_name="Cantidad")
     salario_base = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Salario Base")
-    perfil_prestacional = models.CharField(max_length=20, choices=PERFIL_CHOICES, default='logistico_calle')
+    perfil_prestacional = models.CharField(max_length=20, choices=PERFIL_CHOICES, default='logistico_calle', db_index=True)
     asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='individual', verbose_name="Asignación Marca")
 
     # Auxilios no prestacionales (JSON flexible)
@@ -605,12 +1087,7 @@ class PersonalLogistico(models.Model):
     )
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('ventas', 'Por Ventas'),
-            ('volumen', 'Por Volumen'),
-            ('headcount', 'Por Headcount'),
-            ('equitativo', 'Equitativo'),
-        ],
+        choices=CRITERIO_PRORRATEO_PERSONAL_CHOICES,
         null=True,
         blank=True
     )
@@ -659,8 +1136,10 @@ class PersonalLogistico(models.Model):
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
+
+    objects = PersonalQuerySet.as_manager()
 
     class Meta:
         db_table = 'dxv_personal_logistico'
@@ -668,52 +1147,6 @@ class PersonalLogistico(models.Model):
         verbose_name_plural = "Personal Logístico"
         ordering = ['marca', 'tipo']
 
-    def calcular_costo_mensual(self):
-        """
-        Calcula el costo mensual total para este registro de personal.
-
-        Usa la función compartida `calculadora_prestaciones.calcular_costo_nomina`
-        para garantizar consistencia con el simulador.
-        """
-        if not self.salario_base or not self.cantidad:
-            return 0
-
-        try:
-            # Obtener factor prestacional
-            factor = FactorPrestacional.objects.get(perfil=self.perfil_prestacional)
-
-            # Determinar subsidio de transporte si aplica (<= 2 SMLV)
-            subsidio_transporte = Decimal('0')
-            if self.escenario:
-                try:
-                    macro = ParametrosMacro.objects.get(anio=self.escenario.anio, activo=True)
-                    if self.salario_base <= (macro.salario_minimo_legal * 2):
-                        subsidio_transporte = macro.subsidio_transporte
-                except ParametrosMacro.DoesNotExist:
-                    pass
-
-            # Usar función compartida
-            resultado = _calcular_costo_nomina_compartido(
-                salario_base=self.salario_base,
-                factores=factor,
-                subsidio_transporte=subsidio_transporte,
-                auxilio_adicional=self.total_auxilios_no_prestacionales,
-                cantidad=self.cantidad,
-            )
-            return resultado.costo_total
-
-        except FactorPrestacional.DoesNotExist:
-            # Si no existe factor, retornar solo salario base * cantidad
-            return self.salario_base * self.cantidad
-
-    @property
-    def total_auxilios_no_prestacionales(self) -> Decimal:
-        """Suma todos los auxilios no prestacionales del JSON."""
-        if not self.auxilios_no_prestacionales:
-            # Retrocompatibilidad: usar campo antiguo si existe
-            return self.auxilio_adicional or Decimal('0')
-        return sum(Decimal(str(v)) for v in self.auxilios_no_prestacionales.values())
-
     # =========================================================================
     # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
     # =========================================================================
@@ -741,8 +1174,8 @@ class PersonalLogistico(models.Model):
     @property
     def marcas_display(self):
         """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
+        asignaciones = _asignaciones_con_marca(self)
+        if asignaciones:
             return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
         if self.marca:
             return self.marca.nombre
@@ -766,16 +1199,14 @@ class Vehiculo(models.Model):
         ('npr', 'NPR'),
     ]
 
-    ESQUEMA_CHOICES = [
-        ('renting', 'Renting'),
-        ('tradicional', 'Tradicional (Propio)'),
-        ('tercero', 'Tercero (Flete)'),
-    ]
+    class Esquema(models.TextChoices):
+        RENTING = 'renting', 'Renting'
+        TRADICIONAL = 'tradicional', 'Tradicional (Propio)'
+        TERCERO = 'tercero', 'Tercero (Flete)'
 
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual'),
-        ('compartido', 'Compartido'),
-    ]
+    class TipoCombustible(models.TextChoices):
+        GASOLINA = 'gasolina', 'Gasolina'
+        ACPM = 'acpm', 'ACPM (Diesel)'
 
     marca = models.ForeignKey(Marca, on_delete=models.CASCADE, related_name='vehiculos')
     escenario = models.ForeignKey(
@@ -794,8 +1225,8 @@ class Vehiculo(models.Model):
         default='',
         blank=True
     )
-    tipo_vehiculo = models.CharField(max_length=50, choices=TIPO_VEHICULO_CHOICES, verbose_name="Tipo de Vehículo")
-    esquema = models.CharField(max_length=20, choices=ESQUEMA_CHOICES, verbose_name="Esquema")
+    tipo_vehiculo = models.CharField(max_length=50, choices=TIPO_VEHICULO_CHOICES, db_index=True, verbose_name="Tipo de Vehículo")
+    esquema = models.CharField(max_length=20, choices=Esquema.choices, db_index=True, verbose_name="Esquema")
     cantidad = models.IntegerField(validators=[MinValueValidator(1)], verbose_name="Cantidad")
     asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='individual', verbose_name="Asignación Marca")
 
@@ -813,11 +1244,8 @@ class Vehiculo(models.Model):
     consumo_galon_km = models.DecimalField(max_digits=5, decimal_places=2, default=30, verbose_name="Km por Galón", help_text="Rendimiento del vehículo")
     tipo_combustible = models.CharField(
         max_length=10,
-        choices=[
-            ('gasolina', 'Gasolina'),
-            ('acpm', 'ACPM (Diesel)'),
-        ],
-        default='acpm',
+        choices=TipoCombustible.choices,
+        default=TipoCombustible.ACPM,
         verbose_name="Tipo de Combustible",
         help_text="Tipo de combustible que usa el vehículo"
     )
@@ -857,12 +1285,8 @@ class Vehiculo(models.Model):
     )
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('volumen', 'Por Volumen'),
-            ('ventas', 'Por Ventas'),
-            ('uso_real', 'Por Uso Real'),
-        ],
-        default='volumen',
+        choices=CRITERIO_PRORRATEO_TRANSPORTE_CHOICES,
+        default=CriterioProrrateo.VOLUMEN,
         null=True,
         blank=True
     )
@@ -893,14 +1317,18 @@ class Vehiculo(models.Model):
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
 
     class Meta:
         db_table = 'dxv_vehiculo'
         verbose_name = "Vehículo"
         verbose_name_plural = "Vehículos"
         ordering = ['marca', 'tipo_vehiculo']
+        indexes = [
+            # Flota por marca en el escenario (gastos logísticos, P&G, loaders)
+            models.Index(fields=['escenario', 'marca'], name='vehiculo_esc_marca_idx'),
+        ]
 
     def calcular_costo_mensual(self):
         """
@@ -917,20 +1345,20 @@ class Vehiculo(models.Model):
             total += (self.costo_monitoreo_mensual or 0) * cantidad
             total += (self.costo_seguro_mercancia_mensual or 0) * cantidad
 
-            if self.esquema == 'tercero':
+            if self.esquema == self.Esquema.TERCERO:
                 # Para terceros, el costo viene del flete base en los recorridos
                 # Aquí solo se incluyen costos adicionales fijos si los hay
                 pass
 
-            elif self.esquema in ['renting', 'tradicional']:
+            elif self.esquema in (self.Esquema.RENTING, self.Esquema.TRADICIONAL):
                 # Costos comunes Propio/Renting
                 total += (self.costo_lavado_mensual or 0) * cantidad
                 total += (self.costo_parqueadero_mensual or 0) * cantidad
 
-                if self.esquema == 'renting':
+                if self.esquema == self.Esquema.RENTING:
                     total += (self.canon_renting or 0) * cantidad
 
-                elif self.esquema == 'tradicional':
+                elif self.esquema == self.Esquema.TRADICIONAL:
                     # Depreciación
                     vida_util = self.vida_util_anios or 0
                     if vida_util > 0:
@@ -947,9 +1375,11 @@ class Vehiculo(models.Model):
             return 0
 
     def __str__(self):
+        tipo_vehiculo = self.get_tipo_vehiculo_display()
+        esquema = self.get_esquema_display()
         if self.nombre:
-            return f"{self.nombre} ({self.get_tipo_vehiculo_display()} - {self.get_esquema_display()})"
-        return f"{self.marca.nombre} - {self.get_tipo_vehiculo_display()} {self.get_esquema_display()} ({self.cantidad})"
+            return f"{self.nombre} ({tipo_vehiculo} - {esquema})"
+        return f"{self.marca.nombre} - {tipo_vehiculo} {esquema} ({self.cantidad})"
 
 
 class ParametrosMacro(models.Model):
@@ -1057,10 +1487,44 @@ class ParametrosMacro(models.Model):
         verbose_name = "Parámetros Macroeconómicos"
         verbose_name_plural = "Parámetros Macroeconómicos"
         ordering = ['-anio']
+        indexes = [
+            # Lecturas de parámetros vigentes (filter(activo=True) ordenado por año)
+            models.Index(fields=['anio'], condition=Q(activo=True), name='param_macro_activo_anio_idx'),
+        ]
 
     def __str__(self):
         return f"Parámetros {self.anio}"
 
+    CACHE_KEY = 'dxv:parametros_macro'
+
+    @classmethod
+    def _por_anio(cls):
+        """{anio: parámetros} de todos los años, activos o no, desde el cache de Django."""
+        return _obtener_tabla_referencia(
+            cls.CACHE_KEY, lambda: {p.anio: p for p in cls.objects.all()}
+        )
+
+    @classmethod
+    def obtener_activo(cls, anio):
+        """
+        Retorna los parámetros activos del año usando el cache de Django.
+
+        Equivale a `objects.get(anio=anio, activo=True)` (lanza DoesNotExist
+        si no hay registro). La invalidación se hace en signals.py.
+        """
+        parametros = cls._por_anio().get(anio)
+        if parametros is None or not parametros.activo:
+            raise cls.DoesNotExist(f"No hay ParametrosMacro activos para {anio}")
+        return parametros
+
+    @classmethod
+    def obtener_por_anio(cls, anio):
+        """Igual que `obtener_activo` pero sin exigir `activo` (`objects.get(anio=anio)`)."""
+        try:
+            return cls._por_anio()[anio]
+        except KeyError:
+            raise cls.DoesNotExist(f"No hay ParametrosMacro para {anio}")
+
 
 class FactorPrestacional(models.Model):
     """
@@ -1212,6 +1676,19 @@ class FactorPrestacional(models.Model):
         help_text="Base: SOLO salario. Usar 0% si supernumerarios se modelan aparte (recomendado). Usar 4.17% solo para provisión contable."
     )
 
+    # Suma de todos los componentes en formato porcentaje (52.0 para 52%),
+    # calculada por la BD al insertar/actualizar: no puede desalinearse de ellos
+    factor_total_porcentaje = models.GeneratedField(
+        expression=(
+            F('salud') + F('pension') + F('arl') + F('caja_compensacion') +
+            F('icbf') + F('sena') + F('cesantias') + F('intereses_cesantias') +
+            F('prima') + F('vacaciones')
+        ),
+        output_field=models.DecimalField(max_digits=6, decimal_places=2),
+        db_persist=True,
+        verbose_name="Factor Total (%)",
+    )
+
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
@@ -1227,27 +1704,50 @@ class FactorPrestacional(models.Model):
         Calcula el factor total sumando todos los componentes.
         Retorna en formato Decimal (0.52 para 52%) para usar en cálculos.
         """
-        suma_porcentajes = (
-            self.salud + self.pension + self.arl + self.caja_compensacion +
-            self.icbf + self.sena + self.cesantias + self.intereses_cesantias +
-            self.prima + self.vacaciones
-        )
-        return suma_porcentajes / Decimal('100')
+        return self.factor_total_porcentaje / Decimal('100')
 
-    @property
-    def factor_total_porcentaje(self):
-        """Retorna el factor total en formato porcentaje (52.0 para 52%)"""
-        return (
+    @cached_property
+    def factores_float(self):
+        """
+        (factor_solo_salario, factor_con_subsidio) en float decimal (0-1), con la
+        misma separación de `calculadora_prestaciones.FactoresPrestacionales`.
+        Se calcula una vez por instancia para los cálculos masivos en float.
+        """
+        solo_salario = (
             self.salud + self.pension + self.arl + self.caja_compensacion +
-            self.icbf + self.sena + self.cesantias + self.intereses_cesantias +
-            self.prima + self.vacaciones
+            self.icbf + self.sena + self.vacaciones
         )
+        con_subsidio = self.cesantias + self.intereses_cesantias + self.prima
+        return float(solo_salario) / 100.0, float(con_subsidio) / 100.0
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # La BD recalcula la columna generada; traerla para que la instancia no quede desfasada
+        self.refresh_from_db(fields=['factor_total_porcentaje'])
 
     def __str__(self):
         return f"{self.get_perfil_display()} - {self.factor_total_porcentaje:.2f}%"
 
+    CACHE_KEY = 'dxv:factores_prestacionales'
 
-class PersonalAdministrativo(models.Model):
+    @classmethod
+    def obtener_por_perfil(cls, perfil):
+        """
+        Retorna el factor del perfil usando el cache de Django.
+
+        Equivale a `objects.get(perfil=perfil)` (lanza DoesNotExist si no
+        existe). La invalidación se hace en signals.py.
+        """
+        factores = _obtener_tabla_referencia(
+            cls.CACHE_KEY, lambda: {f.perfil: f for f in cls.objects.all()}
+        )
+        try:
+            return factores[perfil]
+        except KeyError:
+            raise cls.DoesNotExist(f"No existe FactorPrestacional para perfil '{perfil}'")
+
+
+class PersonalAdministrativo(CostoNominaMixin, models.Model):
     """Personal administrativo (puede ser compartido entre marcas)"""
 
     TIPO_CHOICES = [
@@ -1263,15 +1763,9 @@ class PersonalAdministrativo(models.Model):
         ('desarrollador_talento', 'Desarrollador de Talento'),
     ]
 
-    TIPO_CONTRATO_CHOICES = [
-        ('nomina', 'Nómina'),
-        ('honorarios', 'Honorarios'),
-    ]
-
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual (asignado a una marca)'),
-        ('compartido', 'Compartido entre marcas'),
-    ]
+    class TipoContrato(models.TextChoices):
+        NOMINA = 'nomina', 'Nómina'
+        HONORARIOS = 'honorarios', 'Honorarios'
 
     escenario = models.ForeignKey(
         'Escenario',
@@ -1294,7 +1788,7 @@ class PersonalAdministrativo(models.Model):
     nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción")
     tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Personal")
     cantidad = models.IntegerField(validators=[MinValueValidator(1)], verbose_name="Cantidad")
-    tipo_contrato = models.CharField(max_length=20, choices=TIPO_CONTRATO_CHOICES, default='nomina')
+    tipo_contrato = models.CharField(max_length=20, choices=TipoContrato.choices, default=TipoContrato.NOMINA)
 
     # Perfiles disponibles para personal administrativo
     PERFIL_CHOICES = [
@@ -1335,15 +1829,11 @@ class PersonalAdministrativo(models.Model):
         help_text="Índice a usar para proyecciones de años futuros"
     )
 
-    asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='compartido', verbose_name="Asignación Marca")
+    asignacion = models.CharField(max_length=20, choices=ASIGNACION_MARCA_CHOICES, default='compartido', verbose_name="Asignación Marca")
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('ventas', 'Por Ventas'),
-            ('headcount', 'Por Headcount'),
-            ('equitativo', 'Equitativo'),
-        ],
-        default='equitativo',
+        choices=CRITERIO_PRORRATEO_ADMINISTRATIVO_CHOICES,
+        default=CriterioProrrateo.EQUITATIVO,
         null=True,
         blank=True,
         help_text="Solo aplica para asignación compartida"
@@ -1380,84 +1870,137 @@ class PersonalAdministrativo(models.Model):
     criterio_prorrateo_operacion = models.CharField(
         max_length=20,
         choices=CRITERIO_PRORRATEO_OPERACION_CHOICES,
-        default='equitativo',
+        default=CriterioProrrateo.EQUITATIVO,
         null=True,
         blank=True,
         verbose_name="Criterio Prorrateo Operación",
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    # Desnormalizado: se recalcula en save() y, cuando cambian FactorPrestacional,
+    # ParametrosMacro o el año del escenario, desde core.signals
+    costo_mensual_cached = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Costo Mensual (calculado)"
+    )
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    objects = PersonalQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'dxv_personal_administrativo'
+        verbose_name = "Personal Administrativo"
+        verbose_name_plural = "Personal Administrativo"
+        ordering = ['tipo']
+        indexes = [
+            # Parcial: solo personal compartido (ver DataLoaderDB.cargar_compartidos_administrativo)
+            models.Index(fields=['escenario'], condition=Q(asignacion='compartido'),
+                         name='personal_adm_compartido_idx'),
+        ]
+
+    def calcular_costo_con_parametros(self, factor, macro):
+        """Agrega el caso de contrato por honorarios al cálculo de nómina."""
+        if not self.cantidad:
+            return 0
+
+        # Si es contrato por honorarios
+        if self.tipo_contrato == self.TipoContrato.HONORARIOS:
+            if not self.honorarios_mensuales:
+                return 0
+            return self.honorarios_mensuales * self.cantidad
+
+        # Si es contrato de nómina
+        return super().calcular_costo_con_parametros(factor, macro)
+
+    def calcular_costo_float(self, factor, macro):
+        if self.tipo_contrato == self.TipoContrato.HONORARIOS:
+            return float(self.calcular_costo_con_parametros(factor, macro))
+        return super().calcular_costo_float(factor, macro)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # En SQL, como los refrescos de core.signals: calcular_costo_mensual()
+        # importa core.calculadora_prestaciones, que el contenedor del admin no trae
+        PersonalAdministrativo.objects.filter(pk=self.pk).actualizar_costo_mensual_cached()
+        self.refresh_from_db(fields=['costo_mensual_cached'])
+
+    # =========================================================================
+    # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
+    # =========================================================================
+
+    def get_distribucion_marcas(self):
+        """Retorna la distribución de este recurso entre marcas."""
+        asignaciones = self.asignaciones_marca.select_related('marca').all()
+        if asignaciones.exists():
+            return {
+                asig.marca.marca_id: asig.porcentaje / Decimal('100')
+                for asig in asignaciones
+            }
+        if self.marca_id:
+            return {self.marca.marca_id: Decimal('1')}
+        return {}
+
+    @property
+    def es_compartido(self):
+        """True si el recurso está asignado a múltiples marcas."""
+        asignaciones = self.asignaciones_marca.all()
+        if asignaciones.exists():
+            return asignaciones.count() > 1
+        return self.asignacion == 'compartido'
+
+    @property
+    def marcas_display(self):
+        """Retorna string con nombres de marcas para mostrar en admin."""
+        asignaciones = _asignaciones_con_marca(self)
+        if asignaciones:
+            return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
+        if self.marca:
+            return self.marca.nombre
+        return "Compartido"
+
+    def __str__(self):
+        marcas = self.marcas_display
+        return f"{marcas} - {self.get_tipo_display()} ({self.cantidad})"
 
-    class Meta:
-        db_table = 'dxv_personal_administrativo'
-        verbose_name = "Personal Administrativo"
-        verbose_name_plural = "Personal Administrativo"
-        ordering = ['tipo']
 
-    def calcular_costo_mensual(self):
-        """
-        Calcula el costo mensual total para este registro de personal.
+class GastoBase(models.Model):
+    """
+    Campos y métodos comunes de los gastos (administrativo, comercial,
+    logístico). Es abstracta: cada área conserva su propia tabla; las FKs se
+    declaran en cada modelo porque sus related_name difieren.
+    """
 
-        Usa la función compartida `calculadora_prestaciones.calcular_costo_nomina`
-        para garantizar consistencia con el simulador.
-        """
-        if not self.cantidad:
-            return 0
+    nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción")
+    valor_mensual = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Valor Mensual")
 
-        # Si es contrato por honorarios
-        if self.tipo_contrato == 'honorarios':
-            if not self.honorarios_mensuales:
-                return 0
-            return self.honorarios_mensuales * self.cantidad
+    notas = models.TextField(blank=True, verbose_name="Notas")
 
-        # Si es contrato de nómina
-        if not self.salario_base:
-            return 0
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
 
-        try:
-            # Obtener factor prestacional
-            factor = FactorPrestacional.objects.get(perfil=self.perfil_prestacional)
-
-            # Determinar subsidio de transporte si aplica (<= 2 SMLV)
-            subsidio_transporte = Decimal('0')
-            if self.escenario:
-                try:
-                    macro = ParametrosMacro.objects.get(anio=self.escenario.anio, activo=True)
-                    if self.salario_base <= (macro.salario_minimo_legal * 2):
-                        subsidio_transporte = macro.subsidio_transporte
-                except ParametrosMacro.DoesNotExist:
-                    pass
-
-            # Usar función compartida
-            resultado = _calcular_costo_nomina_compartido(
-                salario_base=self.salario_base,
-                factores=factor,
-                subsidio_transporte=subsidio_transporte,
-                auxilio_adicional=self.total_auxilios_no_prestacionales,
-                cantidad=self.cantidad,
-            )
-            return resultado.costo_total
+    # Columnas que leen los loaders del simulador (ver GastoQuerySet.para_reporte)
+    CAMPOS_REPORTE = CAMPOS_REPORTE_GASTO
 
-        except FactorPrestacional.DoesNotExist:
-            # Si no existe factor, retornar solo salario base * cantidad
-            return self.salario_base * self.cantidad
+    # Texto de marcas_display cuando el gasto no tiene marca ni asignaciones
+    MARCAS_DISPLAY_VACIO = "-"
 
-    @property
-    def total_auxilios_no_prestacionales(self) -> Decimal:
-        """Suma todos los auxilios no prestacionales del JSON."""
-        if not self.auxilios_no_prestacionales:
-            # Retrocompatibilidad: usar campo antiguo si existe
-            return self.auxilio_adicional or Decimal('0')
-        return sum(Decimal(str(v)) for v in self.auxilios_no_prestacionales.values())
+    objects = GastoQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
 
     # =========================================================================
     # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
     # =========================================================================
 
     def get_distribucion_marcas(self):
-        """Retorna la distribución de este recurso entre marcas."""
+        """Retorna la distribución de este gasto entre marcas."""
         asignaciones = self.asignaciones_marca.select_related('marca').all()
         if asignaciones.exists():
             return {
@@ -1470,7 +2013,7 @@ class PersonalAdministrativo(models.Model):
 
     @property
     def es_compartido(self):
-        """True si el recurso está asignado a múltiples marcas."""
+        """True si el gasto está asignado a múltiples marcas."""
         asignaciones = self.asignaciones_marca.all()
         if asignaciones.exists():
             return asignaciones.count() > 1
@@ -1479,45 +2022,18 @@ class PersonalAdministrativo(models.Model):
     @property
     def marcas_display(self):
         """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
+        asignaciones = _asignaciones_con_marca(self)
+        if asignaciones:
             return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
         if self.marca:
             return self.marca.nombre
-        return "Compartido"
-
-    def __str__(self):
-        marcas = self.marcas_display
-        return f"{marcas} - {self.get_tipo_display()} ({self.cantidad})"
+        return self.MARCAS_DISPLAY_VACIO
 
 
-class GastoAdministrativo(models.Model):
+class GastoAdministrativo(GastoBase):
     """Gastos administrativos generales (pueden ser compartidos o individuales)"""
 
-    TIPO_CHOICES = [
-        ('arriendo_oficina', 'Arriendo de Oficina'),
-        ('servicios_publicos', 'Servicios Públicos'),
-        ('internet_telefonia', 'Internet y Telefonía'),
-        ('vigilancia', 'Vigilancia y Seguridad'),
-        ('aseo_cafeteria', 'Aseo y Cafetería'),
-        ('papeleria', 'Papelería y Útiles'),
-        ('software_licencias', 'Software y Licencias'),
-        ('facturacion_electronica', 'Facturación Electrónica'),
-        ('seguros', 'Seguros'),
-        ('servicios_legales', 'Servicios Jurídicos y Legales'),
-        ('mantenimiento_locativo', 'Mantenimiento Locativo'),
-        ('gastos_financieros', 'Gastos Bancarios y Financieros'),
-        ('bienestar', 'Bienestar y Clima Laboral'),
-        ('dotacion', 'Dotación'),
-        ('examenes', 'Exámenes Médicos'),
-        ('telefonia_celular', 'Telefonía Celular y Datos'),
-        ('otros', 'Otros Gastos Administrativos'),
-    ]
-
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual (asignado a una marca)'),
-        ('compartido', 'Compartido entre marcas'),
-    ]
+    TIPO_CHOICES = GASTO_ADMINISTRATIVO_TIPO_CHOICES
 
     marca = models.ForeignKey(
         Marca,
@@ -1537,10 +2053,8 @@ class GastoAdministrativo(models.Model):
         null=True,
         blank=True
     )
-    nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción")
     tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Gasto")
-    valor_mensual = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Valor Mensual")
-    asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='compartido', verbose_name="Asignación Marca")
+    asignacion = models.CharField(max_length=20, choices=ASIGNACION_MARCA_CHOICES, default='compartido', verbose_name="Asignación Marca")
     
     # Índice de incremento para proyecciones
     indice_incremento = models.CharField(
@@ -1553,12 +2067,8 @@ class GastoAdministrativo(models.Model):
     
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('ventas', 'Por Ventas'),
-            ('headcount', 'Por Headcount'),
-            ('equitativo', 'Equitativo'),
-        ],
-        default='ventas',
+        choices=CRITERIO_PRORRATEO_ADMINISTRATIVO_CHOICES,
+        default=CriterioProrrateo.VENTAS,
         null=True,
         blank=True,
         help_text="Solo aplica para asignación compartida"
@@ -1593,87 +2103,48 @@ class GastoAdministrativo(models.Model):
     criterio_prorrateo_operacion = models.CharField(
         max_length=20,
         choices=CRITERIO_PRORRATEO_OPERACION_CHOICES,
-        default='equitativo',
+        default=CriterioProrrateo.EQUITATIVO,
         null=True,
         blank=True,
         verbose_name="Criterio Prorrateo Operación",
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    notas = models.TextField(blank=True, verbose_name="Notas")
-
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    # Columnas que leen los loaders del simulador (ver GastoQuerySet.para_reporte)
+    CAMPOS_REPORTE = CAMPOS_REPORTE_GASTO + ('criterio_prorrateo',)
+    MARCAS_DISPLAY_VACIO = "Compartido"
 
     class Meta:
         db_table = 'dxv_gasto_administrativo'
         verbose_name = "Gasto Administrativo"
         verbose_name_plural = "Gastos Administrativos"
         ordering = ['tipo', 'nombre']
-
-    # =========================================================================
-    # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
-    # =========================================================================
-
-    def get_distribucion_marcas(self):
-        """Retorna la distribución de este gasto entre marcas."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return {
-                asig.marca.marca_id: asig.porcentaje / Decimal('100')
-                for asig in asignaciones
-            }
-        if self.marca_id:
-            return {self.marca.marca_id: Decimal('1')}
-        return {}
-
-    @property
-    def es_compartido(self):
-        """True si el gasto está asignado a múltiples marcas."""
-        asignaciones = self.asignaciones_marca.all()
-        if asignaciones.exists():
-            return asignaciones.count() > 1
-        return self.asignacion == 'compartido'
-
-    @property
-    def marcas_display(self):
-        """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
-        if self.marca:
-            return self.marca.nombre
-        return "Compartido"
+        indexes = [
+            models.Index(fields=['escenario', 'marca'], name='gasto_adm_esc_marca_idx'),
+            models.Index(fields=['escenario', 'tipo'], name='gasto_adm_esc_tipo_idx'),
+            # Parcial: solo gastos compartidos (ver DataLoaderDB.cargar_compartidos_administrativo)
+            models.Index(fields=['escenario'], condition=Q(asignacion='compartido'),
+                         name='gasto_adm_compartido_idx'),
+        ]
+        constraints = [
+            # Una fila por rubro y marca (permite upserts con ON CONFLICT).
+            # Con marca NULL PostgreSQL no compara la fila (NULLS DISTINCT): los
+            # gastos multi-marca y los que generan las señales de RRHH y de
+            # lejanías comerciales (marca=None) quedan fuera a propósito: RRHH
+            # los recrea en cada cálculo y lejanías los ubica por zona.
+            models.UniqueConstraint(fields=['escenario', 'marca', 'tipo', 'nombre'],
+                                    name='gasto_adm_fila_uniq'),
+        ]
 
     def __str__(self):
         marcas = self.marcas_display
         return f"{marcas} - {self.get_tipo_display()} - ${self.valor_mensual:,.0f}"
 
 
-class GastoComercial(models.Model):
+class GastoComercial(GastoBase):
     """Gastos comerciales por marca"""
 
-    TIPO_CHOICES = [
-        ('comisiones', 'Comisiones de Ventas'),
-        ('merchandising', 'Materiales de Merchandising'),
-        ('capacitacion', 'Capacitación y Entrenamiento'),
-        ('eventos', 'Eventos Comerciales'),
-        ('herramientas_digitales', 'Herramientas Digitales (CRM, Apps)'),
-        ('transporte_vendedores', 'Transporte de Vendedores'),
-        ('viaticos', 'Viáticos'),
-        ('publicidad', 'Publicidad y Marketing'),
-        ('muestras', 'Muestras y Degustaciones'),
-        ('dotacion', 'Dotación'),
-        ('epp', 'EPP (Solo Comercial)'),
-        ('examenes', 'Exámenes Médicos'),
-        ('telefonia_celular', 'Telefonía Celular y Datos'),
-        ('otros', 'Otros Gastos Comerciales'),
-    ]
-
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual (asignado a una marca)'),
-        ('compartido', 'Compartido entre marcas'),
-    ]
+    TIPO_CHOICES = GASTO_COMERCIAL_TIPO_CHOICES
 
     escenario = models.ForeignKey(
         'Escenario',
@@ -1693,10 +2164,8 @@ class GastoComercial(models.Model):
         verbose_name="Marca",
         help_text="Dejar vacío si es compartido"
     )
-    nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción")
     tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Gasto")
-    valor_mensual = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Valor Mensual")
-    asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='individual', verbose_name="Asignación Marca")
+    asignacion = models.CharField(max_length=20, choices=ASIGNACION_MARCA_CHOICES, default='individual', verbose_name="Asignación Marca")
     
     # Índice de incremento para proyecciones
     indice_incremento = models.CharField(
@@ -1751,90 +2220,34 @@ class GastoComercial(models.Model):
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    notas = models.TextField(blank=True, verbose_name="Notas")
-
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
-
     class Meta:
         db_table = 'dxv_gasto_comercial'
         verbose_name = "Gasto Comercial"
         verbose_name_plural = "Gastos Comerciales"
         ordering = ['marca', 'tipo']
-
-    # =========================================================================
-    # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
-    # =========================================================================
-
-    def get_distribucion_marcas(self):
-        """Retorna la distribución de este gasto entre marcas."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return {
-                asig.marca.marca_id: asig.porcentaje / Decimal('100')
-                for asig in asignaciones
-            }
-        if self.marca_id:
-            return {self.marca.marca_id: Decimal('1')}
-        return {}
-
-    @property
-    def es_compartido(self):
-        """True si el gasto está asignado a múltiples marcas."""
-        asignaciones = self.asignaciones_marca.all()
-        if asignaciones.exists():
-            return asignaciones.count() > 1
-        return self.asignacion == 'compartido'
-
-    @property
-    def marcas_display(self):
-        """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
-        if self.marca:
-            return self.marca.nombre
-        return "-"
+        indexes = [
+            models.Index(fields=['escenario', 'marca'], name='gasto_com_esc_marca_idx'),
+            models.Index(fields=['escenario', 'tipo'], name='gasto_com_esc_tipo_idx'),
+        ]
+        constraints = [
+            # Una fila por rubro y marca (permite upserts con ON CONFLICT).
+            # Con marca NULL PostgreSQL no compara la fila (NULLS DISTINCT): los
+            # gastos multi-marca y los que generan las señales de RRHH y de
+            # lejanías comerciales (marca=None) quedan fuera a propósito: RRHH
+            # los recrea en cada cálculo y lejanías los ubica por zona.
+            models.UniqueConstraint(fields=['escenario', 'marca', 'tipo', 'nombre'],
+                                    name='gasto_com_fila_uniq'),
+        ]
 
     def __str__(self):
         marcas = self.marcas_display
         return f"{marcas} - {self.get_tipo_display()}: ${self.valor_mensual:,.0f}"
 
 
-class GastoLogistico(models.Model):
+class GastoLogistico(GastoBase):
     """Gastos logísticos por marca"""
 
-    TIPO_CHOICES = [
-        ('mantenimiento_vehiculos', 'Mantenimiento de Vehículos'),
-        ('seguros_carga', 'Seguros de Carga'),
-        ('peajes', 'Peajes y Parqueaderos'),
-        ('equipos_carga', 'Equipos de Carga (Estibas, Carretas)'),
-        ('combustible', 'Combustible'),
-        ('neumaticos', 'Neumáticos y Repuestos'),
-        # ('flete_tercero', 'Flete Transporte (Tercero)'),  # DEPRECADO: Usar tabla Vehículos con esquema='tercero'
-        ('canon_renting', 'Canon Renting'),
-        ('depreciacion_vehiculo', 'Depreciación Vehículos'),
-        ('lavado_vehiculos', 'Aseo y Limpieza Vehículos'),
-        ('parqueadero_vehiculos', 'Parqueaderos'),
-        ('monitoreo_satelital', 'Monitoreo Satelital (GPS)'),
-        ('bodegaje', 'Bodegaje Externo'),
-        ('equipos_bodega', 'Equipos de Bodega'),
-        ('embalaje', 'Material de Embalaje'),
-        ('arriendo_bodega', 'Arriendo Bodega y CEDI'),
-        ('servicios_publicos_bodega', 'Servicios Públicos Bodega'),
-        ('internet_bodega', 'Internet y Conectividad Bodega'),
-        ('seguro_bodega', 'Seguro Todo Riesgo Bodega'),
-        ('control_plagas', 'Control de Plagas y Fumigación'),
-        ('dotacion', 'Dotación y EPP'),
-        ('examenes', 'Exámenes Médicos'),
-        ('telefonia_celular', 'Telefonía Celular y Datos'),
-        ('otros', 'Otros Gastos Logísticos'),
-    ]
-
-    ASIGNACION_CHOICES = [
-        ('individual', 'Individual (asignado a una marca)'),
-        ('compartido', 'Compartido entre marcas'),
-    ]
+    TIPO_CHOICES = GASTO_LOGISTICO_TIPO_CHOICES
 
     escenario = models.ForeignKey(
         'Escenario',
@@ -1854,10 +2267,8 @@ class GastoLogistico(models.Model):
         verbose_name="Marca",
         help_text="Dejar vacío si es compartido"
     )
-    nombre = models.CharField(max_length=200, verbose_name="Nombre/Descripción")
     tipo = models.CharField(max_length=50, choices=TIPO_CHOICES, verbose_name="Tipo de Gasto")
-    valor_mensual = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Valor Mensual")
-    asignacion = models.CharField(max_length=20, choices=ASIGNACION_CHOICES, default='individual', verbose_name="Asignación Marca")
+    asignacion = models.CharField(max_length=20, choices=ASIGNACION_MARCA_CHOICES, default='individual', verbose_name="Asignación Marca")
     
     # Índice de incremento para proyecciones
     indice_incremento = models.CharField(
@@ -1912,50 +2323,24 @@ class GastoLogistico(models.Model):
         help_text="Solo aplica si tipo_asignacion_operacion es 'compartido'"
     )
 
-    notas = models.TextField(blank=True, verbose_name="Notas")
-
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
-
     class Meta:
         db_table = 'dxv_gasto_logistico'
         verbose_name = "Gasto Logístico"
         verbose_name_plural = "Gastos Logísticos"
         ordering = ['marca', 'tipo']
-
-    # =========================================================================
-    # MÉTODOS PARA ASIGNACIÓN MULTI-MARCA
-    # =========================================================================
-
-    def get_distribucion_marcas(self):
-        """Retorna la distribución de este gasto entre marcas."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return {
-                asig.marca.marca_id: asig.porcentaje / Decimal('100')
-                for asig in asignaciones
-            }
-        if self.marca_id:
-            return {self.marca.marca_id: Decimal('1')}
-        return {}
-
-    @property
-    def es_compartido(self):
-        """True si el gasto está asignado a múltiples marcas."""
-        asignaciones = self.asignaciones_marca.all()
-        if asignaciones.exists():
-            return asignaciones.count() > 1
-        return self.asignacion == 'compartido'
-
-    @property
-    def marcas_display(self):
-        """Retorna string con nombres de marcas para mostrar en admin."""
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
-            return ", ".join([f"{a.marca.nombre}" for a in asignaciones])
-        if self.marca:
-            return self.marca.nombre
-        return "-"
+        indexes = [
+            models.Index(fields=['escenario', 'marca'], name='gasto_log_esc_marca_idx'),
+            models.Index(fields=['escenario', 'tipo'], name='gasto_log_esc_tipo_idx'),
+        ]
+        constraints = [
+            # Una fila por rubro y marca (permite upserts con ON CONFLICT).
+            # Con marca NULL PostgreSQL no compara la fila (NULLS DISTINCT): los
+            # gastos multi-marca y los que generan las señales de RRHH y de
+            # lejanías comerciales (marca=None) quedan fuera a propósito: RRHH
+            # los recrea en cada cálculo y lejanías los ubica por zona.
+            models.UniqueConstraint(fields=['escenario', 'marca', 'tipo', 'nombre'],
+                                    name='gasto_log_fila_uniq'),
+        ]
 
     def __str__(self):
         marcas = self.marcas_display
@@ -1965,17 +2350,7 @@ class GastoLogistico(models.Model):
 class Impuesto(models.Model):
     """Impuestos y obligaciones tributarias"""
 
-    TIPO_CHOICES = [
-        ('iva', 'IVA'),
-        ('renta', 'Impuesto de Renta'),
-        ('ica', 'ICA (Industria y Comercio)'),
-        ('retefuente', 'Retención en la Fuente'),
-        ('reteica', 'Retención ICA'),
-        ('predial', 'Predial'),
-        ('vehiculos', 'Impuesto Vehículos'),
-        ('estampillas', 'Estampillas'),
-        ('otros', 'Otros Impuestos'),
-    ]
+    TIPO_CHOICES = IMPUESTO_TIPO_CHOICES
 
     PERIODICIDAD_CHOICES = [
         ('mensual', 'Mensual'),
@@ -2027,13 +2402,47 @@ class Impuesto(models.Model):
         verbose_name = "Impuesto"
         verbose_name_plural = "Impuestos"
         ordering = ['tipo', 'nombre']
+        indexes = [
+            # Listado de impuestos activos (API) en el orden por defecto
+            models.Index(fields=['tipo', 'nombre'], condition=Q(activo=True), name='impuesto_activo_tipo_idx'),
+        ]
 
     def __str__(self):
+        tipo = self.get_tipo_display()
         if self.porcentaje:
-            return f"{self.get_tipo_display()} - {self.porcentaje:.2f}%"
+            return f"{tipo} - {self.porcentaje:.2f}%"
         elif self.valor_fijo:
-            return f"{self.get_tipo_display()} - ${self.valor_fijo:,.0f}"
-        return self.get_tipo_display()
+            return f"{tipo} - ${self.valor_fijo:,.0f}"
+        return tipo
+
+
+class ConfiguracionDescuentosQuerySet(models.QuerySet):
+    """QuerySet de ConfiguracionDescuentos con la carga de tramos para cálculos"""
+
+    def con_tramos(self):
+        """
+        Trae la marca en el mismo JOIN y los tramos en una sola consulta adicional,
+        ordenados por `orden` y solo con las columnas que usan los cálculos.
+        Recorrer `config.tramos.all()` no vuelve a consultar (no usar order_by
+        sobre él: descarta el prefetch).
+        """
+        return self.select_related('marca').prefetch_related(Prefetch(
+            'tramos',
+            queryset=TramoDescuentoFactura.objects.only(
+                'id', 'configuracion', 'orden', 'porcentaje_ventas', 'porcentaje_descuento'
+            ).order_by('orden'),
+        ))
+
+    def anotar_total_tramos(self):
+        """
+        Anota `total_tramos_sql` (suma de porcentaje_ventas de los tramos, 0 si
+        no hay) en la misma consulta con GROUP BY, para listados que solo
+        necesitan el total y no los tramos.
+        """
+        return self.annotate(total_tramos_sql=Coalesce(
+            Sum('tramos__porcentaje_ventas'), Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=7, decimal_places=2),
+        ))
 
 
 class ConfiguracionDescuentos(models.Model):
@@ -2081,6 +2490,8 @@ class ConfiguracionDescuentos(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
+    objects = ConfiguracionDescuentosQuerySet.as_manager()
+
     class Meta:
         db_table = 'dxv_configuracion_descuentos'
         verbose_name = "Configuración de Descuentos"
@@ -2092,22 +2503,37 @@ class ConfiguracionDescuentos(models.Model):
 
     def clean(self):
         """Validación: si no aplica descuento financiero, el porcentaje debe ser 0"""
-        from django.core.exceptions import ValidationError
         if not self.aplica_descuento_financiero and self.porcentaje_descuento_financiero > 0:
             raise ValidationError(
                 "El porcentaje de descuento financiero debe ser 0 si no aplica descuento financiero"
             )
 
     def total_tramos_porcentaje(self):
-        """Calcula la suma de porcentajes de todos los tramos"""
+        """
+        Calcula la suma de porcentajes de todos los tramos.
+        Sin consultar si viene de anotar_total_tramos() o de prefetch_related('tramos').
+        """
+        if hasattr(self, 'total_tramos_sql'):
+            return self.total_tramos_sql
+        if 'tramos' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum((t.porcentaje_ventas for t in self.tramos.all()), Decimal('0'))
         return self.tramos.aggregate(
             total=models.Sum('porcentaje_ventas')
         )['total'] or 0
 
     def validar_tramos(self):
-        """Valida que los tramos sumen 100%"""
-        total = self.total_tramos_porcentaje()
-        return abs(total - 100) < 0.01  # Tolerancia por decimales
+        """
+        Valida que los tramos sumen 100%.
+        Sin total anotado ni prefetch la comparación se hace en la BD (HAVING + EXISTS).
+        """
+        if hasattr(self, 'total_tramos_sql') or 'tramos' in getattr(self, '_prefetched_objects_cache', {}):
+            total = self.total_tramos_porcentaje()
+            return abs(total - 100) <= Decimal('0.01')  # Tolerancia por decimales
+        return ConfiguracionDescuentos.objects.filter(pk=self.pk).annotate(
+            total=models.Sum('tramos__porcentaje_ventas')
+        ).filter(
+            total__gte=Decimal('99.99'), total__lte=Decimal('100.01')
+        ).exists()
 
     total_tramos_porcentaje.short_description = "Total % Tramos"
 
@@ -2140,27 +2566,33 @@ class TramoDescuentoFactura(models.Model):
         help_text="Porcentaje de descuento aplicado (ej: 19%)"
     )
 
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
 
     class Meta:
         db_table = 'dxv_tramo_descuento_factura'
         verbose_name = "Tramo de Descuento"
         verbose_name_plural = "Tramos de Descuento"
         ordering = ['configuracion', 'orden']
-        unique_together = ['configuracion', 'orden']
+        constraints = [
+            # Cubre la lectura de ConfiguracionDescuentosQuerySet.con_tramos():
+            # con INCLUDE se resuelve con un Index Only Scan, sin ir al heap
+            models.UniqueConstraint(
+                fields=['configuracion', 'orden'],
+                include=['id', 'porcentaje_ventas', 'porcentaje_descuento'],
+                name='tramo_config_orden_uniq',
+            ),
+        ]
 
     def __str__(self):
         return f"Tramo {self.orden}: {self.porcentaje_ventas}% ventas → {self.porcentaje_descuento}% desc."
 
     def clean(self):
         """Validaciones del tramo"""
-        from django.core.exceptions import ValidationError
-
-        if self.porcentaje_ventas <= 0:
+        if self.porcentaje_ventas is None or self.porcentaje_ventas <= 0:
             raise ValidationError("El porcentaje de ventas debe ser mayor a 0")
 
-        if self.porcentaje_descuento < 0:
+        if self.porcentaje_descuento is not None and self.porcentaje_descuento < 0:
             raise ValidationError("El porcentaje de descuento no puede ser negativo")
 
 class PoliticaRecursosHumanos(models.Model):
@@ -2271,16 +2703,14 @@ class Municipio(models.Model):
     )
     nombre = models.CharField(max_length=100, verbose_name="Nombre")
     departamento = models.CharField(max_length=50, verbose_name="Departamento")
-    latitud = models.DecimalField(
-        max_digits=10,
-        decimal_places=7,
+    # Float (no Decimal): solo se usan en cálculos geográficos, donde float64
+    # sobra en precisión y evita construir un Decimal por fila al leer.
+    latitud = models.FloatField(
         null=True,
         blank=True,
         verbose_name="Latitud"
     )
-    longitud = models.DecimalField(
-        max_digits=10,
-        decimal_places=7,
+    longitud = models.FloatField(
         null=True,
         blank=True,
         verbose_name="Longitud"
@@ -2295,11 +2725,20 @@ class Municipio(models.Model):
         verbose_name = "Municipio"
         verbose_name_plural = "Municipios"
         ordering = ['departamento', 'nombre']
+        indexes = [
+            # Sigue el ordering (lectura en orden de índice) y sirve el filtro por
+            # departamento y el get_or_create(nombre, departamento) de las cargas
+            models.Index(fields=['departamento', 'nombre'], name='municipio_depto_nombre_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre}, {self.departamento}"
 
 
+# Valores de un tramo de la matriz tal como los leen los cálculos de lejanía
+TramoMatriz = namedtuple('TramoMatriz', ['distancia_km', 'tiempo_minutos', 'peaje_ida'])
+
+
 class MatrizDesplazamiento(models.Model):
     """Matriz de distancias y tiempos entre municipios"""
     origen = models.ForeignKey(
@@ -2331,19 +2770,105 @@ class MatrizDesplazamiento(models.Model):
     )
 
     notas = models.TextField(blank=True, verbose_name="Notas")
-    fecha_creacion = models.DateTimeField(auto_now_add=True)
-    fecha_modificacion = models.DateTimeField(auto_now=True)
+    fecha_creacion = models.DateTimeField(db_default=Now(), editable=False)
+    fecha_modificacion = models.DateTimeField(auto_now=True, db_default=Now())
+
+    objects = MatrizDesplazamientoManager()
 
     class Meta:
         db_table = 'dxv_matriz_desplazamiento'
         verbose_name = "Matriz de Desplazamiento"
         verbose_name_plural = "Matrices de Desplazamiento"
-        unique_together = ('origen', 'destino')
-        ordering = ['origen__nombre', 'destino__nombre']
+        constraints = [
+            # Índice único cubriente: las consultas por (origen, destino) que solo
+            # leen distancia/tiempo/peaje se resuelven con index-only scan
+            models.UniqueConstraint(
+                fields=['origen', 'destino'],
+                include=['distancia_km', 'tiempo_minutos', 'peaje_ida'],
+                name='matriz_origen_destino_uniq',
+            ),
+        ]
 
     def __str__(self):
+        return self.display
+
+    @cached_property
+    def display(self):
+        """Texto de la ruta; se arma una vez por instancia (cruza dos FKs)."""
         return f"{self.origen} → {self.destino}: {self.distancia_km} km"
 
+    CACHE_KEY = 'dxv:matriz_desplazamiento'
+
+    @classmethod
+    def obtener_tramo(cls, origen_id, destino_id):
+        """
+        Retorna el TramoMatriz (distancia_km, tiempo_minutos, peaje_ida) del
+        par usando el cache de Django.
+
+        Equivale a `objects.get(origen_id=..., destino_id=...)` (lanza
+        DoesNotExist si no hay tramo) pero sin una consulta por par: la matriz
+        se lee muchas más veces de las que se escribe. La invalidación se hace
+        en signals.py y en bulk_load_matrix, y llega al cache de Django al
+        confirmar la transacción (ver invalidar_tabla_referencia).
+        """
+        tramos = _obtener_tabla_referencia(
+            cls.CACHE_KEY,
+            lambda: {
+                (origen, destino): TramoMatriz(distancia_km, tiempo_minutos, peaje_ida)
+                for origen, destino, distancia_km, tiempo_minutos, peaje_ida
+                in cls._base_manager.values_list(
+                    'origen_id', 'destino_id', 'distancia_km', 'tiempo_minutos', 'peaje_ida'
+                )
+            }
+        )
+        try:
+            return tramos[(origen_id, destino_id)]
+        except KeyError:
+            raise cls.DoesNotExist(f"No existe tramo {origen_id} → {destino_id} en la matriz")
+
+    @classmethod
+    def bulk_load_matrix(cls, filas, batch_size=5000):
+        """
+        Carga masiva (upsert) de tramos de la matriz.
+
+        `filas` es un iterable de (origen_id, destino_id, distancia_km,
+        tiempo_minutos). Inserta por lotes con INSERT ... ON CONFLICT sobre
+        (origen, destino), actualizando distancia y tiempo de los existentes.
+        No dispara signals: quien llama debe recalcular lejanías una sola vez
+        al final (ver signals.recalcular_lejanias_escenarios_activos). Por eso
+        descarta aquí la matriz cacheada; el borrado se aplica al confirmar
+        la transacción, así otros workers no recachean la matriz anterior.
+
+        Retorna (creadas, actualizadas).
+        """
+        tramos = {
+            (origen_id, destino_id): cls(
+                origen_id=origen_id,
+                destino_id=destino_id,
+                distancia_km=distancia_km,
+                tiempo_minutos=tiempo_minutos,
+            )
+            for origen_id, destino_id, distancia_km, tiempo_minutos in filas
+        }
+        if not tramos:
+            return 0, 0
+
+        origenes = {origen_id for origen_id, _ in tramos}
+        existentes = set(
+            cls._base_manager.filter(origen_id__in=origenes)
+            .values_list('origen_id', 'destino_id')
+        ) & tramos.keys()
+
+        cls._base_manager.bulk_create(
+            tramos.values(),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['origen', 'destino'],
+            update_fields=['distancia_km', 'tiempo_minutos', 'fecha_modificacion'],
+        )
+        invalidar_tabla_referencia(cls.CACHE_KEY)
+        return len(tramos) - len(existentes), len(existentes)
+
 
 class ConfiguracionLejania(models.Model):
     """Configuración de cálculo de lejanías por escenario"""
@@ -2550,14 +3075,59 @@ class ConfiguracionLejania(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
+    objects = ConfiguracionLejaniaManager()
+
     class Meta:
         db_table = 'dxv_configuracion_lejania'
         verbose_name = "Configuración de Lejanías"
         verbose_name_plural = "Configuraciones de Lejanías"
+        constraints = [
+            # Umbrales, rendimientos y precios no pueden ser negativos. Un
+            # consumo en 0 se tolera: los cálculos lo tratan como "sin combustible".
+            models.CheckConstraint(
+                check=Q(umbral_lejania_logistica_km__gte=0) & Q(umbral_lejania_comercial_km__gte=0),
+                name='config_lejania_umbrales_no_negativos',
+            ),
+            models.CheckConstraint(
+                check=Q(consumo_galon_km_moto__gte=0) & Q(consumo_galon_km_automovil__gte=0),
+                name='config_lejania_consumos_no_negativos',
+            ),
+            models.CheckConstraint(
+                check=Q(precio_galon_gasolina__gte=0) & Q(precio_galon_acpm__gte=0),
+                name='config_lejania_precios_no_negativos',
+            ),
+        ]
 
     def __str__(self):
         return f"Config Lejanías - {self.escenario}"
 
+    CACHE_KEY = 'dxv:configuracion_lejania'
+
+    @classmethod
+    def obtener_para(cls, escenario):
+        """
+        Retorna la configuración del escenario usando el cache de Django.
+
+        Equivale a `objects.get(escenario=escenario)` (lanza DoesNotExist si
+        no hay configuración); se lee en cada recálculo de lejanías. Trae
+        municipio_bodega y municipio_comite cargados; el escenario no se
+        cachea. La invalidación se hace en signals.py (al guardar la
+        configuración o un Municipio) y llega al cache de Django al confirmar
+        la transacción; mientras tanto el recálculo de lejanías de esa misma
+        transacción lee la configuración nueva desde la base.
+        """
+        configuraciones = _obtener_tabla_referencia(
+            cls.CACHE_KEY,
+            lambda: {
+                c.escenario_id: c
+                for c in cls._base_manager.select_related('municipio_bodega', 'municipio_comite')
+            }
+        )
+        try:
+            return configuraciones[escenario.pk]
+        except KeyError:
+            raise cls.DoesNotExist(f"No hay ConfiguracionLejania para el escenario {escenario.pk}")
+
 
 class Zona(models.Model):
     """Zonas comerciales (grupos de municipios atendidos por vendedores)"""
@@ -2669,6 +3239,8 @@ class Zona(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
+    objects = ZonaManager()
+
     class Meta:
         db_table = 'dxv_zona'
         verbose_name = "Zona Comercial"
@@ -2787,12 +3359,7 @@ class Zona(models.Model):
         - QUINCENAL: 24 quincenas / 12 meses = 2.00
         - MENSUAL: 12 meses / 12 meses = 1.00
         """
-        if self.frecuencia == 'SEMANAL':
-            return Decimal('4.33')  # 52 semanas / 12 meses
-        elif self.frecuencia == 'QUINCENAL':
-            return Decimal('2.00')
-        else:  # MENSUAL
-            return Decimal('1.00')
+        return PERIODOS_POR_MES.get(self.frecuencia, PERIODOS_POR_MES['MENSUAL'])
 
     # ===========================================
     # MÉTODOS PARA SISTEMA MULTI-MARCA
@@ -2841,8 +3408,8 @@ class Zona(models.Model):
         if self.vendedor:
             return self.vendedor.marcas_display
         # Fallback temporal: usar asignaciones_marca de zona (legacy)
-        asignaciones = self.asignaciones_marca.select_related('marca').all()
-        if asignaciones.exists():
+        asignaciones = _asignaciones_con_marca(self)
+        if asignaciones:
             return ", ".join([f"{a.marca.nombre} ({a.porcentaje}%)" for a in asignaciones])
         # Fallback: usar campo antiguo
         if self.marca:
@@ -2895,14 +3462,20 @@ class ZonaMunicipio(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
 
+    objects = ZonaMunicipioManager()
+
     class Meta:
         db_table = 'dxv_zona_municipio'
         verbose_name = "Municipio de Zona Comercial"
         verbose_name_plural = "Municipios de Zonas Comerciales"
         unique_together = ('zona', 'municipio')
-        ordering = ['zona', 'municipio__nombre']
 
     def __str__(self):
+        return self.display
+
+    @cached_property
+    def display(self):
+        """Texto zona → municipio; se arma una vez por instancia (cruza dos FKs)."""
         return f"{self.zona.nombre} → {self.municipio}"
 
     def visitas_mensuales(self):
@@ -2995,10 +3568,7 @@ class RutaLogistica(models.Model):
     # Asignación por marca
     asignacion = models.CharField(
         max_length=20,
-        choices=[
-            ('individual', 'Individual'),
-            ('compartido', 'Compartido'),
-        ],
+        choices=ASIGNACION_CHOICES,
         default='individual',
         verbose_name="Asignación Marca",
         help_text="Individual = 100% a esta marca. Compartido = se distribuye entre marcas."
@@ -3014,12 +3584,8 @@ class RutaLogistica(models.Model):
     )
     criterio_prorrateo = models.CharField(
         max_length=20,
-        choices=[
-            ('volumen', 'Por Volumen'),
-            ('ventas', 'Por Ventas'),
-            ('uso_real', 'Por Uso Real'),
-        ],
-        default='volumen',
+        choices=CRITERIO_PRORRATEO_TRANSPORTE_CHOICES,
+        default=CriterioProrrateo.VOLUMEN,
         null=True,
         blank=True,
         verbose_name="Criterio Prorrateo",
@@ -3099,12 +3665,7 @@ class RutaLogistica(models.Model):
 
     def periodos_por_mes(self):
         """Retorna cuántos periodos hay por mes según frecuencia."""
-        if self.frecuencia == 'SEMANAL':
-            return Decimal('4.33')
-        elif self.frecuencia == 'QUINCENAL':
-            return Decimal('2.00')
-        else:  # MENSUAL
-            return Decimal('1.00')
+        return PERIODOS_POR_MES.get(self.frecuencia, PERIODOS_POR_MES['MENSUAL'])
 
     def recorridos_mensuales(self):
         """Retorna cuántas veces se hace el recorrido completo por mes."""
@@ -3507,6 +4068,10 @@ class TipologiaProyeccion(models.Model):
 # =============================================================================
 # Estos modelos permiten asignar un recurso (personal o gasto) a múltiples
 # marcas con porcentajes específicos. Los porcentajes deben sumar 100%.
+#
+# Su FK a Marca es ON DELETE CASCADE en PostgreSQL (migración 0096): al borrar
+# una marca la base elimina sus asignaciones en el mismo DELETE, sin que el
+# collector de Django las cargue. Por eso Django la declara DO_NOTHING.
 
 
 class PersonalComercialMarca(models.Model):
@@ -3518,7 +4083,7 @@ class PersonalComercialMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='personal_comercial_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3547,7 +4112,7 @@ class PersonalLogisticoMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='personal_logistico_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3576,7 +4141,7 @@ class PersonalAdministrativoMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='personal_administrativo_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3605,7 +4170,7 @@ class GastoComercialMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='gasto_comercial_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3634,7 +4199,7 @@ class GastoLogisticoMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='gasto_logistico_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3663,7 +4228,7 @@ class GastoAdministrativoMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='gasto_administrativo_asignaciones'
     )
     porcentaje = models.DecimalField(
@@ -3692,7 +4257,7 @@ class ZonaMarca(models.Model):
     )
     marca = models.ForeignKey(
         'Marca',
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
         related_name='zona_asignaciones'
     )
     porcentaje = models.DecimalField(
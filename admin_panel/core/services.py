@@ -6,7 +6,8 @@ Incluye:
 """
 from decimal import Decimal
 from typing import Dict, List
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Case, F, Prefetch, Value, When
 
 from .models import (
     Escenario, ParametrosMacro, PersonalComercial, PersonalLogistico,
@@ -16,9 +17,60 @@ from .models import (
     Marca, FactorPrestacional,
     # Modelos intermedios para asignación multi-marca
     PersonalComercialMarca, PersonalLogisticoMarca, PersonalAdministrativoMarca,
-    GastoComercialMarca, GastoLogisticoMarca, GastoAdministrativoMarca
+    GastoComercialMarca, GastoLogisticoMarca, GastoAdministrativoMarca,
+    INDICE_INCREMENTO_CHOICES
+)
+from .signals import (
+    calculate_hr_expenses, calculate_logistic_expenses,
+    calculate_lejanias_comerciales, calculate_lejanias_logisticas
+)
+from .utils import (
+    construir_copia, copiar_instancia, get_campos_monetarios, iterar_en_lotes, para_copia
 )
-from .utils import copiar_instancia, get_campos_monetarios
+
+# Tamaño de lote para los bulk_create de la copia de escenarios
+BATCH_SIZE = 1000
+
+# Índice de incremento -> campo de ParametrosMacro con su valor (0-100)
+_INCREMENTO_ATTRS = {
+    'salarios': 'incremento_salarios',
+    'salario_minimo': 'incremento_salario_minimo',
+    'ipc': 'ipc',
+    'ipt': 'ipt',
+    'combustible': 'incremento_combustible',
+    'arriendos': 'incremento_arriendos',
+    'personalizado_1': 'incremento_personalizado_1',
+    'personalizado_2': 'incremento_personalizado_2',
+}
+
+
+def _copiar_asignaciones_sql(modelo_marca, campo_padre, mapeo):
+    """
+    Copia dentro de la BD (INSERT ... SELECT) las asignaciones de marca de los
+    padres viejos a los nuevos, sin pasar las filas por Python.
+
+    `mapeo` es una lista de pares (id padre viejo, id padre nuevo). Las tablas
+    de asignación no tienen marcas de tiempo ni campos generados: se copian
+    todas sus columnas salvo el id.
+    """
+    if not mapeo:
+        return
+    qn = connection.ops.quote_name
+    tabla = qn(modelo_marca._meta.db_table)
+    columna_padre = qn(modelo_marca._meta.get_field(campo_padre).column)
+    columnas = [
+        qn(field.column) for field in modelo_marca._meta.concrete_fields
+        if not field.primary_key and qn(field.column) != columna_padre
+    ]
+    viejos, nuevos = zip(*mapeo)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {tabla} ({columna_padre}, {', '.join(columnas)}) "
+            f"SELECT m.nuevo, {', '.join(f'a.{c}' for c in columnas)} "
+            f"FROM unnest(%s::bigint[], %s::bigint[]) AS m(viejo, nuevo) "
+            f"JOIN {tabla} a ON a.{columna_padre} = m.viejo",
+            [list(viejos), list(nuevos)]
+        )
 
 
 class EscenarioService:
@@ -36,24 +88,27 @@ class EscenarioService:
         if not macros:
             return 0
 
-        if indice_nombre == 'fijo':
+        # 'fijo' y los índices desconocidos no tienen campo: sin incremento
+        campo = _INCREMENTO_ATTRS.get(indice_nombre)
+        if campo is None:
             return 0
 
-        mapping = {
-            'salarios': macros.incremento_salarios,
-            'salario_minimo': macros.incremento_salario_minimo,
-            'ipc': macros.ipc,
-            'ipt': macros.ipt,
-            'combustible': macros.incremento_combustible,
-            'arriendos': macros.incremento_arriendos,
-            'personalizado_1': macros.incremento_personalizado_1,
-            'personalizado_2': macros.incremento_personalizado_2,
-        }
-
-        valor = mapping.get(indice_nombre, 0)
+        valor = getattr(macros, campo, 0)
         # Convertir de porcentaje (0-100) a decimal (0-1)
         return float(valor) / 100.0 if valor else 0
 
+    @classmethod
+    def get_incrementos(cls, macros) -> Dict[str, float]:
+        """
+        Snapshot de todos los índices de incremento de `macros` en formato
+        decimal ({'salarios': 0.095, ...}), para consultarlo en los bucles de
+        copia sin volver a convertir los Decimal del modelo.
+        """
+        return {
+            indice: cls.get_incremento_valor(indice, macros)
+            for indice, _ in INDICE_INCREMENTO_CHOICES
+        }
+
     @classmethod
     def duplicar_escenario(cls, escenario_id, nuevo_nombre=None):
         """
@@ -93,9 +148,9 @@ class EscenarioService:
         if not nuevo_nombre:
             nuevo_nombre = f"{source.nombre} (Proyección {nuevo_anio})"
 
-        # Obtener macros del año destino
+        # Obtener macros del año destino (tabla de referencia cacheada)
         try:
-            macros = ParametrosMacro.objects.get(anio=nuevo_anio)
+            macros = ParametrosMacro.obtener_por_anio(nuevo_anio)
         except ParametrosMacro.DoesNotExist:
             macros = None
 
@@ -126,226 +181,207 @@ class EscenarioService:
         Si factor_incremento=0, copia valores exactos.
         """
 
+        # Incrementos del año destino ya como float, leídos una sola vez de
+        # ParametrosMacro en lugar de por fila
+        incrementos = cls.get_incrementos(macros)
+
         def get_factor(indice_nombre):
             if factor_incremento is not None:
                 return factor_incremento
-            return cls.get_incremento_valor(indice_nombre, macros)
-
-        # =====================
-        # PERSONAL COMERCIAL (con asignaciones de marca)
-        # =====================
-        for item in PersonalComercial.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'salarios'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                PersonalComercialMarca.objects.create(
-                    personal=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
+            return incrementos.get(indice_nombre, 0)
+
+        def multiplicador(indice_nombre):
+            return Value(Decimal(str(1 + get_factor(indice_nombre))))
+
+        def incrementar(qs, campos, indice_nombre=None):
+            """
+            Aplica el incremento a los `campos` de `qs` con un solo UPDATE, en
+            aritmética NUMERIC de PostgreSQL. Con `indice_nombre` usa ese índice
+            para todas las filas; sin él, el de la columna indice_incremento.
+            """
+            if indice_nombre is not None:
+                if not get_factor(indice_nombre):
+                    return
+                factor = multiplicador(indice_nombre)
+            else:
+                casos = [
+                    When(indice_incremento=indice, then=multiplicador(indice))
+                    for indice, _ in INDICE_INCREMENTO_CHOICES
+                    if get_factor(indice)
+                ]
+                if not casos:
+                    return
+                factor = Case(*casos, default=Value(Decimal('1')))
+            qs.update(**{campo: F(campo) * factor for campo in campos})
+
+        def copiar_con_asignaciones(modelo, modelo_marca, campo_padre):
+            """
+            Copia los registros de `modelo` del escenario origen con un
+            bulk_create por lote y sus asignaciones de marca con un INSERT ...
+            SELECT. Los ids de los padres vuelven del INSERT ... RETURNING de
+            PostgreSQL. El incremento
+            se aplica después, con un UPDATE sobre el escenario destino.
+            """
+            qs = para_copia(modelo.objects.filter(escenario=source))
+            for items in iterar_en_lotes(qs, BATCH_SIZE):
+                nuevos = modelo.objects.bulk_create([
+                    construir_copia(item, override={'escenario': target}, sufijo_nombre="")
+                    for item in items
+                ])
+                # Copiar asignaciones de marca
+                _copiar_asignaciones_sql(
+                    modelo_marca, campo_padre,
+                    [(item.pk, nuevo.pk) for item, nuevo in zip(items, nuevos)]
                 )
+            incrementar(modelo.objects.filter(escenario=target), get_campos_monetarios(modelo))
 
         # =====================
-        # PERSONAL LOGÍSTICO (con asignaciones de marca)
+        # PERSONAL (con asignaciones de marca)
         # =====================
-        for item in PersonalLogistico.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'salarios'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                PersonalLogisticoMarca.objects.create(
-                    personal=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
-
-        # =====================
-        # PERSONAL ADMINISTRATIVO (con asignaciones de marca)
-        # =====================
-        for item in PersonalAdministrativo.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'salarios'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                PersonalAdministrativoMarca.objects.create(
-                    personal=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
+        copiar_con_asignaciones(PersonalComercial, PersonalComercialMarca, 'personal')
+        copiar_con_asignaciones(PersonalLogistico, PersonalLogisticoMarca, 'personal')
+        copiar_con_asignaciones(PersonalAdministrativo, PersonalAdministrativoMarca, 'personal')
+        # Lo que haría PersonalAdministrativo.save(), que bulk_create no llama
+        PersonalAdministrativo.objects.filter(escenario=target).actualizar_costo_mensual_cached()
 
         # =====================
         # VEHÍCULOS
         # =====================
-        vehiculos_map = {}  # Mapeo de vehículo viejo -> nuevo (para rutas)
-        for item in Vehiculo.objects.filter(escenario=source):
-            nuevo_vehiculo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                sufijo_nombre=""
-            )
-            vehiculos_map[item.pk] = nuevo_vehiculo
-
-        # =====================
-        # GASTOS COMERCIALES (con asignaciones de marca)
-        # =====================
-        for item in GastoComercial.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'ipc'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
+        vehiculos_map = {}  # Mapeo de id de vehículo viejo -> nuevo (para rutas)
+        for vehiculos in iterar_en_lotes(para_copia(Vehiculo.objects.filter(escenario=source)), BATCH_SIZE):
+            nuevos_vehiculos = Vehiculo.objects.bulk_create([
+                construir_copia(item, override={'escenario': target}, sufijo_nombre="")
+                for item in vehiculos
+            ])
+            vehiculos_map.update(
+                (item.pk, nuevo.pk) for item, nuevo in zip(vehiculos, nuevos_vehiculos)
             )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                GastoComercialMarca.objects.create(
-                    gasto=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
 
         # =====================
-        # GASTOS LOGÍSTICOS (con asignaciones de marca)
+        # GASTOS (con asignaciones de marca)
         # =====================
-        for item in GastoLogistico.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'ipc'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                GastoLogisticoMarca.objects.create(
-                    gasto=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
+        copiar_con_asignaciones(GastoComercial, GastoComercialMarca, 'gasto')
+        copiar_con_asignaciones(GastoLogistico, GastoLogisticoMarca, 'gasto')
+        copiar_con_asignaciones(GastoAdministrativo, GastoAdministrativoMarca, 'gasto')
 
-        # =====================
-        # GASTOS ADMINISTRATIVOS (con asignaciones de marca)
-        # =====================
-        for item in GastoAdministrativo.objects.filter(escenario=source):
-            incremento = get_factor(getattr(item, 'indice_incremento', 'ipc'))
-            nuevo = copiar_instancia(
-                item,
-                override={'escenario': target},
-                campos_monetarios=get_campos_monetarios(item),
-                factor_incremento=incremento,
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca
-            for asig in item.asignaciones_marca.all():
-                GastoAdministrativoMarca.objects.create(
-                    gasto=nuevo,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
+        # bulk_create no dispara los signals de personal y vehículos: recalcular
+        # una vez los gastos derivados (dotación, EPP, flota) del escenario nuevo
+        calculate_hr_expenses(target)
+        calculate_logistic_expenses(target)
 
         # =====================
         # ZONAS COMERCIALES
         # =====================
-        for zona in Zona.objects.filter(escenario=source):
-            nueva_zona = copiar_instancia(
-                zona,
-                override={'escenario': target},
-                sufijo_nombre=""
-            )
-            # Copiar asignaciones de marca (multi-marca)
-            for asig in ZonaMarca.objects.filter(zona=zona):
-                ZonaMarca.objects.create(
-                    zona=nueva_zona,
-                    marca=asig.marca,
-                    porcentaje=asig.porcentaje
-                )
-            # Copiar municipios de la zona
-            for zm in ZonaMunicipio.objects.filter(zona=zona):
-                copiar_instancia(
-                    zm,
-                    override={'zona': nueva_zona},
-                    sufijo_nombre=""
-                )
+        zonas_map = []  # (zona vieja, zona nueva) para las asignaciones de marca
+        zonas = para_copia(Zona.objects.filter(escenario=source)).prefetch_related(
+            Prefetch('municipios', queryset=para_copia(ZonaMunicipio.objects.all()))
+        )
+        for lote in iterar_en_lotes(zonas, BATCH_SIZE):
+            nuevas_zonas = []
+            for zona in lote:
+                # vendedor_id se copia tal cual: la zona nueva sigue apuntando al
+                # PersonalComercial del escenario origen (también al proyectar a
+                # otro año), y con él a su operación (Zona.operacion se hereda
+                # del vendedor). Hay que reasignarlo a mano en el escenario nuevo.
+                nueva_zona = construir_copia(zona, override={'escenario': target}, sufijo_nombre="")
+                # Lo que haría Zona.save(), que bulk_create no llama
+                nueva_zona.venta_proyectada = nueva_zona.calcular_venta_proyectada()
+                nuevas_zonas.append(nueva_zona)
+            Zona.objects.bulk_create(nuevas_zonas)
+
+            # Copiar municipios de cada zona
+            zonas_municipio = []
+            for zona, nueva_zona in zip(lote, nuevas_zonas):
+                zonas_map.append((zona.pk, nueva_zona.pk))
+                for zm in zona.municipios.all():
+                    nuevo_zm = construir_copia(
+                        zm,
+                        override={'zona': nueva_zona},
+                        sufijo_nombre=""
+                    )
+                    # Lo que haría ZonaMunicipio.save(), que bulk_create no llama
+                    nuevo_zm.venta_proyectada = nuevo_zm.calcular_venta_proyectada()
+                    zonas_municipio.append(nuevo_zm)
+            ZonaMunicipio.objects.bulk_create(zonas_municipio, batch_size=BATCH_SIZE)
+        # Copiar asignaciones de marca (multi-marca)
+        _copiar_asignaciones_sql(ZonaMarca, 'zona', zonas_map)
+        # bulk_create no dispara el signal de ZonaMunicipio: recalcular una vez
+        calculate_lejanias_comerciales(target)
 
         # =====================
         # RUTAS LOGÍSTICAS
         # =====================
-        incremento_flete = get_factor('ipc')
-        for ruta in RutaLogistica.objects.filter(escenario=source):
-            nuevo_vehiculo = vehiculos_map.get(ruta.vehiculo_id) if ruta.vehiculo_id else None
-            nueva_ruta = copiar_instancia(
-                ruta,
-                override={
-                    'escenario': target,
-                    'vehiculo': nuevo_vehiculo
-                },
-                sufijo_nombre=""
-            )
-            # Copiar municipios de la ruta
-            for rm in RutaMunicipio.objects.filter(ruta=ruta):
-                copiar_instancia(
-                    rm,
-                    override={'ruta': nueva_ruta},
-                    campos_monetarios=get_campos_monetarios(rm),
-                    factor_incremento=incremento_flete,
+        rutas = para_copia(RutaLogistica.objects.filter(escenario=source)).prefetch_related(
+            Prefetch('municipios', queryset=para_copia(RutaMunicipio.objects.all()))
+        )
+        for lote in iterar_en_lotes(rutas, BATCH_SIZE):
+            # Solo ids: la ruta de origen nunca carga su vehículo
+            nuevas_rutas = RutaLogistica.objects.bulk_create([
+                construir_copia(
+                    ruta,
+                    override={
+                        'escenario': target,
+                        'vehiculo_id': vehiculos_map.get(ruta.vehiculo_id)
+                    },
                     sufijo_nombre=""
                 )
+                for ruta in lote
+            ])
+            # Copiar municipios de cada ruta
+            RutaMunicipio.objects.bulk_create([
+                construir_copia(rm, override={'ruta': nueva_ruta}, sufijo_nombre="")
+                for ruta, nueva_ruta in zip(lote, nuevas_rutas)
+                for rm in ruta.municipios.all()
+            ], batch_size=BATCH_SIZE)
+        incrementar(
+            RutaMunicipio.objects.filter(ruta__escenario=target),
+            get_campos_monetarios(RutaMunicipio),
+            indice_nombre='ipc'
+        )
+        # bulk_create no dispara el signal de RutaMunicipio: recalcular una vez
+        calculate_lejanias_logisticas(target)
 
         # =====================
         # PROYECCIÓN DE VENTAS
         # =====================
         anio_destino = nuevo_anio or source.anio
-        incremento_ventas = get_factor('ipc')
 
-        for config in ProyeccionVentasConfig.objects.filter(escenario=source):
-            nueva_config = copiar_instancia(
-                config,
-                override={
-                    'escenario': target,
-                    'anio': anio_destino
-                },
-                sufijo_nombre=""
-            )
-
-            # Copiar tipologías de cliente
-            for tipologia in TipologiaProyeccion.objects.filter(config=config):
-                copiar_instancia(
-                    tipologia,
-                    override={'config': nueva_config},
+        configs = (
+            para_copia(ProyeccionVentasConfig.objects.filter(escenario=source))
+            .select_related('proyeccion_manual')
+            .prefetch_related(Prefetch('tipologias', queryset=para_copia(TipologiaProyeccion.objects.all())))
+        )
+        for lote in iterar_en_lotes(configs, BATCH_SIZE):
+            nuevas_configs = ProyeccionVentasConfig.objects.bulk_create([
+                construir_copia(
+                    config,
+                    override={
+                        'escenario': target,
+                        'anio': anio_destino
+                    },
                     sufijo_nombre=""
                 )
+                for config in lote
+            ])
 
-            # Copiar proyección manual (ajuste estacional)
-            try:
-                manual = ProyeccionManual.objects.get(config=config)
-                copiar_instancia(
-                    manual,
-                    override={'config': nueva_config},
-                    campos_monetarios=get_campos_monetarios(manual),
-                    factor_incremento=incremento_ventas,
-                    sufijo_nombre=""
-                )
-            except ProyeccionManual.DoesNotExist:
-                pass
-
-
+            # Copiar tipologías de cliente
+            TipologiaProyeccion.objects.bulk_create([
+                construir_copia(tipologia, override={'config': nueva_config}, sufijo_nombre="")
+                for config, nueva_config in zip(lote, nuevas_configs)
+                for tipologia in config.tipologias.all()
+            ], batch_size=BATCH_SIZE)
+
+            # Copiar proyección manual (ajuste estacional), ya traída en el JOIN
+            manuales = []
+            for config, nueva_config in zip(lote, nuevas_configs):
+                manual = getattr(config, 'proyeccion_manual', None)
+                if manual is not None:
+                    manuales.append(
+                        construir_copia(manual, override={'config': nueva_config}, sufijo_nombre="")
+                    )
+            ProyeccionManual.objects.bulk_create(manuales)
+        incrementar(
+            ProyeccionManual.objects.filter(config__escenario=target),
+            get_campos_monetarios(ProyeccionManual),
+            indice_nombre='ipc'
+        )
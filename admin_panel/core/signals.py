@@ -1,25 +1,91 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.core.signals import request_started, request_finished
 from django.db.models import Sum, Q
 from decimal import Decimal
 from collections import defaultdict
+from functools import reduce
 import logging
+import operator
 
 from .models import (
     PersonalComercial, PersonalLogistico, PersonalAdministrativo,
-    PoliticaRecursosHumanos, ParametrosMacro,
+    PoliticaRecursosHumanos, ParametrosMacro, FactorPrestacional,
     GastoComercial, GastoLogistico, GastoAdministrativo,
     Escenario, Marca, Vehiculo,
     Zona, ZonaMunicipio, RutaLogistica, RutaMunicipio,
-    ConfiguracionLejania, MatrizDesplazamiento,
+    ConfiguracionLejania, MatrizDesplazamiento, Municipio,
     # Modelos through para asignación multi-marca
     PersonalComercialMarca, PersonalLogisticoMarca, PersonalAdministrativoMarca,
     GastoComercialMarca, GastoLogisticoMarca, GastoAdministrativoMarca,
-    ZonaMarca
+    ZonaMarca,
+    iniciar_memo_tablas_referencia, limpiar_memo_tablas_referencia,
+    invalidar_tabla_referencia,
 )
 
 logger = logging.getLogger(__name__)
 
+
+# =============================================================================
+# INVALIDACIÓN DE CACHE DE TABLAS DE REFERENCIA
+# Se registran primero para que los demás receivers ya lean valores frescos.
+# El cache de Django se borra al confirmar la transacción (on_commit); hasta
+# entonces las lecturas de este hilo van directo a la base.
+# =============================================================================
+
+@receiver([post_save, post_delete], sender=FactorPrestacional)
+@receiver([post_save, post_delete], sender=ParametrosMacro)
+@receiver([post_save, post_delete], sender=MatrizDesplazamiento)
+@receiver([post_save, post_delete], sender=ConfiguracionLejania)
+def invalidar_cache_tablas_referencia(sender, instance, **kwargs):
+    invalidar_tabla_referencia(sender.CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=Municipio)
+def invalidar_cache_config_lejania_por_municipio(sender, instance, **kwargs):
+    # La configuración cacheada trae los municipios de bodega y comité (se
+    # borra del cache al confirmar, ver invalidar_tabla_referencia)
+    invalidar_tabla_referencia(ConfiguracionLejania.CACHE_KEY)
+
+
+@receiver(request_started)
+def iniciar_memo_request(sender, **kwargs):
+    iniciar_memo_tablas_referencia()
+
+
+@receiver(request_finished)
+def limpiar_memo_request(sender, **kwargs):
+    limpiar_memo_tablas_referencia()
+
+
+# =============================================================================
+# COSTO MENSUAL DESNORMALIZADO (PersonalAdministrativo.costo_mensual_cached)
+# Se refresca en SQL cuando cambian los insumos externos del cálculo.
+# =============================================================================
+
+@receiver([post_save, post_delete], sender=FactorPrestacional)
+def refrescar_costo_admin_por_factor(sender, instance, **kwargs):
+    PersonalAdministrativo.objects.filter(
+        perfil_prestacional=instance.perfil
+    ).actualizar_costo_mensual_cached()
+
+
+@receiver([post_save, post_delete], sender=ParametrosMacro)
+def refrescar_costo_admin_por_macro(sender, instance, **kwargs):
+    PersonalAdministrativo.objects.filter(
+        escenario__anio=instance.anio
+    ).actualizar_costo_mensual_cached()
+
+
+@receiver(post_save, sender=Escenario)
+def refrescar_costo_admin_por_escenario(sender, instance, created, **kwargs):
+    # El año del escenario determina qué ParametrosMacro aplican
+    if not created:
+        PersonalAdministrativo.objects.filter(
+            escenario=instance
+        ).actualizar_costo_mensual_cached()
+
+
 def calculate_hr_expenses(escenario):
     """
     Recalcula los gastos de Dotación, EPP y Exámenes Médicos para un escenario dado.
@@ -37,7 +103,7 @@ def calculate_hr_expenses(escenario):
         return
 
     try:
-        macro = ParametrosMacro.objects.get(anio=escenario.anio, activo=True)
+        macro = ParametrosMacro.obtener_activo(escenario.anio)
         smlv = macro.salario_minimo_legal
     except ParametrosMacro.DoesNotExist:
         return
@@ -285,6 +351,48 @@ def update_expenses_on_policy_change(sender, instance, **kwargs):
     for escenario in escenarios:
         calculate_hr_expenses(escenario)
 
+def _sincronizar_gastos_logisticos(escenario, marca, rubros, defaults):
+    """
+    Crea, actualiza o elimina en lote los GastoLogistico de una marca.
+
+    Equivale a un update_or_create por rubro (lookup por escenario, marca,
+    tipo y nombre), resuelto con un solo INSERT ... ON CONFLICT DO UPDATE
+    sobre la restricción única gasto_log_fila_uniq y un DELETE para los
+    rubros con valor <= 0.
+
+    Args:
+        rubros: lista de tuplas (tipo, nombre, valor_mensual)
+        defaults: campos adicionales a asignar en los gastos guardados
+    """
+    valores = {(tipo, nombre): valor for tipo, nombre, valor in rubros}
+
+    por_guardar = [
+        GastoLogistico(
+            escenario=escenario, marca=marca, tipo=tipo, nombre=nombre,
+            valor_mensual=valor, **defaults
+        )
+        for (tipo, nombre), valor in valores.items()
+        if valor > 0
+    ]
+    if por_guardar:
+        GastoLogistico.objects.bulk_create(
+            por_guardar,
+            update_conflicts=True,
+            unique_fields=['escenario', 'marca', 'tipo', 'nombre'],
+            update_fields=['valor_mensual', *defaults],
+        )
+
+    por_borrar = [
+        Q(tipo=tipo, nombre=nombre)
+        for (tipo, nombre), valor in valores.items()
+        if valor <= 0
+    ]
+    if por_borrar:
+        GastoLogistico.objects.filter(
+            escenario=escenario, marca=marca
+        ).filter(reduce(operator.or_, por_borrar)).delete()
+
+
 def calculate_logistic_expenses(escenario):
     """
     Recalcula los gastos logísticos FIJOS basados en la flota de vehículos.
@@ -319,22 +427,22 @@ def calculate_logistic_expenses(escenario):
             total_monitoreo += v.costo_monitoreo_mensual * v.cantidad
             total_seguros_mercancia += v.costo_seguro_mercancia_mensual * v.cantidad
 
-            if v.esquema == 'tercero':
+            if v.esquema == Vehiculo.Esquema.TERCERO:
                 # Para terceros, el flete base viene de los Recorridos Logísticos
                 pass
 
-            elif v.esquema in ['renting', 'tradicional']:
+            elif v.esquema in (Vehiculo.Esquema.RENTING, Vehiculo.Esquema.TRADICIONAL):
                 # Costos comunes para Propio y Renting
                 total_lavado += v.costo_lavado_mensual * v.cantidad
                 total_parqueadero += v.costo_parqueadero_mensual * v.cantidad
 
                 # NOTA: El combustible se calcula en los Recorridos Logísticos
 
-                if v.esquema == 'renting':
+                if v.esquema == Vehiculo.Esquema.RENTING:
                     # Renting: Canon * Cantidad
                     total_renting += v.canon_renting * v.cantidad
 
-                elif v.esquema == 'tradicional':  # Propio
+                elif v.esquema == Vehiculo.Esquema.TRADICIONAL:  # Propio
                     # Depreciación: (Costo - Residual) / (Vida Util * 12) * Cantidad
                     if v.vida_util_anios > 0:
                         depreciacion_mensual = (v.costo_compra - v.valor_residual) / (v.vida_util_anios * 12)
@@ -346,32 +454,18 @@ def calculate_logistic_expenses(escenario):
                     # Seguros
                     total_seguros += v.costo_seguro_mensual * v.cantidad
 
-        # Función helper para actualizar/borrar gasto
-        def update_gasto(tipo, nombre, valor):
-            if valor > 0:
-                GastoLogistico.objects.update_or_create(
-                    escenario=escenario,
-                    tipo=tipo,
-                    marca=marca_obj,
-                    nombre=nombre,  # Incluir nombre en el lookup para permitir múltiples registros del mismo tipo
-                    defaults={
-                        'valor_mensual': valor,
-                        'asignacion': 'individual'
-                    }
-                )
-            else:
-                GastoLogistico.objects.filter(escenario=escenario, tipo=tipo, marca=marca_obj, nombre=nombre).delete()
-
-        # Actualizar cada rubro (solo costos FIJOS del vehículo)
+        # Actualizar cada rubro (solo costos FIJOS del vehículo) en un solo lote
         # NOTA: flete_tercero y combustible se calculan desde los Recorridos Logísticos
-        update_gasto('canon_renting', 'Canon Renting Flota', total_renting)
-        update_gasto('depreciacion_vehiculo', 'Depreciación Flota Propia', total_depreciacion)
-        update_gasto('mantenimiento_vehiculos', 'Mantenimiento Flota Propia', total_mantenimiento)
-        update_gasto('seguros_carga', 'Seguros Flota Propia', total_seguros)
-        update_gasto('lavado_vehiculos', 'Aseo y Limpieza Vehículos', total_lavado)
-        update_gasto('parqueadero_vehiculos', 'Parqueaderos', total_parqueadero)
-        update_gasto('monitoreo_satelital', 'Monitoreo Satelital (GPS)', total_monitoreo)
-        update_gasto('seguros_carga', 'Seguro de Mercancía', total_seguros_mercancia)
+        _sincronizar_gastos_logisticos(escenario, marca_obj, [
+            ('canon_renting', 'Canon Renting Flota', total_renting),
+            ('depreciacion_vehiculo', 'Depreciación Flota Propia', total_depreciacion),
+            ('mantenimiento_vehiculos', 'Mantenimiento Flota Propia', total_mantenimiento),
+            ('seguros_carga', 'Seguros Flota Propia', total_seguros),
+            ('lavado_vehiculos', 'Aseo y Limpieza Vehículos', total_lavado),
+            ('parqueadero_vehiculos', 'Parqueaderos', total_parqueadero),
+            ('monitoreo_satelital', 'Monitoreo Satelital (GPS)', total_monitoreo),
+            ('seguros_carga', 'Seguro de Mercancía', total_seguros_mercancia),
+        ], {'asignacion': 'individual'})
 
 
 @receiver([post_save, post_delete], sender=Vehiculo)
@@ -411,7 +505,7 @@ def calculate_lejanias_comerciales(escenario):
         return
 
     try:
-        config = ConfiguracionLejania.objects.get(escenario=escenario)
+        config = ConfiguracionLejania.obtener_para(escenario)
     except ConfiguracionLejania.DoesNotExist:
         logger.warning(f"No hay ConfiguracionLejania para escenario {escenario}")
         return
@@ -519,10 +613,7 @@ def _calcular_lejania_comercial_zona(zona, config):
 
         # Visita a otro municipio: buscar en matriz
         try:
-            matriz = MatrizDesplazamiento.objects.get(
-                origen_id=base_vendedor.id,
-                destino_id=municipio.id
-            )
+            matriz = MatrizDesplazamiento.obtener_tramo(base_vendedor.id, municipio.id)
             distancia_km = matriz.distancia_km
         except MatrizDesplazamiento.DoesNotExist:
             continue
@@ -613,10 +704,7 @@ def _calcular_comite_comercial(escenario, config):
 
         # Calcular distancia al municipio del comité
         try:
-            matriz = MatrizDesplazamiento.objects.get(
-                origen_id=base_vendedor.id,
-                destino_id=config.municipio_comite.id
-            )
+            matriz = MatrizDesplazamiento.obtener_tramo(base_vendedor.id, config.municipio_comite.id)
             distancia_km = matriz.distancia_km
         except MatrizDesplazamiento.DoesNotExist:
             distancia_km = Decimal('0')
@@ -700,7 +788,7 @@ def calculate_lejanias_logisticas(escenario):
         return
 
     try:
-        config = ConfiguracionLejania.objects.get(escenario=escenario)
+        config = ConfiguracionLejania.obtener_para(escenario)
     except ConfiguracionLejania.DoesNotExist:
         logger.warning(f"No hay ConfiguracionLejania para escenario {escenario}")
         return
@@ -731,42 +819,27 @@ def calculate_lejanias_logisticas(escenario):
         operacion_obj = ruta.operacion
         criterio_prorrateo_op = ruta.criterio_prorrateo_operacion
 
-        # Helper para guardar gasto logístico heredando marca y operación de la ruta
-        def save_gasto(tipo, nombre, valor):
-            if valor > 0:
-                GastoLogistico.objects.update_or_create(
-                    escenario=escenario,
-                    tipo=tipo,
-                    marca=marca,
-                    nombre=nombre,
-                    defaults={
-                        'valor_mensual': valor,
-                        'tipo_asignacion_geo': 'proporcional',
-                        'zona': None,  # Proporcional no asigna zona directa
-                        # Heredar asignación de marca de la ruta
-                        'asignacion': asignacion_marca,
-                        # Heredar operación de la ruta
-                        'tipo_asignacion_operacion': tipo_asig_op,
-                        'operacion': operacion_obj,
-                        'criterio_prorrateo_operacion': criterio_prorrateo_op,
-                    }
-                )
-            else:
-                GastoLogistico.objects.filter(
-                    escenario=escenario,
-                    tipo=tipo,
-                    marca=marca,
-                    nombre=nombre
-                ).delete()
-
-        # Guardar cada tipo de gasto
-        save_gasto('combustible', f'Combustible - {ruta.nombre}', combustible)
-        save_gasto('peajes', f'Peajes - {ruta.nombre}', peajes)
-        save_gasto('otros', f'Viáticos Ruta - {ruta.nombre}', pernocta)
+        rubros = [
+            ('combustible', f'Combustible - {ruta.nombre}', combustible),
+            ('peajes', f'Peajes - {ruta.nombre}', peajes),
+            ('otros', f'Viáticos Ruta - {ruta.nombre}', pernocta),
+        ]
 
         # Flete base solo aplica para terceros
-        if ruta.vehiculo and ruta.vehiculo.esquema == 'tercero':
-            save_gasto('otros', f'Flete Base Tercero - {ruta.nombre}', flete_base)
+        if ruta.vehiculo and ruta.vehiculo.esquema == Vehiculo.Esquema.TERCERO:
+            rubros.append(('otros', f'Flete Base Tercero - {ruta.nombre}', flete_base))
+
+        # Guardar los gastos heredando marca y operación de la ruta
+        _sincronizar_gastos_logisticos(escenario, marca, rubros, {
+            'tipo_asignacion_geo': 'proporcional',
+            'zona': None,  # Proporcional no asigna zona directa
+            # Heredar asignación de marca de la ruta
+            'asignacion': asignacion_marca,
+            # Heredar operación de la ruta
+            'tipo_asignacion_operacion': tipo_asig_op,
+            'operacion': operacion_obj,
+            'criterio_prorrateo_operacion': criterio_prorrateo_op,
+        })
 
 
 def _calcular_lejania_logistica_ruta(ruta, config):
@@ -820,10 +893,7 @@ def _calcular_lejania_logistica_ruta(ruta, config):
         destino = puntos_circuito[i + 1]
 
         try:
-            matriz = MatrizDesplazamiento.objects.get(
-                origen_id=origen.id,
-                destino_id=destino.id
-            )
+            matriz = MatrizDesplazamiento.obtener_tramo(origen.id, destino.id)
             distancia_total += matriz.distancia_km
             peaje_circuito += matriz.peaje_ida or Decimal('0')
         except MatrizDesplazamiento.DoesNotExist:
@@ -921,14 +991,21 @@ def update_lejanias_on_config_change(sender, instance, **kwargs):
         calculate_lejanias_logisticas(instance.escenario)
 
 
+def recalcular_lejanias_escenarios_activos():
+    """
+    Recalcula lejanías de todos los escenarios activos. Las matrices no tienen
+    escenario directo; lo usan el signal de la matriz y las cargas masivas
+    (MatrizDesplazamiento.bulk_load_matrix no dispara signals).
+    """
+    for escenario in Escenario.objects.filter(activo=True):
+        calculate_lejanias_comerciales(escenario)
+        calculate_lejanias_logisticas(escenario)
+
+
 @receiver(post_save, sender=MatrizDesplazamiento)
 def update_lejanias_on_matriz_change(sender, instance, **kwargs):
     """
     Recalcula lejanías cuando cambia la matriz de desplazamiento.
-    Afecta todos los escenarios del mismo año.
+    Afecta todos los escenarios activos.
     """
-    # Las matrices no tienen escenario directo, así que recalculamos todos los escenarios activos
-    escenarios = Escenario.objects.filter(activo=True)
-    for escenario in escenarios:
-        calculate_lejanias_comerciales(escenario)
-        calculate_lejanias_logisticas(escenario)
+    recalcular_lejanias_escenarios_activos()
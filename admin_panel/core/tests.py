@@ -0,0 +1,283 @@
+"""
+Tests del admin de DxV.
+
+Se ejecutan con `python manage.py test core` contra PostgreSQL (la copia de
+escenarios usa INSERT ... RETURNING, unnest y aritmética NUMERIC).
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .models import (
+    Escenario, Marca, Municipio, ParametrosMacro,
+    PersonalComercial, PersonalLogistico, PersonalAdministrativo, Vehiculo,
+    GastoComercial, GastoLogistico, GastoAdministrativo,
+    PersonalComercialMarca, PersonalLogisticoMarca, PersonalAdministrativoMarca,
+    GastoComercialMarca, GastoLogisticoMarca, GastoAdministrativoMarca,
+    Zona, ZonaMarca, ZonaMunicipio, RutaLogistica, RutaMunicipio,
+    ProyeccionVentasConfig, TipologiaProyeccion, ProyeccionManual,
+)
+from .services import EscenarioService
+
+
+# Porcentajes de ParametrosMacro del año proyectado, por índice de incremento
+INCREMENTOS = {
+    'salarios': Decimal('10'),
+    'salario_minimo': Decimal('12'),
+    'ipc': Decimal('5'),
+    'ipt': Decimal('4'),
+    'combustible': Decimal('6'),
+    'arriendos': Decimal('8'),
+}
+
+# (modelo, campos comparados, filtro hacia el escenario). Los campos son de
+# negocio: ids de marca y municipio se comparten entre escenarios, los demás
+# ids no (las FKs internas se comparan por los datos del padre).
+FILAS_COPIADAS = [
+    (PersonalComercial, ('tipo', 'cantidad', 'marca_id', 'asignacion', 'salario_base'), 'escenario'),
+    (PersonalLogistico, ('tipo', 'cantidad', 'marca_id', 'salario_base'), 'escenario'),
+    (PersonalAdministrativo, ('nombre', 'tipo', 'cantidad', 'salario_base'), 'escenario'),
+    (Vehiculo, ('tipo_vehiculo', 'esquema', 'cantidad', 'marca_id', 'canon_renting'), 'escenario'),
+    (GastoComercial, ('tipo', 'nombre', 'marca_id', 'valor_mensual'), 'escenario'),
+    (GastoLogistico, ('tipo', 'nombre', 'marca_id', 'valor_mensual'), 'escenario'),
+    (GastoAdministrativo, ('tipo', 'nombre', 'marca_id', 'valor_mensual'), 'escenario'),
+    (PersonalComercialMarca, ('personal__salario_base', 'marca_id', 'porcentaje'), 'personal__escenario'),
+    (PersonalLogisticoMarca, ('personal__salario_base', 'marca_id', 'porcentaje'), 'personal__escenario'),
+    (PersonalAdministrativoMarca, ('personal__nombre', 'marca_id', 'porcentaje'), 'personal__escenario'),
+    (GastoComercialMarca, ('gasto__nombre', 'marca_id', 'porcentaje'), 'gasto__escenario'),
+    (GastoLogisticoMarca, ('gasto__nombre', 'marca_id', 'porcentaje'), 'gasto__escenario'),
+    (GastoAdministrativoMarca, ('gasto__nombre', 'marca_id', 'porcentaje'), 'gasto__escenario'),
+    # La zona copiada conserva el vendedor del escenario origen (ver
+    # EscenarioService._copiar_datos_escenario)
+    (Zona, ('nombre', 'marca_id', 'vendedor_id', 'venta_proyectada'), 'escenario'),
+    (ZonaMarca, ('zona__nombre', 'marca_id', 'porcentaje'), 'zona__escenario'),
+    (ZonaMunicipio, ('zona__nombre', 'municipio_id', 'venta_proyectada'), 'zona__escenario'),
+    (RutaLogistica, ('nombre', 'marca_id', 'vehiculo__canon_renting'), 'escenario'),
+    (RutaMunicipio, ('ruta__nombre', 'municipio_id', 'flete_base'), 'ruta__escenario'),
+    (ProyeccionVentasConfig, ('marca_id',), 'escenario'),
+    (TipologiaProyeccion, ('config__marca_id', 'nombre'), 'config__escenario'),
+    (ProyeccionManual, ('config__marca_id', 'enero', 'febrero'), 'config__escenario'),
+]
+
+
+def _filas(modelo, campos, filtro, escenario):
+    return list(
+        modelo.objects.filter(**{filtro: escenario})
+        .order_by(*campos)
+        .values_list(*campos)
+    )
+
+
+def _incrementado(valor, indice):
+    return (valor * (1 + INCREMENTOS[indice] / 100)).quantize(Decimal('0.01'))
+
+
+class CopiaEscenarioTests(TestCase):
+    """duplicar_escenario y proyectar_escenario copian todo el escenario con sus FKs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.anio = 2031
+        cls.origen = Escenario.objects.create(nombre='Origen', tipo='planeado', anio=cls.anio)
+        marca_a = Marca.objects.create(marca_id='test_a', nombre='Test A')
+        marca_b = Marca.objects.create(marca_id='test_b', nombre='Test B')
+        municipios = [
+            Municipio.objects.create(codigo_dane=f'99{i:03d}', nombre=f'Municipio {i}', departamento='Test')
+            for i in range(3)
+        ]
+
+        ParametrosMacro.objects.create(
+            anio=cls.anio + 1,
+            ipc=INCREMENTOS['ipc'],
+            ipt=INCREMENTOS['ipt'],
+            incremento_salarios=INCREMENTOS['salarios'],
+            incremento_salario_minimo=INCREMENTOS['salario_minimo'],
+            incremento_combustible=INCREMENTOS['combustible'],
+            incremento_arriendos=INCREMENTOS['arriendos'],
+            salario_minimo_legal=Decimal('1423500'),
+            subsidio_transporte=Decimal('200000'),
+        )
+
+        # Personal (un registro multi-marca y uno con marca directa por tipo)
+        vendedor = PersonalComercial.objects.create(
+            escenario=cls.origen, tipo='vendedor_geografico', cantidad=2,
+            salario_base=Decimal('1500000'), asignacion='compartido',
+        )
+        PersonalComercialMarca.objects.create(personal=vendedor, marca=marca_a, porcentaje=60)
+        PersonalComercialMarca.objects.create(personal=vendedor, marca=marca_b, porcentaje=40)
+        PersonalComercial.objects.create(
+            escenario=cls.origen, marca=marca_a, tipo='vendedor_geografico', cantidad=1,
+            salario_base=Decimal('1600000'), asignacion='individual',
+        )
+        conductor = PersonalLogistico.objects.create(
+            escenario=cls.origen, marca=marca_a, tipo='conductor', cantidad=1,
+            salario_base=Decimal('1700000'),
+        )
+        PersonalLogisticoMarca.objects.create(personal=conductor, marca=marca_b, porcentaje=100)
+        contador = PersonalAdministrativo.objects.create(
+            escenario=cls.origen, nombre='Contador', tipo='contador', cantidad=1,
+            salario_base=Decimal('3000000'), indice_incremento='ipc',
+        )
+        PersonalAdministrativoMarca.objects.create(personal=contador, marca=marca_a, porcentaje=50)
+        PersonalAdministrativoMarca.objects.create(personal=contador, marca=marca_b, porcentaje=50)
+
+        # Vehículos (su signal crea los GastoLogistico derivados del canon)
+        vehiculos = [
+            Vehiculo.objects.create(
+                escenario=cls.origen, marca=marca_a, tipo_vehiculo='nhr', esquema='renting',
+                cantidad=i + 1, canon_renting=Decimal('1000') * (i + 1),
+            )
+            for i in range(2)
+        ]
+
+        # Gastos: uno multi-marca con asignaciones y uno de marca directa
+        for modelo, modelo_marca in (
+            (GastoComercial, GastoComercialMarca),
+            (GastoLogistico, GastoLogisticoMarca),
+            (GastoAdministrativo, GastoAdministrativoMarca),
+        ):
+            tipo = modelo.TIPO_CHOICES[-1][0]
+            gasto = modelo.objects.create(
+                escenario=cls.origen, nombre='Gasto compartido', tipo=tipo,
+                valor_mensual=Decimal('1000'),
+            )
+            modelo_marca.objects.create(gasto=gasto, marca=marca_a, porcentaje=30)
+            modelo_marca.objects.create(gasto=gasto, marca=marca_b, porcentaje=70)
+            modelo.objects.create(
+                escenario=cls.origen, marca=marca_b, nombre='Gasto directo', tipo=tipo,
+                valor_mensual=Decimal('2000'),
+            )
+
+        # Zona, ruta y proyección de ventas
+        zona = Zona.objects.create(
+            escenario=cls.origen, nombre='Zona 1', marca=marca_a, vendedor=vendedor,
+            municipio_base_vendedor=municipios[0],
+        )
+        ZonaMarca.objects.create(zona=zona, marca=marca_a, porcentaje=100)
+        for municipio in municipios[1:]:
+            ZonaMunicipio.objects.create(zona=zona, municipio=municipio, venta_proyectada=Decimal('12345.67'))
+
+        ruta = RutaLogistica.objects.create(
+            escenario=cls.origen, nombre='Ruta 1', vehiculo=vehiculos[0], marca=marca_a,
+        )
+        for municipio in municipios[1:]:
+            RutaMunicipio.objects.create(ruta=ruta, municipio=municipio, flete_base=Decimal('5000'))
+
+        config = ProyeccionVentasConfig.objects.create(escenario=cls.origen, marca=marca_a, anio=cls.anio)
+        TipologiaProyeccion.objects.create(config=config, nombre='Tienda')
+        TipologiaProyeccion.objects.create(config=config, nombre='Supermercado')
+        ProyeccionManual.objects.create(config=config, enero=Decimal('100'), febrero=Decimal('200'))
+
+    def setUp(self):
+        cache.clear()
+
+    def assertFilasCopiadas(self, nuevo, excluir=()):
+        for modelo, campos, filtro in FILAS_COPIADAS:
+            if modelo in excluir:
+                continue
+            with self.subTest(modelo=modelo.__name__):
+                origen = _filas(modelo, campos, filtro, self.origen)
+                self.assertTrue(origen)
+                self.assertEqual(_filas(modelo, campos, filtro, nuevo), origen)
+
+    def assertFKsEnEscenario(self, nuevo):
+        """Las rutas copiadas apuntan a los vehículos copiados, no a los del origen"""
+        rutas = RutaLogistica.objects.filter(escenario=nuevo)
+        self.assertTrue(rutas.exists())
+        self.assertFalse(rutas.exclude(vehiculo__escenario=nuevo).exists())
+
+    def test_duplicar_escenario(self):
+        nuevo = EscenarioService.duplicar_escenario(self.origen.pk, 'Copia')
+
+        self.assertNotEqual(nuevo.pk, self.origen.pk)
+        self.assertEqual(nuevo.anio, self.origen.anio)
+        self.assertFilasCopiadas(nuevo)
+        self.assertFKsEnEscenario(nuevo)
+        self.assertEqual(
+            _filas(PersonalAdministrativo, ('nombre', 'costo_mensual_cached'), 'escenario', nuevo),
+            _filas(PersonalAdministrativo, ('nombre', 'costo_mensual_cached'), 'escenario', self.origen),
+        )
+        self.assertEqual(
+            list(ProyeccionVentasConfig.objects.filter(escenario=nuevo).values_list('anio', flat=True)),
+            [self.anio],
+        )
+
+    def test_proyectar_escenario(self):
+        nuevo = EscenarioService.proyectar_escenario(self.origen.pk, self.anio + 1, 'Proyección')
+
+        self.assertEqual(nuevo.anio, self.anio + 1)
+        # Montos incrementados: se verifican abajo uno por uno
+        self.assertFilasCopiadas(nuevo, excluir=(
+            PersonalComercial, PersonalLogistico, PersonalAdministrativo,
+            PersonalComercialMarca, PersonalLogisticoMarca,
+            GastoComercial, GastoLogistico, GastoAdministrativo,
+            RutaMunicipio, ProyeccionManual,
+        ))
+        self.assertFKsEnEscenario(nuevo)
+
+        for modelo, modelo_marca in (
+            (PersonalComercial, PersonalComercialMarca),
+            (PersonalLogistico, PersonalLogisticoMarca),
+            (PersonalAdministrativo, PersonalAdministrativoMarca),
+        ):
+            with self.subTest(modelo=modelo.__name__):
+                esperado = sorted(
+                    (_incrementado(p.salario_base, p.indice_incremento), p.tipo, p.marca_id)
+                    for p in modelo.objects.filter(escenario=self.origen)
+                )
+                self.assertEqual(
+                    sorted(modelo.objects.filter(escenario=nuevo).values_list('salario_base', 'tipo', 'marca_id')),
+                    esperado,
+                )
+                self.assertEqual(
+                    sorted(modelo_marca.objects.filter(personal__escenario=nuevo).values_list('marca_id', 'porcentaje')),
+                    sorted(modelo_marca.objects.filter(personal__escenario=self.origen).values_list('marca_id', 'porcentaje')),
+                )
+
+        # Los gastos cargados a mano se incrementan; los derivados de vehículos
+        # se recalculan a partir de los vehículos copiados
+        for modelo in (GastoComercial, GastoLogistico, GastoAdministrativo):
+            with self.subTest(modelo=modelo.__name__):
+                manuales = {'nombre__startswith': 'Gasto '}
+                esperado = sorted(
+                    (g.nombre, g.marca_id, _incrementado(g.valor_mensual, g.indice_incremento))
+                    for g in modelo.objects.filter(escenario=self.origen, **manuales)
+                )
+                self.assertEqual(
+                    sorted(modelo.objects.filter(escenario=nuevo, **manuales)
+                           .values_list('nombre', 'marca_id', 'valor_mensual')),
+                    esperado,
+                )
+                self.assertEqual(
+                    modelo.objects.filter(escenario=nuevo).count(),
+                    modelo.objects.filter(escenario=self.origen).count(),
+                )
+
+        self.assertEqual(
+            set(RutaMunicipio.objects.filter(ruta__escenario=nuevo).values_list('flete_base', flat=True)),
+            {_incrementado(Decimal('5000'), 'ipc')},
+        )
+        self.assertEqual(
+            list(ProyeccionManual.objects.filter(config__escenario=nuevo).values_list('enero', 'febrero')),
+            [(_incrementado(Decimal('100'), 'ipc'), _incrementado(Decimal('200'), 'ipc'))],
+        )
+        self.assertEqual(
+            list(ProyeccionVentasConfig.objects.filter(escenario=nuevo).values_list('anio', flat=True)),
+            [self.anio + 1],
+        )
+
+    def test_proyectar_escenario_con_macros_inactivos(self):
+        # Los incrementos se toman del año destino aunque sus parámetros no estén activos
+        ParametrosMacro.objects.filter(anio=self.anio + 1).update(activo=False)
+
+        nuevo = EscenarioService.proyectar_escenario(self.origen.pk, self.anio + 1, 'Proyección')
+
+        esperado = sorted(
+            _incrementado(p.salario_base, p.indice_incremento)
+            for p in PersonalComercial.objects.filter(escenario=self.origen)
+        )
+        self.assertEqual(
+            sorted(PersonalComercial.objects.filter(escenario=nuevo).values_list('salario_base', flat=True)),
+            esperado,
+        )
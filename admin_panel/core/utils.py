@@ -1,11 +1,63 @@
 """
 Utilidades genéricas para el sistema DxV
 """
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+
 from django.db import models, transaction
-from typing import Dict, Any, List, Optional, Set
 
 
-def copiar_instancia(
+# Campos que nunca se copian
+CAMPOS_EXCLUIR_SIEMPRE = frozenset({
+    'id', 'pk',
+    'fecha_creacion', 'fecha_modificacion',
+    'created_at', 'updated_at',
+})
+
+
+@lru_cache(maxsize=None)
+def _plan_copia(modelo) -> Tuple[Tuple[str, str, bool, bool], ...]:
+    """
+    Campos copiables de un modelo como (name, attname, es_relacion, con_sufijo).
+
+    Se calcula una vez por clase para no recorrer `_meta.fields` por cada
+    registro copiado. Excluye CAMPOS_EXCLUIR_SIEMPRE y los calculados por la
+    BD. `con_sufijo` marca los campos de texto únicos y el campo 'nombre'.
+    """
+    plan = []
+    for field in modelo._meta.fields:
+        if field.name in CAMPOS_EXCLUIR_SIEMPRE or field.generated:
+            continue
+        con_sufijo = (
+            isinstance(field, (models.CharField, models.TextField))
+            and (field.unique or field.name == 'nombre')
+        )
+        plan.append((field.name, field.attname, field.is_relation, con_sufijo))
+    return tuple(plan)
+
+
+@lru_cache(maxsize=None)
+def _campos_no_copiados(modelo) -> Tuple[str, ...]:
+    """Columnas de un modelo que construir_copia nunca lee."""
+    return tuple(
+        field.name for field in modelo._meta.concrete_fields
+        if not field.primary_key
+        and (field.name in CAMPOS_EXCLUIR_SIEMPRE or field.generated)
+    )
+
+
+def para_copia(queryset: models.QuerySet) -> models.QuerySet:
+    """
+    Prepara un queryset de origen para construir_copia: quita los
+    select_related por defecto del manager (ConRelacionesManager) y difiere
+    las columnas que no se copian (marcas de tiempo, campos generados).
+    """
+    queryset = queryset.select_related(None)
+    omitidos = _campos_no_copiados(queryset.model)
+    return queryset.defer(*omitidos) if omitidos else queryset
+
+
+def construir_copia(
     instancia: models.Model,
     override: Optional[Dict[str, Any]] = None,
     excluir_campos: Optional[Set[str]] = None,
@@ -14,63 +66,23 @@ def copiar_instancia(
     sufijo_nombre: str = " (Copia)"
 ) -> models.Model:
     """
-    Crea una copia de cualquier instancia de modelo Django.
-
-    Args:
-        instancia: La instancia del modelo a copiar
-        override: Diccionario con campos a sobrescribir en la copia
-        excluir_campos: Campos adicionales a excluir (además de id, pk, fecha_*)
-        campos_monetarios: Campos a los que aplicar factor_incremento
-        factor_incremento: Factor de incremento para campos monetarios (0 = sin cambio)
-        sufijo_nombre: Sufijo a agregar a campos únicos de texto (nombre, perfil, etc.)
-
-    Returns:
-        Nueva instancia creada (ya guardada en BD)
-
-    Example:
-        # Copia simple
-        nuevo_vendedor = copiar_instancia(vendedor_original)
+    Construye (sin guardar) una copia de cualquier instancia de modelo Django.
 
-        # Copia con cambios
-        nuevo_vendedor = copiar_instancia(
-            vendedor_original,
-            override={'marca': otra_marca, 'nombre': 'Vendedor Sur'},
-        )
+    Mismos argumentos que `copiar_instancia`. Sirve para acumular copias y
+    guardarlas con un solo `bulk_create` (que no llama save() ni dispara
+    signals).
 
-        # Copia con incremento en salarios
-        nuevo_personal = copiar_instancia(
-            personal_original,
-            campos_monetarios={'salario_base', 'auxilio_adicional'},
-            factor_incremento=0.05  # 5% de incremento
-        )
+    Las FKs que no vienen en override se copian por su columna (`marca_id`),
+    sin cargar el objeto relacionado.
     """
     override = override or {}
     excluir_campos = excluir_campos or set()
     campos_monetarios = campos_monetarios or set()
 
-    # Campos que siempre se excluyen
-    campos_excluir_siempre = {
-        'id', 'pk',
-        'fecha_creacion', 'fecha_modificacion',
-        'created_at', 'updated_at',
-    }
-    campos_excluir = campos_excluir_siempre | excluir_campos
-
-    # Identificar campos de texto que necesitan sufijo
-    # Incluye campos únicos Y el campo 'nombre' (común en modelos)
-    campos_con_sufijo = set()
-    for field in instancia._meta.fields:
-        if isinstance(field, (models.CharField, models.TextField)):
-            if field.unique or field.name == 'nombre':
-                campos_con_sufijo.add(field.name)
-
     # Construir diccionario con los valores de la instancia original
     data = {}
-    for field in instancia._meta.fields:
-        nombre_campo = field.name
-
-        # Saltar campos excluidos
-        if nombre_campo in campos_excluir:
+    for nombre_campo, attname, es_relacion, con_sufijo in _plan_copia(instancia.__class__):
+        if nombre_campo in excluir_campos:
             continue
 
         # Si está en override, usar el valor de override
@@ -78,6 +90,11 @@ def copiar_instancia(
             data[nombre_campo] = override[nombre_campo]
             continue
 
+        # FKs: copiar el id sin consultar el objeto relacionado
+        if es_relacion:
+            data[attname] = override.get(attname, getattr(instancia, attname))
+            continue
+
         # Obtener valor original
         valor = getattr(instancia, nombre_campo)
 
@@ -86,9 +103,8 @@ def copiar_instancia(
             valor = float(valor) * (1 + factor_incremento)
 
         # Agregar sufijo a campos de texto (nombre, perfil, etc.)
-        if nombre_campo in campos_con_sufijo and sufijo_nombre and nombre_campo not in override:
-            if valor:
-                valor = f"{valor}{sufijo_nombre}"
+        if con_sufijo and sufijo_nombre and valor:
+            valor = f"{valor}{sufijo_nombre}"
 
         data[nombre_campo] = valor
 
@@ -98,13 +114,77 @@ def copiar_instancia(
         if key not in data:
             data[key] = value
 
-    # Crear nueva instancia
-    modelo_class = instancia.__class__
-    nueva_instancia = modelo_class.objects.create(**data)
+    return instancia.__class__(**data)
+
+
+def copiar_instancia(
+    instancia: models.Model,
+    override: Optional[Dict[str, Any]] = None,
+    excluir_campos: Optional[Set[str]] = None,
+    campos_monetarios: Optional[Set[str]] = None,
+    factor_incremento: float = 0,
+    sufijo_nombre: str = " (Copia)"
+) -> models.Model:
+    """
+    Crea una copia de cualquier instancia de modelo Django.
+
+    Args:
+        instancia: La instancia del modelo a copiar
+        override: Diccionario con campos a sobrescribir en la copia
+        excluir_campos: Campos adicionales a excluir (además de id, pk, fecha_*)
+        campos_monetarios: Campos a los que aplicar factor_incremento
+        factor_incremento: Factor de incremento para campos monetarios (0 = sin cambio)
+        sufijo_nombre: Sufijo a agregar a campos únicos de texto (nombre, perfil, etc.)
+
+    Returns:
+        Nueva instancia creada (ya guardada en BD)
+
+    Example:
+        # Copia simple
+        nuevo_vendedor = copiar_instancia(vendedor_original)
+
+        # Copia con cambios
+        nuevo_vendedor = copiar_instancia(
+            vendedor_original,
+            override={'marca': otra_marca, 'nombre': 'Vendedor Sur'},
+        )
+
+        # Copia con incremento en salarios
+        nuevo_personal = copiar_instancia(
+            personal_original,
+            campos_monetarios={'salario_base', 'auxilio_adicional'},
+            factor_incremento=0.05  # 5% de incremento
+        )
+    """
+    nueva_instancia = construir_copia(
+        instancia,
+        override=override,
+        excluir_campos=excluir_campos,
+        campos_monetarios=campos_monetarios,
+        factor_incremento=factor_incremento,
+        sufijo_nombre=sufijo_nombre,
+    )
+    nueva_instancia.save(force_insert=True)
 
     return nueva_instancia
 
 
+def iterar_en_lotes(queryset: models.QuerySet, tamano: int) -> Iterator[List[models.Model]]:
+    """
+    Recorre un queryset en listas de hasta `tamano` registros con iterator(),
+    sin cargar ni cachear el resultado completo. Los prefetch_related del
+    queryset se resuelven por lote.
+    """
+    lote = []
+    for obj in queryset.iterator(chunk_size=tamano):
+        lote.append(obj)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
 def copiar_instancia_con_hijos(
     instancia: models.Model,
     relaciones_hijos: Dict[str, Dict[str, Any]],
@@ -206,7 +286,12 @@ CAMPOS_MONETARIOS_POR_MODELO = {
 }
 
 
-def get_campos_monetarios(modelo: models.Model) -> Set[str]:
-    """Obtiene los campos monetarios configurados para un modelo"""
-    nombre_modelo = modelo.__class__.__name__
-    return CAMPOS_MONETARIOS_POR_MODELO.get(nombre_modelo, set())
+def get_campos_monetarios(modelo) -> Set[str]:
+    """
+    Obtiene los campos monetarios configurados para un modelo.
+
+    Acepta la clase o una instancia; dentro de un bucle conviene resolverlo
+    una vez con la clase.
+    """
+    clase = modelo if isinstance(modelo, type) else modelo.__class__
+    return CAMPOS_MONETARIOS_POR_MODELO.get(clase.__name__, set())
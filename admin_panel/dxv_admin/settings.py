@@ -127,6 +127,31 @@ DATABASES = {
     }
 }
 
+# Cache - Redis si está configurado (compartido entre workers de Gunicorn),
+# si no, memoria local por proceso
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Tiempo (segundos) que se cachean las tablas de referencia (FactorPrestacional,
+# ParametrosMacro, MatrizDesplazamiento, ConfiguracionLejania). Con memoria local
+# la invalidación por signals solo llega al worker que guardó, por eso el TTL por
+# defecto es corto.
+DXV_CACHE_TABLAS_TIMEOUT = int(os.environ.get(
+    'DXV_CACHE_TABLAS_TIMEOUT', 3600 if REDIS_URL else 60
+))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -288,44 +288,22 @@ def obtener_configuracion_descuentos_por_marca(
         Dict con marca_id como key y configuración de descuentos como value
     """
     try:
-        from core.models import Marca, ConfiguracionDescuentos
+        from core.models import ConfiguracionDescuentos
 
         resultado = {}
 
-        for marca_id in marcas_ids:
-            try:
-                marca = Marca.objects.get(marca_id=marca_id)
-                config = ConfiguracionDescuentos.objects.prefetch_related('tramos').get(
-                    marca=marca,
-                    activa=True
-                )
-
-                # Calcular descuento ponderado de los tramos
-                tramos_data = []
-                descuento_ponderado = 0.0
-
-                for tramo in config.tramos.all().order_by('orden'):
-                    peso = float(tramo.porcentaje_ventas) / 100
-                    descuento = float(tramo.porcentaje_descuento) / 100
-                    descuento_ponderado += peso * descuento
-
-                    tramos_data.append({
-                        'orden': tramo.orden,
-                        'porcentaje_ventas': float(tramo.porcentaje_ventas),
-                        'porcentaje_descuento': float(tramo.porcentaje_descuento),
-                    })
-
-                resultado[marca_id] = {
-                    'tiene_configuracion': True,
-                    'descuento_pie_factura_ponderado': descuento_ponderado * 100,  # En porcentaje
-                    'tramos': tramos_data,
-                    'porcentaje_rebate': float(config.porcentaje_rebate),
-                    'aplica_descuento_financiero': config.aplica_descuento_financiero,
-                    'porcentaje_descuento_financiero': float(config.porcentaje_descuento_financiero),
-                    'aplica_cesantia_comercial': config.aplica_cesantia_comercial,
-                }
+        # Una consulta para todas las marcas (+1 para sus tramos)
+        configs = {
+            config.marca.marca_id: config
+            for config in ConfiguracionDescuentos.objects.con_tramos().filter(
+                marca__marca_id__in=marcas_ids,
+                activa=True
+            )
+        }
 
-            except (Marca.DoesNotExist, ConfiguracionDescuentos.DoesNotExist):
+        for marca_id in marcas_ids:
+            config = configs.get(marca_id)
+            if config is None:
                 resultado[marca_id] = {
                     'tiene_configuracion': False,
                     'descuento_pie_factura_ponderado': 0,
@@ -335,6 +313,32 @@ def obtener_configuracion_descuentos_por_marca(
                     'porcentaje_descuento_financiero': 0,
                     'aplica_cesantia_comercial': False,
                 }
+                continue
+
+            # Calcular descuento ponderado de los tramos
+            tramos_data = []
+            descuento_ponderado = 0.0
+
+            for tramo in config.tramos.all():
+                peso = float(tramo.porcentaje_ventas) / 100
+                descuento = float(tramo.porcentaje_descuento) / 100
+                descuento_ponderado += peso * descuento
+
+                tramos_data.append({
+                    'orden': tramo.orden,
+                    'porcentaje_ventas': float(tramo.porcentaje_ventas),
+                    'porcentaje_descuento': float(tramo.porcentaje_descuento),
+                })
+
+            resultado[marca_id] = {
+                'tiene_configuracion': True,
+                'descuento_pie_factura_ponderado': descuento_ponderado * 100,  # En porcentaje
+                'tramos': tramos_data,
+                'porcentaje_rebate': float(config.porcentaje_rebate),
+                'aplica_descuento_financiero': config.aplica_descuento_financiero,
+                'porcentaje_descuento_financiero': float(config.porcentaje_descuento_financiero),
+                'aplica_cesantia_comercial': config.aplica_cesantia_comercial,
+            }
 
         return resultado
 
@@ -486,9 +490,10 @@ def obtener_detalle_lejanias_comercial(
     """
     try:
         from core.models import (
-            Escenario, Marca, Zona, GastoComercial,
+            Escenario, Marca, Zona, ZonaMunicipio, GastoComercial,
             ConfiguracionLejania, MatrizDesplazamiento
         )
+        from django.db.models import Prefetch
         from decimal import Decimal
 
         # Obtener escenario y marca
@@ -497,29 +502,20 @@ def obtener_detalle_lejanias_comercial(
 
         # Obtener configuración de lejanías
         try:
-            config = ConfiguracionLejania.objects.get(escenario=escenario)
+            config = ConfiguracionLejania.obtener_para(escenario)
         except ConfiguracionLejania.DoesNotExist:
             config = None
 
-        # Leer totales desde GastoComercial (ya calculados por signals)
-        gastos_combustible = GastoComercial.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='transporte_vendedores',
-            nombre__startswith='Combustible Lejanía'
-        )
-        gastos_pernocta = GastoComercial.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='viaticos',
-            nombre__startswith='Viáticos Pernocta'
-        )
-        gastos_adicionales = GastoComercial.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='transporte_vendedores',
-            nombre__startswith='Mant/Deprec/Llantas'
-        )
+        # Leer totales desde GastoComercial (ya calculados por signals).
+        # Solo (tipo, nombre, valor) en una consulta, sin construir instancias
+        valores_gasto = {
+            (tipo, nombre): valor
+            for tipo, nombre, valor in GastoComercial.objects.filter(
+                escenario=escenario,
+                marca=marca,
+                tipo__in=['transporte_vendedores', 'viaticos'],
+            ).values_list('tipo', 'nombre', 'valor_mensual')
+        }
         gastos_comite = GastoComercial.objects.filter(
             escenario=escenario,
             marca=marca,
@@ -540,7 +536,9 @@ def obtener_detalle_lejanias_comercial(
             marca=marca,
             escenario=escenario,
             activo=True
-        ).prefetch_related('municipios__municipio').select_related('vendedor', 'municipio_base_vendedor', 'operacion')
+        ).prefetch_related(
+            Prefetch('municipios', queryset=ZonaMunicipio.objects.order_by('municipio__nombre'))
+        ).select_related('vendedor', 'municipio_base_vendedor', 'operacion')
 
         # Filtrar por operaciones seleccionadas si se especifican
         if operacion_ids_list:
@@ -555,19 +553,15 @@ def obtener_detalle_lejanias_comercial(
 
         for zona in zonas:
             # Buscar gastos de esta zona específica
-            combustible_zona = gastos_combustible.filter(
-                nombre=f'Combustible Lejanía - {zona.nombre}'
-            ).first()
-            adicionales_zona = gastos_adicionales.filter(
-                nombre=f'Mant/Deprec/Llantas - {zona.nombre}'
-            ).first()
-            pernocta_zona = gastos_pernocta.filter(
-                nombre=f'Viáticos Pernocta - {zona.nombre}'
-            ).first()
-
-            combustible_mensual = float(combustible_zona.valor_mensual) if combustible_zona else 0.0
-            costos_adicionales_mensual = float(adicionales_zona.valor_mensual) if adicionales_zona else 0.0
-            pernocta_mensual = float(pernocta_zona.valor_mensual) if pernocta_zona else 0.0
+            combustible_mensual = float(valores_gasto.get(
+                ('transporte_vendedores', f'Combustible Lejanía - {zona.nombre}'), 0
+            ))
+            costos_adicionales_mensual = float(valores_gasto.get(
+                ('transporte_vendedores', f'Mant/Deprec/Llantas - {zona.nombre}'), 0
+            ))
+            pernocta_mensual = float(valores_gasto.get(
+                ('viaticos', f'Viáticos Pernocta - {zona.nombre}'), 0
+            ))
 
             # Generar detalle de municipios para visualización
             detalle_municipios = []
@@ -600,10 +594,7 @@ def obtener_detalle_lejanias_comercial(
 
                     # Visita a otro municipio: buscar en matriz
                     try:
-                        matriz = MatrizDesplazamiento.objects.get(
-                            origen_id=base_vendedor.id,
-                            destino_id=municipio.id
-                        )
+                        matriz = MatrizDesplazamiento.obtener_tramo(base_vendedor.id, municipio.id)
                         distancia_km = float(matriz.distancia_km)
                     except MatrizDesplazamiento.DoesNotExist:
                         distancia_km = 0
@@ -742,10 +733,7 @@ def obtener_detalle_lejanias_comercial(
                 distancia_km = 0.0
                 if base_vendedor:
                     try:
-                        matriz = MatrizDesplazamiento.objects.get(
-                            origen_id=base_vendedor.id,
-                            destino_id=config.municipio_comite.id
-                        )
+                        matriz = MatrizDesplazamiento.obtener_tramo(base_vendedor.id, config.municipio_comite.id)
                         distancia_km = float(matriz.distancia_km)
                     except MatrizDesplazamiento.DoesNotExist:
                         pass
@@ -859,35 +847,20 @@ def obtener_detalle_lejanias_logistica(
 
         # Obtener configuración de lejanías
         try:
-            config = ConfiguracionLejania.objects.get(escenario=escenario)
+            config = ConfiguracionLejania.obtener_para(escenario)
         except ConfiguracionLejania.DoesNotExist:
             config = None
 
-        # Leer gastos desde GastoLogistico (ya calculados por signals)
-        gastos_combustible = GastoLogistico.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='combustible',
-            nombre__startswith='Combustible -'
-        )
-        gastos_peajes = GastoLogistico.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='peajes',
-            nombre__startswith='Peajes -'
-        )
-        gastos_viaticos = GastoLogistico.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='otros',
-            nombre__startswith='Viáticos Ruta -'
-        )
-        gastos_flete = GastoLogistico.objects.filter(
-            escenario=escenario,
-            marca=marca,
-            tipo='otros',
-            nombre__startswith='Flete Base Tercero -'
-        )
+        # Leer gastos desde GastoLogistico (ya calculados por signals).
+        # Solo (tipo, nombre, valor) en una consulta, sin construir instancias
+        valores_gasto = {
+            (tipo, nombre): valor
+            for tipo, nombre, valor in GastoLogistico.objects.filter(
+                escenario=escenario,
+                marca=marca,
+                tipo__in=['combustible', 'peajes', 'otros'],
+            ).values_list('tipo', 'nombre', 'valor_mensual')
+        }
 
         # Obtener rutas logísticas de la marca
         rutas = RutaLogistica.objects.filter(
@@ -920,23 +893,10 @@ def obtener_detalle_lejanias_logistica(
 
         for ruta in rutas:
             # Buscar gastos de esta ruta específica
-            combustible_ruta = gastos_combustible.filter(
-                nombre=f'Combustible - {ruta.nombre}'
-            ).first()
-            peaje_ruta = gastos_peajes.filter(
-                nombre=f'Peajes - {ruta.nombre}'
-            ).first()
-            viaticos_ruta = gastos_viaticos.filter(
-                nombre=f'Viáticos Ruta - {ruta.nombre}'
-            ).first()
-            flete_ruta = gastos_flete.filter(
-                nombre=f'Flete Base Tercero - {ruta.nombre}'
-            ).first()
-
-            combustible_mensual = float(combustible_ruta.valor_mensual) if combustible_ruta else 0.0
-            peaje_mensual = float(peaje_ruta.valor_mensual) if peaje_ruta else 0.0
-            pernocta_mensual = float(viaticos_ruta.valor_mensual) if viaticos_ruta else 0.0
-            flete_base_mensual = float(flete_ruta.valor_mensual) if flete_ruta else 0.0
+            combustible_mensual = float(valores_gasto.get(('combustible', f'Combustible - {ruta.nombre}'), 0))
+            peaje_mensual = float(valores_gasto.get(('peajes', f'Peajes - {ruta.nombre}'), 0))
+            pernocta_mensual = float(valores_gasto.get(('otros', f'Viáticos Ruta - {ruta.nombre}'), 0))
+            flete_base_mensual = float(valores_gasto.get(('otros', f'Flete Base Tercero - {ruta.nombre}'), 0))
 
             # Generar detalle de tramos para visualización
             detalle_tramos = []
@@ -952,10 +912,7 @@ def obtener_detalle_lejanias_logistica(
                     origen = puntos_circuito[i]
                     destino = puntos_circuito[i + 1]
                     try:
-                        matriz = MatrizDesplazamiento.objects.get(
-                            origen_id=origen.id,
-                            destino_id=destino.id
-                        )
+                        matriz = MatrizDesplazamiento.obtener_tramo(origen.id, destino.id)
                         distancia_km = float(matriz.distancia_km)
                         peaje = float(matriz.peaje_ida or 0)
                     except MatrizDesplazamiento.DoesNotExist:
@@ -1732,14 +1689,14 @@ def obtener_pyg_zonas(
         # Obtener configuración de descuentos
         config_descuentos = None
         try:
-            config = ConfiguracionDescuentos.objects.prefetch_related('tramos').get(
+            config = ConfiguracionDescuentos.objects.con_tramos().get(
                 marca=marca,
                 activa=True
             )
             # Calcular descuento ponderado
             descuento_ponderado = 0.0
             tramos_data = []
-            for tramo in config.tramos.all().order_by('orden'):
+            for tramo in config.tramos.all():
                 peso = float(tramo.porcentaje_ventas) / 100
                 descuento = float(tramo.porcentaje_descuento) / 100
                 descuento_ponderado += peso * descuento
@@ -2005,14 +1962,14 @@ def obtener_pyg_municipios(
         # Obtener configuración de descuentos
         config_descuentos = None
         try:
-            config = ConfiguracionDescuentos.objects.prefetch_related('tramos').get(
+            config = ConfiguracionDescuentos.objects.con_tramos().get(
                 marca=marca,
                 activa=True
             )
             # Calcular descuento ponderado
             descuento_ponderado = 0.0
             tramos_data = []
-            for tramo in config.tramos.all().order_by('orden'):
+            for tramo in config.tramos.all():
                 peso = float(tramo.porcentaje_ventas) / 100
                 descuento = float(tramo.porcentaje_descuento) / 100
                 descuento_ponderado += peso * descuento
@@ -2759,7 +2716,7 @@ def diagnostico_logistico_detallado(
                     zona__marca=marca_obj,
                     zona__escenario=escenario,
                     zona__activo=True
-                ).select_related('zona')
+                ).select_related('zona').order_by('zona__nombre')
 
                 zonas_list = [{
                     'zona_id': zm.zona.id,
@@ -267,13 +267,11 @@ def _calcular_lejanias_zona(escenario, zona, participacion: Decimal) -> Dict:
         comercial_total = lejania_comercial_zona['total_mensual']
 
         # Agregar costo del comité comercial para esta zona (ambos registros: Combustible y Mant/Dep/Llan)
-        comite_gastos = GastoComercial.objects.filter(
+        comercial_total += GastoComercial.objects.filter(
             escenario=escenario,
-            nombre__startswith=f'Comité Comercial',
+            nombre__startswith='Comité Comercial',
             zona=zona
-        )
-        for comite_gasto in comite_gastos:
-            comercial_total += Decimal(str(comite_gasto.valor_mensual))
+        ).aggregate(total=Sum('valor_mensual'))['total'] or Decimal('0')
 
         # Lejanía logística: calcular para cada marca de la zona y ponderar
         distribucion_marcas = zona.get_distribucion_marcas()
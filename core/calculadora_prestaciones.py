@@ -154,6 +154,42 @@ def calcular_costo_nomina(
     )
 
 
+def calcular_costo_nomina_float(
+    salario_base: float,
+    factor_solo_salario: float,
+    factor_con_subsidio: float,
+    subsidio_transporte: float = 0.0,
+    auxilio_adicional: float = 0.0,
+    cantidad: int = 1,
+) -> float:
+    """
+    Variante en float de `calcular_costo_nomina` para agregaciones masivas
+    (totales de listados y reportes) donde no se necesita el desglose.
+
+    Aplica la misma fórmula sin construir Decimals por fila. El redondeo queda
+    a cargo del llamador (ej: Decimal(str(round(total, 2)))); no usar para
+    valores que se persisten.
+
+    Args:
+        salario_base: Salario base mensual
+        factor_solo_salario: Ver FactoresPrestacionales.factor_solo_salario (decimal 0-1)
+        factor_con_subsidio: Ver FactoresPrestacionales.factor_con_subsidio (decimal 0-1)
+        subsidio_transporte: Subsidio de transporte (si aplica, <= 2 SMLV)
+        auxilio_adicional: Auxilios adicionales (rodamiento, etc.)
+        cantidad: Número de empleados con este mismo perfil/salario
+
+    Returns:
+        Costo total (costo unitario * cantidad)
+    """
+    costo_unitario = (
+        salario_base * (1.0 + factor_solo_salario) +
+        (salario_base + subsidio_transporte) * factor_con_subsidio +
+        subsidio_transporte +
+        auxilio_adicional
+    )
+    return costo_unitario * cantidad
+
+
 def aplica_subsidio_transporte(
     salario_base: Union[Decimal, float, int],
     salario_minimo: Union[Decimal, float, int],
@@ -152,7 +152,7 @@ class CalculadoraDescuentos:
             if marcas_ids:
                 query = query.filter(marca__marca_id__in=marcas_ids)
 
-            query = query.select_related('marca').prefetch_related('tramos')
+            query = query.con_tramos()
 
             # Cargar configuraciones
             for config in query:
@@ -162,7 +162,7 @@ class CalculadoraDescuentos:
                         porcentaje_ventas=t.porcentaje_ventas,
                         porcentaje_descuento=t.porcentaje_descuento
                     )
-                    for t in config.tramos.all().order_by('orden')
+                    for t in config.tramos.all()
                 ]
 
                 self._configuraciones[config.marca.marca_id] = ConfigDescuentos(
@@ -32,7 +32,7 @@ class CalculadoraLejanias:
         # Cargar configuración de lejanías
         try:
             from core.models import ConfiguracionLejania, ParametrosMacro
-            self.config = ConfiguracionLejania.objects.get(escenario=escenario)
+            self.config = ConfiguracionLejania.obtener_para(escenario)
             self.params_macro = ParametrosMacro.objects.get(anio=escenario.anio, activo=True)
         except Exception as e:
             logger.warning(f"No se pudo cargar configuración de lejanías para {escenario}: {e}")
@@ -91,10 +91,7 @@ class CalculadoraLejanias:
 
             # Buscar ruta en matriz (por ID para evitar problemas de comparación de objetos)
             try:
-                matriz = MatrizDesplazamiento.objects.get(
-                    origen_id=base_vendedor.id,
-                    destino_id=municipio.id
-                )
+                matriz = MatrizDesplazamiento.obtener_tramo(base_vendedor.id, municipio.id)
             except MatrizDesplazamiento.DoesNotExist:
                 logger.warning(f"No existe ruta {base_vendedor.nombre} (ID:{base_vendedor.id}) → {municipio.nombre} (ID:{municipio.id})")
                 continue
@@ -329,10 +326,7 @@ class CalculadoraLejanias:
             destino = puntos_circuito[i + 1]
 
             try:
-                matriz = MatrizDesplazamiento.objects.get(
-                    origen_id=origen.id,
-                    destino_id=destino.id
-                )
+                matriz = MatrizDesplazamiento.obtener_tramo(origen.id, destino.id)
                 distancia_tramo = matriz.distancia_km
                 peaje_tramo = matriz.peaje_ida or Decimal('0')
             except MatrizDesplazamiento.DoesNotExist:
@@ -660,10 +654,7 @@ class CalculadoraLejanias:
                 origen = puntos_circuito[i]
                 destino = puntos_circuito[i + 1]
                 try:
-                    matriz = MatrizDesplazamiento.objects.get(
-                        origen_id=origen.id,
-                        destino_id=destino.id
-                    )
+                    matriz = MatrizDesplazamiento.obtener_tramo(origen.id, destino.id)
                     distancia_total_circuito += matriz.distancia_km
                     peaje_total_circuito += matriz.peaje_ida or Decimal('0')
                 except MatrizDesplazamiento.DoesNotExist:
@@ -249,7 +249,7 @@ class DataLoaderDB:
             gastos_comerciales = []
             gastos_qs = GastoComercial.objects.filter(
                 asignaciones_marca__marca=marca, **self._get_filter_kwargs()
-            ).distinct().prefetch_related('asignaciones_marca')
+            ).distinct().para_reporte().prefetch_related('asignaciones_marca')
 
             for gasto in gastos_qs:
                 # Filtrar gastos de lejanías (mismo criterio que pyg_service.py)
@@ -379,7 +379,7 @@ class DataLoaderDB:
             gastos_logisticos = []
             gastos_qs = GastoLogistico.objects.filter(
                 asignaciones_marca__marca=marca, **self._get_filter_kwargs()
-            ).distinct().prefetch_related('asignaciones_marca')
+            ).distinct().para_reporte().prefetch_related('asignaciones_marca')
 
             for gasto in gastos_qs:
                 # Filtrar gastos de lejanías logísticas (mismo criterio que pyg_service.py)
@@ -480,11 +480,12 @@ class DataLoaderDB:
                     asignaciones_marca__marca=marca, **self._get_filter_kwargs()
                 ).distinct().prefetch_related('asignaciones_marca')
 
-                for p in personal_qs:
+                # Factores y parámetros macro se resuelven una vez para todo el lote
+                for p, factor, macro in personal_qs.con_parametros_costo():
                     try:
                         # Obtener porcentaje asignado a esta marca (0-1)
                         porcentaje_marca = float(p.get_distribucion_marcas().get(marca.marca_id, 0))
-                        costo_total = float(p.calcular_costo_mensual())
+                        costo_total = p.calcular_costo_float(factor, macro)
                         costo_marca = costo_total * porcentaje_marca
 
                         personal_dict.append({
@@ -518,7 +519,7 @@ class DataLoaderDB:
             try:
                 gastos_qs = GastoAdministrativo.objects.filter(
                     asignaciones_marca__marca=marca, **self._get_filter_kwargs()
-                ).distinct().prefetch_related('asignaciones_marca')
+                ).distinct().para_reporte().prefetch_related('asignaciones_marca')
 
                 for gasto in gastos_qs:
                     try:
@@ -607,10 +608,12 @@ class DataLoaderDB:
         """Carga recursos administrativos compartidos desde PostgreSQL"""
         try:
             # Cargar personal administrativo compartido (asignacion='compartido')
-            personal_qs = PersonalAdministrativo.objects.filter(asignacion='compartido', **self._get_filter_kwargs())
+            personal_qs = PersonalAdministrativo.objects.filter(
+                asignacion='compartido', **self._get_filter_kwargs()
+            ).select_related('operacion')
 
             personal_administrativo = {}
-            for p in personal_qs:
+            for p, factor, macro in personal_qs.con_parametros_costo():
                 # Usar el nombre o tipo como key
                 key = p.nombre if p.nombre else p.tipo
                 personal_administrativo[key] = {
@@ -622,7 +625,7 @@ class DataLoaderDB:
                     'tipo_contrato': p.tipo_contrato,
                     'honorarios_mensuales': float(p.honorarios_mensuales) if p.honorarios_mensuales else 0,
                     'criterio_prorrateo': p.criterio_prorrateo,
-                    'costo_mensual_calculado': float(p.calcular_costo_mensual()),
+                    'costo_mensual_calculado': p.calcular_costo_float(factor, macro),
                     # Campos de operación para distribución por centro de costos
                     'operacion_id': p.operacion_id,
                     'operacion_nombre': p.operacion.nombre if p.operacion else None,
@@ -631,7 +634,9 @@ class DataLoaderDB:
                 }
 
             # Cargar gastos administrativos compartidos
-            gastos_qs = GastoAdministrativo.objects.filter(asignacion='compartido', **self._get_filter_kwargs())
+            gastos_qs = GastoAdministrativo.objects.filter(
+                asignacion='compartido', **self._get_filter_kwargs()
+            ).para_reporte()
 
             gastos_administrativos = []
             for gasto in gastos_qs: